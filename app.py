@@ -1,13 +1,37 @@
+import os
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import json
-import hashlib
-import sqlite3
-from datetime import datetime
-import io
-import base64
+from datetime import datetime, timedelta
+
+from skills import (
+    angles,
+    ANGLE_ORDER,
+    SkillsHistory,
+    scores_to_dict,
+    assessment_summary,
+    cohort_percentiles,
+)
+import metrics
+from credentials import kdf_stats
+from radar import render_radar, prewarm, chart_cache_stats
+from similarity import similar_profiles
+from reports import request_report, cached_report
+from sessions import QUERY_PARAM, issue_token, validate_token, revoke_token, session_stats
+from database import (
+    writer_stats,
+    init_database,
+    create_user,
+    authenticate_user,
+    save_skill_assessment,
+    count_user_assessments,
+    get_user_assessment_page,
+    get_assessment,
+    get_user_score_history,
+    get_latest_scores,
+    get_latest_assessment,
+    get_score_histogram,
+)
 
 # === KONFIGŪRACIJA ===
 st.set_page_config(
@@ -17,255 +41,13 @@ st.set_page_config(
     page_icon="🎯"
 )
 
-# Kampų žemėlapis su tiksliais laipsniais (Šiaurė = 0° = Matematika)
-angles = {
-    0: "MATEMATIKA, KVANTINĖ FIZIKA",
-    10: "DIRBTINIS INTELEKTAS, MAŠINŲ MOKYMAS",
-    20: "FIZIKA, ELEKTRONIKA, KOMPIUTERIJA",
-    30: "INŽINERIJA",
-    40: "ELEKTROTECHNIKA",
-    50: "MECHANIKA",
-    60: "ARCHITEKTŪRA, MODELIAVIMAS",
-    70: "STATISTIKA, DUOMENYS",
-    80: "FINANSAI, EKONOMIKA",
-    90: "ĮSTATYMAI, TEISĖ",
-    100: "POLITIKA",
-    110: "VALDŽIA, VALSTYBĖ",
-    120: "RAŠTAS, SKAIČIAI",
-    130: "AMATAI, PREKYBA",
-    140: "RELIGIJOS",
-    150: "BŪSTAS, STATYBA",
-    160: "KELIONĖS, ATRADIMAI",
-    170: "AGRESIJA, DOMINAVIMAS",
-    180: "FIZINĖ JĖGA",
-    190: "MAISTAS",
-    200: "SEKSAS, VAIKAI",
-    210: "ŠILUMA, BUITIS",
-    220: "VALGIO RUOŠIMAS",
-    230: "GLOBA/RŪPYBA",
-    240: "EMPATIJA",
-    250: "PUOŠYBA",
-    260: "MUZIKA, ŠOKIS",
-    270: "DRAMATIKA, GINČAI",
-    280: "LITERATŪRA",
-    290: "MEDIA, DIZAINAS",
-    300: "ISTORIJA, ŽURNALISTIKA",
-    310: "PSICHOLOGIJA",
-    320: "MĄSTYMAS, FILOSOFIJA",
-    330: "BIOLOGIJA, NEUROMOKSLAI",
-    340: "MEDICINOS MOKSLAI",
-    350: "CHEMIJA, BIOTECHNOLOGIJOS",
-}
-
 # Saugoti angles session state
 if 'angles' not in st.session_state:
     st.session_state.angles = angles
 
-DB_PATH = "skills_users.db"
-
-# === DUOMENŲ BAZĖS FUNKCIJOS ===
-def init_database():
-    """Sukurti vartotojų duomenų bazę"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Vartotojų lentelė
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            username TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-    
-    # Įgūdžių vertinimų lentelė
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS skill_assessments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            assessment_data TEXT,
-            comment TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-def hash_password(password):
-    """Užšifruoti slaptažodį"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password, hash_value):
-    """Patikrinti slaptažodį"""
-    return hash_password(password) == hash_value
-
-def create_user(email, password, username):
-    """Sukurti naują vartotoją"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        password_hash = hash_password(password)
-        cursor.execute('INSERT INTO users (email, password_hash, username) VALUES (?, ?, ?)', 
-                      (email, password_hash, username))
-        conn.commit()
-        user_id = cursor.lastrowid
-        conn.close()
-        return user_id
-    except sqlite3.IntegrityError:
-        return None
-
-def authenticate_user(email, password):
-    """Autentifikuoti vartotoją"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, password_hash, username FROM users WHERE email = ?', (email,))
-    user = cursor.fetchone()
-    conn.close()
-    
-    if user and verify_password(password, user[1]):
-        # Atnaujinti paskutinio prisijungimo laiką
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user[0],))
-        conn.commit()
-        conn.close()
-        return {'id': user[0], 'username': user[2], 'email': email}
-    return None
-
-def save_skill_assessment(user_id, skills_data, comment=""):
-    """Išsaugoti įgūdžių vertinimą"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    assessment_json = json.dumps(skills_data)
-    cursor.execute('INSERT INTO skill_assessments (user_id, assessment_data, comment) VALUES (?, ?, ?)', 
-                  (user_id, assessment_json, comment))
-    conn.commit()
-    assessment_id = cursor.lastrowid
-    conn.close()
-    return assessment_id
-
-def get_user_assessments(user_id):
-    """Gauti vartotojo įgūdžių vertinimus"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''SELECT id, assessment_data, comment, created_at 
-                     FROM skill_assessments WHERE user_id = ? ORDER BY created_at DESC''', (user_id,))
-    assessments = []
-    for row in cursor.fetchall():
-        assessments.append({
-            'id': row[0],
-            'data': json.loads(row[1]),
-            'comment': row[2],
-            'created_at': row[3]
-        })
-    conn.close()
-    return assessments
-
-# === CIRCULAR RADAR DIAGRAMA SU LINIJOMIS IR TAŠKAIS ===
-def create_circular_radar_chart(skills_data, title="Jūsų įgūdžių profilis", show_compass=True):
-    """Sukurti circular radar diagramą su linijomis ir taškais kaip PNG paveiksle"""
-    
-    # Paruošti duomenis
-    categories = []
-    values = []
-    colors = []
-    degree_positions = []
-    
-    for angle in sorted(skills_data.keys()):
-        angle_int = int(angle) if isinstance(angle, str) else angle
-        categories.append(angles.get(angle_int, f"Kampas {angle}"))
-        values.append(skills_data[angle])
-        degree_positions.append(angle_int)
-        
-        # Trys pagrindinės spalvos su perėjimais
-        if skills_data[angle] >= 7:
-            colors.append('#1f77b4')  # Mėlyna - stiprus
-        elif skills_data[angle] >= 4:
-            colors.append('#d62728')  # Raudona - vidutinis
-        else:
-            colors.append('#ffbb00')  # Geltona - silpnas
-    
-    N = len(categories)
-    
-    # Konvertuoti kampus į radianus (0° = Šiaurė = Matematika)
-    theta = np.array(degree_positions) * np.pi / 180
-    
-    # Sukurti figūrą
-    fig, ax = plt.subplots(figsize=(12, 12), subplot_kw=dict(projection='polar'))
-    
-    # Nustatyti tamsų foną
-    fig.patch.set_facecolor('#1e1e1e')
-    ax.set_facecolor('#1e1e1e')
-    
-    # Piešti linijas nuo centro iki taškų (kaip PNG paveiksle)
-    for angle, value, color in zip(theta, values, colors):
-        ax.plot([angle, angle], [0, value], color=color, linewidth=2, alpha=0.8)
-    
-    # Pridėti taškus ant linijų galų
-    ax.scatter(theta, values, c=colors, s=80, alpha=1, zorder=3, edgecolors='white', linewidths=1.5)
-    
-    # Pridėti vertes ant taškų
-    for angle, value in zip(theta, values):
-        ax.text(angle, value + 0.3, str(value), 
-                ha='center', va='center', fontsize=10, 
-                color='white', weight='bold', zorder=4)
-    
-    # Nustatyti ašių parametrus - 0° yra Šiaurėje (Matematika)
-    ax.set_ylim(0, 10)
-    ax.set_theta_zero_location('N')  # 0° viršuje (Šiaurė)
-    ax.set_theta_direction(1)  # Counter-clockwise (teigiama kryptimi)
-    
-    # Pridėti 4 pagrindines kryptis su pavadinimais
-    if show_compass:
-        compass_data = [
-            (0, "0°\nMATEMATINIS,\nLOGINIS PROTAS"),
-            (90, "90°\nSOCIALINIS -\nORGANIZACINIS,\nVALDŽIA"),
-            (180, "180°\nFIZINIS,\nGENAI, JĖGA"),
-            (270, "270°\nJAUSMAI,\nEMOCIJOS")
-        ]
-        
-        for angle, label in compass_data:
-            rad = angle * np.pi / 180
-            ax.text(rad, 11.5, label, ha='center', va='center', 
-                   fontsize=9, color='lightblue', weight='bold', zorder=5)
-    
-    # Nustatyti kategorijų pavadinimus (trumpinti)
-    ax.set_xticks(theta)
-    shortened_categories = []
-    for cat in categories:
-        if len(cat) > 25:
-            shortened_categories.append(cat[:22] + '...')
-        else:
-            shortened_categories.append(cat)
-    
-    ax.set_xticklabels(shortened_categories, fontsize=8, color='white')
-    
-    # Nustatyti radialias ašis
-    ax.set_ylim(0, 10)
-    ax.set_yticks(range(0, 11, 2))
-    ax.set_yticklabels(range(0, 11, 2), fontsize=9, color='white')
-    ax.grid(True, color='gray', alpha=0.3)
-    
-    # Pridėti pavadinimą
-    plt.title(title, pad=30, fontsize=16, color='white', weight='bold')
-    
-    plt.tight_layout()
-    return fig
-
-def fig_to_base64(fig):
-    """Konvertuoti matplotlib figūrą į base64 stringą"""
-    img_buffer = io.BytesIO()
-    fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight', 
-                facecolor='#1e1e1e', edgecolor='none')
-    img_buffer.seek(0)
-    img_string = base64.b64encode(img_buffer.read()).decode()
-    plt.close(fig)
-    return img_string
+# Fone paruošti diagramų piešėją ir Prometheus failo rašymą (tik pirmą kartą per procesą)
+prewarm()
+metrics.start_exporter()
 
 # === AUTORIZACIJOS FORMOS ===
 def login_form():
@@ -282,6 +64,9 @@ def login_form():
                 user = authenticate_user(email, password)
                 if user:
                     st.session_state.user = user
+                    prefill_skills(user['id'])
+                    # Pasirašytas žetonas URL'e: atnaujinus langą slaptažodžio nebereikės
+                    st.query_params[QUERY_PARAM] = issue_token(user)
                     st.success(f"Sveiki sugrįžę, {user['username']}! 👋")
                     st.rerun()
                 else:
@@ -370,7 +155,111 @@ def register_form():
             else:
                 st.error("❌ Prašome užpildyti visus laukus!")
 
+def restore_session():
+    """Naujoje Streamlit sesijoje prisijungti pagal URL žetoną (be slaptažodžio maišymo)"""
+    if 'user' in st.session_state or QUERY_PARAM not in st.query_params:
+        return
+    user = validate_token(st.query_params[QUERY_PARAM])
+    if user is None:
+        del st.query_params[QUERY_PARAM]
+        return
+    st.session_state.user = user
+    prefill_skills(user['id'])
+
+def logout():
+    if QUERY_PARAM in st.query_params:
+        revoke_token(st.query_params[QUERY_PARAM])
+        del st.query_params[QUERY_PARAM]
+    if 'user' in st.session_state:
+        del st.session_state.user
+    clear_skills()
+    close_pages()
+
+# === PUSLAPIŲ NAVIGACIJA ===
+# Prisijungusio vartotojo puslapių vėliavos; vienu metu atidarytas tik vienas
+PAGE_FLAGS = ('show_profile', 'show_progress', 'show_cohort', 'show_similar', 'show_metrics', 'show_export')
+
+# Vartotojai, kuriems rodomas metrikų puslapis (el. paštai, atskirti kableliais)
+ADMIN_EMAILS = frozenset(email.strip().lower()
+                         for email in os.environ.get("SKILLS_ADMIN_EMAILS", "").split(",") if email.strip())
+
+def is_admin():
+    return 'user' in st.session_state and st.session_state.user['email'].lower() in ADMIN_EMAILS
+
+def open_page(flag):
+    """Atidaryti puslapį ir uždaryti kitus"""
+    for other in PAGE_FLAGS:
+        st.session_state[other] = other == flag
+
+def close_pages():
+    """Uždaryti visus puslapius (grįžti į vertinimą)"""
+    for flag in PAGE_FLAGS:
+        if flag in st.session_state:
+            del st.session_state[flag]
+
 # === PROFILIO FUNKCIJOS ===
+PROFILE_PAGE_SIZE = 10
+
+def reset_profile_history():
+    """Grįžti į pirmą istorijos puslapį ir uždaryti atidarytą vertinimą"""
+    st.session_state.profile_cursors = [None]
+    st.session_state.open_assessment_id = None
+
+def toggle_assessment(assessment_id):
+    """Atidaryti/uždaryti vertinimą istorijoje"""
+    if st.session_state.get('open_assessment_id') == assessment_id:
+        st.session_state.open_assessment_id = None
+    else:
+        st.session_state.open_assessment_id = assessment_id
+
+def next_profile_page(cursor):
+    st.session_state.profile_cursors.append(cursor)
+    st.session_state.open_assessment_id = None
+
+def previous_profile_page():
+    st.session_state.profile_cursors.pop()
+    st.session_state.open_assessment_id = None
+
+def show_assessment_details(assessment, number):
+    """Diagrama ir statistikos vienam (atidarytam) vertinimui"""
+    skills_data = scores_to_dict(assessment['scores'])
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Circular radar diagrama
+        try:
+            chart = render_radar(
+                skills_data,
+                f"Vertinimas #{number}",
+                show_compass=True
+            )
+            st.image(chart)
+        except Exception as e:
+            st.error(f"Klaida rodant diagramą: {e}")
+
+    with col2:
+        if assessment['comment']:
+            st.write(f"**💭 Komentaras:**")
+            st.info(assessment['comment'])
+
+        # Statistikos
+        try:
+            summary = assessment_summary(assessment['scores'])
+            avg_score = summary['mean']
+            max_skill = summary['strongest']
+            min_skill = summary['weakest']
+
+            st.metric("📊 Vidutinis balas", f"{avg_score:.1f}")
+
+            st.write("**🏆 Stipriausia sritis:**")
+            st.success(f"{angles[max_skill[0]]} ({max_skill[1]}/10)")
+
+            st.write("**📈 Tobulintina sritis:**")
+            st.warning(f"{angles[min_skill[0]]} ({min_skill[1]}/10)")
+
+        except Exception as e:
+            st.error(f"Klaida skaičiuojant statistikas: {e}")
+
 def show_profile():
     """Rodyti vartotojo profilį"""
     col1, col2 = st.columns([1, 4])
@@ -391,58 +280,391 @@ def show_profile():
     
     # Įgūdžių istorija
     st.subheader("📊 Jūsų įgūdžių istorija")
-    
-    assessments = get_user_assessments(st.session_state.user['id'])
-    
-    if assessments:
-        for i, assessment in enumerate(assessments):
-            with st.expander(f"🎯 Vertinimas #{len(assessments)-i} - {assessment['created_at'][:16]}"):
-                
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    # Circular radar diagrama
-                    try:
-                        fig = create_circular_radar_chart(
-                            assessment['data'], 
-                            f"Vertinimas #{len(assessments)-i}",
-                            show_compass=True
-                        )
-                        st.pyplot(fig, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Klaida rodant diagramą: {e}")
-                
-                with col2:
-                    if assessment['comment']:
-                        st.write(f"**💭 Komentaras:**")
-                        st.info(assessment['comment'])
-                    
-                    # Statistikos
-                    try:
-                        avg_score = sum(assessment['data'].values()) / len(assessment['data'])
-                        max_skill = max(assessment['data'].items(), key=lambda x: x[1])
-                        min_skill = min(assessment['data'].items(), key=lambda x: x[1])
-                        
-                        st.metric("📊 Vidutinis balas", f"{avg_score:.1f}")
-                        
-                        st.write("**🏆 Stipriausia sritis:**")
-                        st.success(f"{angles[max_skill[0]]} ({max_skill[1]}/10)")
-                        
-                        st.write("**📈 Tobulintina sritis:**")
-                        st.warning(f"{angles[min_skill[0]]} ({min_skill[1]}/10)")
-                        
-                    except Exception as e:
-                        st.error(f"Klaida skaičiuojant statistikas: {e}")
-                
+
+    if 'profile_cursors' not in st.session_state:
+        reset_profile_history()
+
+    user_id = st.session_state.user['id']
+    total = count_user_assessments(user_id)
+
+    if total:
+        # Kraunamas tik vienas puslapis metaduomenų; diagrama ir statistikos
+        # skaičiuojamos tik atidarytam vertinimui
+        cursors = st.session_state.profile_cursors
+        page, next_cursor = get_user_assessment_page(user_id, PROFILE_PAGE_SIZE, cursors[-1])
+        offset = PROFILE_PAGE_SIZE * (len(cursors) - 1)
+        open_id = st.session_state.get('open_assessment_id')
+
+        for i, summary in enumerate(page):
+            number = total - offset - i
+            is_open = summary['id'] == open_id
+            st.button(f"{'▼' if is_open else '▶'} 🎯 Vertinimas #{number} - {summary['created_at'][:16]}",
+                      key=f"assessment_{summary['id']}", use_container_width=True,
+                      on_click=toggle_assessment, args=(summary['id'],))
+
+            if is_open:
+                assessment = get_assessment(user_id, summary['id'])
+                if assessment:
+                    show_assessment_details(assessment, number)
                 st.divider()
+
+        # Puslapiavimas
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("⬅️ Naujesni", disabled=len(cursors) == 1, on_click=previous_profile_page)
+        with col2:
+            st.caption(f"Rodoma {offset + 1}–{offset + len(page)} iš {total}")
+        with col3:
+            st.button("Senesni ➡️", disabled=next_cursor is None,
+                      on_click=next_profile_page, args=(next_cursor,))
     else:
         st.info("🎯 Dar neturite nei vieno įgūdžių vertinimo. Sukurkite pirmą!")
 
+# === PROGRESAS LAIKE ===
+def show_progress():
+    """Rodyti vartotojo įgūdžių kitimą per visus išsaugotus vertinimus"""
+    import pandas as pd  # įkeliama tik atidarius puslapį (~0.5 s importas)
+
+    if st.button("⬅️ Grįžti į vertinimą", key="progress_back"):
+        close_pages()
+        st.rerun()
+
+    st.header("📈 Progresas laike")
+
+    # Visa istorija viena užklausa ir viena matrica; visi skaičiavimai vektoriniai
+    timestamps, matrix = get_user_score_history(st.session_state.user['id'])
+    if len(matrix) < 2:
+        st.info("🎯 Progresui reikia bent dviejų išsaugotų vertinimų.")
+        return
+
+    history = SkillsHistory(matrix, timestamps)
+    means = history.stats()['mean']
+    net_change = history.net_change()
+    trends = history.trends()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🗂️ Vertinimų", len(history))
+    col2.metric("📊 Vidutinis balas", f"{means[-1]:.1f}", f"{means[-1] - means[0]:+.1f}")
+    col3.metric("📅 Laikotarpis", f"{(timestamps[-1] - timestamps[0]).astype('timedelta64[D]').astype(int)} d.")
+
+    # Numatytai rodomos sritys, kurios pasikeitė labiausiai
+    order = np.argsort(-np.abs(net_change), kind='stable')
+    default_angles = [ANGLE_ORDER[i] for i in order[:5]]
+    selected = st.multiselect("Sritys", list(ANGLE_ORDER), default=default_angles,
+                              format_func=lambda angle: angles[angle])
+    window = st.slider("Slenkančio vidurkio langas (vertinimais)", 1, min(20, len(history)),
+                       min(3, len(history)))
+
+    if selected:
+        # Vienas grafikas visoms pasirinktoms sritims
+        columns = [ANGLE_ORDER.index(angle) for angle in selected]
+        smoothed = history.moving_average(window)[:, columns]
+        chart_data = pd.DataFrame(smoothed, index=pd.DatetimeIndex(timestamps),
+                                  columns=[angles[angle] for angle in selected])
+        st.line_chart(chart_data)
+
+    st.subheader("🔀 Pokytis nuo pirmo iki paskutinio vertinimo")
+    change_table = pd.DataFrame({
+        "Sritis": [angles[ANGLE_ORDER[i]] for i in order],
+        "Pirmas": matrix[0, order],
+        "Paskutinis": matrix[-1, order],
+        "Pokytis": net_change[order],
+        "Tendencija (balai/d.)": np.round(trends[order], 3),
+    })
+    st.dataframe(change_table, hide_index=True, use_container_width=True)
+
+# === PALYGINIMAS SU KITAIS ===
+def show_cohort():
+    """Rodyti, kur vartotojo naujausias vertinimas yra tarp visų vartotojų"""
+    import pandas as pd
+
+    if st.button("⬅️ Grįžti į vertinimą", key="cohort_back"):
+        close_pages()
+        st.rerun()
+
+    st.header("👥 Palyginimas su kitais")
+
+    scores = get_latest_scores(st.session_state.user['id'])
+    if scores is None:
+        st.info("🎯 Išsaugokite vertinimą, kad galėtumėte palyginti rezultatus.")
+        return
+
+    # Histograma palaikoma saugant, todėl čia tik 36×11 skaičių
+    histogram = get_score_histogram()
+    percentiles = cohort_percentiles(histogram, scores)
+
+    col1, col2 = st.columns(2)
+    col1.metric("👥 Vartotojų su vertinimu", int(histogram[0].sum()))
+    col2.metric("📊 Vidutinis procentilis", f"{np.nanmean(percentiles):.0f}")
+    st.caption("Procentilis rodo, kokią dalį vartotojų lenkiate toje srityje (lygūs balai skaičiuojami per pusę).")
+
+    chart_data = pd.DataFrame({"Procentilis": percentiles},
+                              index=[angles[angle] for angle in ANGLE_ORDER])
+    st.bar_chart(chart_data)
+
+    order = np.argsort(-percentiles, kind='stable')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**🏆 Labiausiai išsiskiriate:**")
+        for i in order[:3]:
+            st.success(f"{angles[ANGLE_ORDER[i]]} – {scores[i]}/10, lenkiate {percentiles[i]:.0f}%")
+    with col2:
+        st.write("**📈 Daugiausia erdvės augti:**")
+        for i in order[::-1][:3]:
+            st.warning(f"{angles[ANGLE_ORDER[i]]} – {scores[i]}/10, lenkiate {percentiles[i]:.0f}%")
+
+# === PANAŠŪS PROFILIAI ===
+SIMILAR_PROFILES = 5
+
+def show_similar_profiles():
+    """Patarimai pagal vartotojus, kurių profilis panašiausias"""
+    if st.button("⬅️ Grįžti į vertinimą", key="similar_back"):
+        close_pages()
+        st.rerun()
+
+    st.header("🤝 Panašūs profiliai ir patarimai")
+
+    user_id = st.session_state.user['id']
+    scores = get_latest_scores(user_id)
+    if scores is None:
+        st.info("🎯 Išsaugokite vertinimą, kad galėtumėte gauti patarimų.")
+        return
+
+    neighbours, gaps = similar_profiles(user_id, scores, k=SIMILAR_PROFILES)
+    if not neighbours:
+        st.info("👥 Kol kas nėra kitų vartotojų, su kuriais galėtume palyginti.")
+        return
+
+    st.write(f"**Panašiausių profilių ({len(neighbours)}) panašumas:**")
+    cols = st.columns(len(neighbours))
+    for i, (col, (_, similarity)) in enumerate(zip(cols, neighbours)):
+        col.metric(f"Profilis {i + 1}", f"{similarity * 100:.0f}%")
+
+    # Sritys, kuriose panašūs vartotojai vertina save aukščiau – galimos augimo kryptys
+    order = np.argsort(-gaps, kind='stable')
+    ahead = [i for i in order[:5] if gaps[i] > 0]
+    st.subheader("💡 Kur panašūs į jus yra pažengę toliau")
+    if ahead:
+        for i in ahead:
+            st.info(f"**{angles[ANGLE_ORDER[i]]}** – jūsų {scores[i]}/10, "
+                    f"panašių vidurkis {scores[i] + gaps[i]:.1f}/10 ({gaps[i]:+.1f})")
+    else:
+        st.success("🏆 Visose srityse esate ne žemiau už panašius profilius!")
+
+# === METRIKOS (TIK ADMINISTRATORIAMS) ===
+def show_metrics():
+    """Proceso trukmių histogramos ir skaitikliai"""
+    if st.button("⬅️ Grįžti į vertinimą", key="metrics_back"):
+        close_pages()
+        st.rerun()
+
+    st.header("📊 Metrikos")
+    if not metrics.ENABLED:
+        st.info("Metrikos išjungtos (SKILLS_METRICS=0).")
+        return
+
+    data = metrics.snapshot()
+    counters = data['counters']
+    cols = st.columns(4)
+    for col, (label, name) in zip(cols, (("Diagramos", "renders"), ("Talpyklos pataikymai", "chart_cache_hits"),
+                                         ("DB užklausos", "db_queries"), ("Prisijungimai", "logins"))):
+        col.metric(label, counters.get(name, 0))
+
+    st.subheader("⏱️ Trukmės (ms)")
+    st.dataframe([
+        {"Intervalas": name, "Kiekis": summary['count'], "Vid.": round(summary['mean_ms'], 2),
+         "p50": round(summary['p50_ms'], 2), "p95": round(summary['p95_ms'], 2),
+         "p99": round(summary['p99_ms'], 2), "Maks.": round(summary['max_ms'], 2)}
+        for name, summary in data['spans'].items()
+    ], hide_index=True)
+
+    st.subheader("🔢 Skaitikliai")
+    st.dataframe([{"Skaitiklis": name, "Reikšmė": value} for name, value in sorted(counters.items())],
+                 hide_index=True)
+
+    with st.expander("Talpyklos, rašymo eilė, KDF ir sesijos"):
+        st.json({"chart_cache": chart_cache_stats(), "writer": writer_stats(), "kdf": kdf_stats(),
+                 "sessions": session_stats()})
+
+    st.download_button("📥 Prometheus formatu", data=metrics.prometheus_text(),
+                       file_name="skills_metrics.prom", mime="text/plain")
+
+# === MASINIS EKSPORTAS (TIK ADMINISTRATORIAMS) ===
+def show_export():
+    """Visų arba atrinktų vertinimų eksportas; dideliems kiekiams – python bulk.py"""
+    import tempfile
+    import bulk
+
+    if st.button("⬅️ Grįžti į vertinimą", key="export_back"):
+        close_pages()
+        st.rerun()
+
+    st.header("📦 Vertinimų eksportas")
+    st.caption("Eilutės skaitomos iš DB dalimis ir rašomos į laikiną failą. "
+               "Milijoniniams eksportams ir importui naudokite `python bulk.py`.")
+
+    with st.form("export_form"):
+        fmt = st.radio("Formatas", bulk.FORMATS, horizontal=True,
+                       format_func={'csv': "CSV", 'jsonl': "JSON Lines", 'parquet': "Parquet"}.get)
+        emails = st.text_input("El. paštai (neprivaloma)", placeholder="a@b.lt, c@d.lt")
+        col1, col2 = st.columns(2)
+        since = col1.date_input("Nuo", value=None)
+        until = col2.date_input("Iki (imtinai)", value=None)
+        latest_only = st.checkbox("Tik naujausi kiekvieno vartotojo vertinimai")
+        submitted = st.form_submit_button("📦 Paruošti failą", type="primary")
+
+    if submitted:
+        filters = dict(emails=[email.strip() for email in emails.split(",") if email.strip()] or None,
+                       since=since.isoformat() if since else None,
+                       until=(until + timedelta(days=1)).isoformat() if until else None,
+                       latest_only=latest_only)
+        try:
+            with tempfile.TemporaryFile() as handle:
+                with st.spinner("Eksportuojama..."):
+                    count = bulk.export_assessments(handle, fmt, **filters)
+                handle.seek(0)
+                st.success(f"✅ Eksportuota vertinimų: {count}")
+                st.download_button(f"💾 Atsisiųsti .{fmt}", data=handle.read(),
+                                   file_name=f"skills_assessments_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}",
+                                   mime="text/csv" if fmt == "csv" else "application/octet-stream")
+        except RuntimeError as e:
+            st.error(f"❌ {e}")
+
 # === PAGRINDINĖ APLIKACIJA ===
+DEFAULT_SKILL = 4  # Default 4 vietoj 5
+
+def skill_defaults():
+    """Pradinės slankiklių vertės: paskutinis išsaugotas profilis arba DEFAULT_SKILL.
+
+    Išsaugoti balai gali būti 0 (senų įrašų trūkstami kampai, importas), o
+    slankiklis prasideda nuo 1 – tokie kampai pildomi DEFAULT_SKILL.
+    """
+    prefill = st.session_state.get('skill_prefill', {})
+    defaults = {}
+    for angle in angles:
+        value = int(prefill.get(angle, DEFAULT_SKILL))
+        defaults[angle] = value if 1 <= value <= 10 else DEFAULT_SKILL
+    return defaults
+
+def prefill_skills(user_id):
+    """Prisijungus užpildyti slankiklius naujausiu vertinimu (viena PK paieška)"""
+    latest = get_latest_assessment(user_id)
+    st.session_state.skill_prefill = scores_to_dict(latest['scores']) if latest else {}
+    for angle, value in skill_defaults().items():
+        st.session_state[f"skill_{angle}"] = value
+
+def clear_skills():
+    st.session_state.pop('skill_prefill', None)
+    for angle in angles:
+        st.session_state.pop(f"skill_{angle}", None)
+
+def current_skills():
+    """Slankiklių vertės iš session state (be slankiklių perpiešimo)"""
+    defaults = skill_defaults()
+    return {angle: st.session_state.get(f"skill_{angle}", defaults[angle]) for angle in angles}
+
+def skill_sliders():
+    # Pradinė vertė nustatoma per session state, o ne value=: Streamlit
+    # neleidžia abiejų, o prisijungus vertes reikia pakeisti
+    defaults = skill_defaults()
+    for angle, skill_name in angles.items():
+        key = f"skill_{angle}"
+        if key not in st.session_state:
+            st.session_state[key] = defaults[angle]
+        st.slider(
+            skill_name,
+            min_value=1,
+            max_value=10,
+            key=key,
+            help=f"Įvertinkite save kategorijoje: {skill_name}"
+        )
+
+@st.fragment
+@metrics.timed("app.editor")
+def assessment_editor():
+    """Slankikliai, diagrama ir statistikos atskiroje perpaleidimo srityje.
+
+    Pakeitus slankiklį perpaleidžiama tik ši funkcija, ne visas scenarijus.
+    "Taikyti mygtuku" režime slankikliai yra formoje, todėl tempiant
+    diagrama neperpiešiama, kol nepaspaudžiamas mygtukas.
+    """
+    col0, col1, col2 = st.columns([1.2, 2.5, 1])
+
+    with col0:
+        st.subheader("🎚️ Jūsų įvertinimas")
+        with st.container(height=720):
+            if st.session_state.get('apply_mode', False):
+                with st.form("skills_form", border=False):
+                    skill_sliders()
+                    st.form_submit_button("🔄 Atnaujinti diagramą", type="primary")
+            else:
+                skill_sliders()
+
+    skills_data = current_skills()
+
+    with col1:
+        # Rodyti circular radar diagramą
+        try:
+            chart = render_radar(skills_data, show_compass=True)
+            st.image(chart)
+        except Exception as e:
+            st.error(f"Klaida generuojant diagramą: {e}")
+
+    with col2:
+        st.subheader("📊 Statistikos")
+        summary = assessment_summary(skills_data)
+        max_skill = summary['strongest']
+        min_skill = summary['weakest']
+
+        st.metric("📊 Vidutinis balas", f"{summary['mean']:.1f}")
+
+        st.write("**🏆 Stipriausia sritis:**")
+        st.success(f"{angles[max_skill[0]][:30]}... ({max_skill[1]}/10)")
+
+        st.write("**📈 Tobulintina sritis:**")
+        st.warning(f"{angles[min_skill[0]][:30]}... ({min_skill[1]}/10)")
+
+@st.fragment(run_every=1)
+def pdf_report_progress():
+    """Kol ataskaita ruošiama fone, kas sekundę tikrinama tik ši dalis"""
+    future = cached_report(st.session_state.user['id'])
+    if future is None or future.done():
+        st.rerun()
+    st.info("⏳ PDF ataskaita ruošiama...")
+
+def pdf_report_section():
+    """PDF ataskaita: užsakoma fone, paruošta rodoma kaip atsisiuntimas"""
+    user = st.session_state.user
+    future = cached_report(user['id'])
+    if future is None:
+        if st.button("📑 Paruošti PDF ataskaitą", help="Diagrama, progresas, statistika ir refleksijos"):
+            request_report(user['id'], user['username'])
+            st.rerun()
+        return
+    if not future.done():
+        pdf_report_progress()
+        return
+    if future.exception() is not None:
+        st.error(f"❌ Klaida ruošiant ataskaitą: {future.exception()}")
+        if st.button("🔄 Bandyti dar kartą", key="pdf_retry"):
+            request_report(user['id'], user['username'])
+            st.rerun()
+        return
+    pdf = future.result()
+    if pdf is None:
+        st.info("🎯 Išsaugokite vertinimą, kad galėtumėte gauti ataskaitą.")
+        return
+    st.download_button(
+        label="📑 Atsisiųsti PDF ataskaitą",
+        data=pdf,
+        file_name=f"ataskaita_{user['username']}_{datetime.now().strftime('%Y%m%d')}.pdf",
+        mime="application/pdf"
+    )
+
 def show_main_interface():
     """Pagrindinis įgūdžių vertinimo interface"""
     
-    # Sidebar su įgūdžių sąrašu
+    # Sidebar su paaiškinimais ir režimo pasirinkimu
     with st.sidebar:
         st.header("🎯 Įgūdžių kategorijos")
         st.write("*Slinkite per visas kategorijas ir įvertinkite save*")
@@ -463,111 +685,92 @@ def show_main_interface():
             9. Aukščiausias meistršikumas, tarptautinių projektų lygis.
             10. Genijų lygis, pasaulinio masto inovatoriai, pasaulio čempionai.
             """)
-        
-        skills_data = {}
-        
-        for angle, skill_name in angles.items():
-            skills_data[angle] = st.slider(
-                skill_name,
-                min_value=1,
-                max_value=10,
-                value=4,  # Default 4 vietoj 5
-                key=f"skill_{angle}",
-                help=f"Įvertinkite save kategorijoje: {skill_name}"
-            )
+
+        st.toggle("⏸️ Taikyti mygtuku", key='apply_mode',
+                  help="Diagrama perpiešiama tik paspaudus „Atnaujinti diagramą“, o ne tempiant slankiklį")
     
-    # Pagrindinis turinys
+    # Slankikliai, diagrama ir statistikos (atskira perpaleidimo sritis)
+    assessment_editor()
+
+    # Toliau esantys veiksmai skaito slankiklių vertes paspaudimo metu
+    skills_data = current_skills()
+    summary = assessment_summary(skills_data)
+    avg_score = summary['mean']
+    max_skill = summary['strongest']
+    min_skill = summary['weakest']
+
+    st.divider()
     col1, col2 = st.columns([2.5, 1])
-    
+
     with col1:
-        # Rodyti circular radar diagramą
-        if skills_data:
-            try:
-                fig = create_circular_radar_chart(skills_data, show_compass=True)
-                st.pyplot(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Klaida generuojant diagramą: {e}")
-    
-    with col2:
-        st.subheader("📊 Statistikos")
-        if skills_data:
-            avg_score = sum(skills_data.values()) / len(skills_data)
-            max_skill = max(skills_data.items(), key=lambda x: x[1])
-            min_skill = min(skills_data.items(), key=lambda x: x[1])
-            
-            st.metric("📊 Vidutinis balas", f"{avg_score:.1f}")
-            
-            st.write("**🏆 Stipriausia sritis:**")
-            st.success(f"{angles[max_skill[0]][:30]}... ({max_skill[1]}/10)")
-            
-            st.write("**📈 Tobulintina sritis:**")
-            st.warning(f"{angles[min_skill[0]][:30]}... ({min_skill[1]}/10)")
-            
-            st.divider()
-            
-            # Saugojimas prisijungusiems
-            if 'user' in st.session_state:
-                st.subheader("💾 Išsaugoti vertinimą")
-                comment = st.text_area("💭 Pridėti refleksiją (neprivaloma)", 
-                                     placeholder="Kaip jaučiatės dėl šio vertinimo? Kokie planai tobulėjimui?")
-                
-                if st.button("💾 Išsaugoti", type="primary"):
-                    try:
-                        assessment_id = save_skill_assessment(
-                            st.session_state.user['id'],
-                            skills_data,
-                            comment
-                        )
-                        st.success(f"✅ Vertinimas išsaugotas! ID: {assessment_id}")
-                        st.balloons()
-                    except Exception as e:
-                        st.error(f"❌ Klaida saugojant: {e}")
+        # Saugojimas prisijungusiems
+        if 'user' in st.session_state:
+            st.subheader("💾 Išsaugoti vertinimą")
+            comment = st.text_area("💭 Pridėti refleksiją (neprivaloma)", 
+                                 placeholder="Kaip jaučiatės dėl šio vertinimo? Kokie planai tobulėjimui?")
             
-            st.divider()
-            
-            # Eksporto mygtukai
-            st.subheader("📥 Eksportuoti")
-            
-            # JSON eksportas
-            if st.button("📄 Atsisiųsti JSON", help="Atsisiųskite duomenis JSON formatu"):
+            if st.button("💾 Išsaugoti", type="primary"):
                 try:
-                    json_data = {
-                        "user": st.session_state.user['username'] if 'user' in st.session_state else "Anonim",
-                        "timestamp": datetime.now().isoformat(),
-                        "skills": skills_data,
-                        "statistics": {
-                            "average": round(avg_score, 2),
-                            "strongest": {
-                                "category": angles[max_skill[0]],
-                                "score": max_skill[1]
-                            },
-                            "weakest": {
-                                "category": angles[min_skill[0]],
-                                "score": min_skill[1]
-                            }
-                        },
-                        "comment": comment if 'comment' in locals() else ""
-                    }
-                    json_str = json.dumps(json_data, indent=2, ensure_ascii=False)
-                    username = st.session_state.user['username'] if 'user' in st.session_state else "anonim"
-                    st.download_button(
-                        label="💾 Atsisiųsti JSON failą",
-                        data=json_str,
-                        file_name=f"skills_{username}_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
-                        mime="application/json"
+                    assessment_id = save_skill_assessment(
+                        st.session_state.user['id'],
+                        skills_data,
+                        comment
                     )
+                    st.session_state.skill_prefill = dict(skills_data)
+                    st.success(f"✅ Vertinimas išsaugotas! ID: {assessment_id}")
+                    st.balloons()
                 except Exception as e:
-                    st.error(f"❌ Klaida eksportuojant: {e}")
+                    st.error(f"❌ Klaida saugojant: {e}")
+
+    with col2:
+        # Eksporto mygtukai
+        st.subheader("📥 Eksportuoti")
+        
+        # JSON eksportas
+        if st.button("📄 Atsisiųsti JSON", help="Atsisiųskite duomenis JSON formatu"):
+            try:
+                json_data = {
+                    "user": st.session_state.user['username'] if 'user' in st.session_state else "Anonim",
+                    "timestamp": datetime.now().isoformat(),
+                    "skills": skills_data,
+                    "statistics": {
+                        "average": round(avg_score, 2),
+                        "strongest": {
+                            "category": angles[max_skill[0]],
+                            "score": max_skill[1]
+                        },
+                        "weakest": {
+                            "category": angles[min_skill[0]],
+                            "score": min_skill[1]
+                        }
+                    },
+                    "comment": comment if 'comment' in locals() else ""
+                }
+                json_str = json.dumps(json_data, indent=2, ensure_ascii=False)
+                username = st.session_state.user['username'] if 'user' in st.session_state else "anonim"
+                st.download_button(
+                    label="💾 Atsisiųsti JSON failą",
+                    data=json_str,
+                    file_name=f"skills_{username}_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                    mime="application/json"
+                )
+            except Exception as e:
+                st.error(f"❌ Klaida eksportuojant: {e}")
+
+        # PDF ataskaita prisijungusiems
+        if 'user' in st.session_state:
+            pdf_report_section()
 
 # === MAIN EXECUTION ===
 def main():
     """Pagrindinė funkcija"""
-    # Inicializuoti duomenų bazę
+    # Inicializuoti duomenų bazę (migracijos vykdomos tik pirmą kartą per procesą)
     try:
         init_database()
     except Exception as e:
         st.error(f"❌ Klaida inicializuojant duomenų bazę: {e}")
         return
+    restore_session()
     
     # Pavadinimas ir aprašymas
     st.title("🎯 Įgūdžių įsivertinimas")
@@ -610,13 +813,26 @@ def main():
         
         with col2:
             if st.button("👤 Profilis", type="secondary"):
-                st.session_state.show_profile = True
+                open_page('show_profile')
+                reset_profile_history()
+                st.rerun()
+            if st.button("📈 Progresas", type="secondary"):
+                open_page('show_progress')
+                st.rerun()
+            if st.button("👥 Palyginimas", type="secondary"):
+                open_page('show_cohort')
+                st.rerun()
+            if st.button("🤝 Patarimai", type="secondary"):
+                open_page('show_similar')
+                st.rerun()
+            if is_admin() and st.button("📊 Metrikos", type="secondary"):
+                open_page('show_metrics')
+                st.rerun()
+            if is_admin() and st.button("📦 Eksportas", type="secondary"):
+                open_page('show_export')
                 st.rerun()
             if st.button("🚪 Atsijungti", type="secondary"):
-                if 'user' in st.session_state:
-                    del st.session_state.user
-                if 'show_profile' in st.session_state:
-                    del st.session_state.show_profile
+                logout()
                 st.rerun()
         
         st.divider()
@@ -625,6 +841,31 @@ def main():
     if 'user' in st.session_state and st.session_state.get('show_profile', False):
         show_profile()
         return
+
+    # Tikrinti ar rodyti progresą
+    if 'user' in st.session_state and st.session_state.get('show_progress', False):
+        show_progress()
+        return
+
+    # Tikrinti ar rodyti palyginimą
+    if 'user' in st.session_state and st.session_state.get('show_cohort', False):
+        show_cohort()
+        return
+
+    # Tikrinti ar rodyti panašius profilius
+    if 'user' in st.session_state and st.session_state.get('show_similar', False):
+        show_similar_profiles()
+        return
+
+    # Tikrinti ar rodyti metrikas
+    if is_admin() and st.session_state.get('show_metrics', False):
+        show_metrics()
+        return
+
+    # Tikrinti ar rodyti eksportą
+    if is_admin() and st.session_state.get('show_export', False):
+        show_export()
+        return
     
     # Rodyti pagrindinį interface
     show_main_interface()
@@ -646,4 +887,5 @@ def main():
                 st.rerun()
 
 if __name__ == "__main__":
-    main()
+    with metrics.span("app.rerun"):
+        main()
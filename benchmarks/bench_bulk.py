@@ -0,0 +1,88 @@
+"""Masinio importo ir eksporto greitis bei atmintis.
+
+Sugeneruoja CSV su --rows vertinimų (--users vartotojų), jį importuoja į
+tuščią DB ir eksportuoja visais formatais. Su --trace-memory rodomas kiekvieno
+žingsnio Python atminties pikas (tracemalloc): jis turi likti pastovus,
+nepriklausomai nuo --rows. RSS čia netinka, nes į jį įskaitomi mmap nuskaityti
+DB puslapiai; tracemalloc savo ruožtu kelis kartus sulėtina matavimą.
+
+Paleidimas:
+    python benchmarks/bench_bulk.py --rows 1000000 --users 50000
+    python benchmarks/bench_bulk.py --rows 200000 --trace-memory
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bulk  # noqa: E402
+import database  # noqa: E402
+
+def peak_memory():
+    """', atminties pikas N MB' nuo paskutinio matavimo (tuščia, jei neseka)"""
+    if not tracemalloc.is_tracing():
+        return ""
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.reset_peak()
+    return f", atminties pikas {peak:.0f} MB"
+
+def generate_csv(path, rows, users, chunk=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(bulk.FIELDS + bulk.SCORE_FIELDS)
+        for start in range(0, rows, chunk):
+            size = min(chunk, rows - start)
+            user_ids = rng.integers(1, users + 1, size=size)
+            matrix = rng.integers(1, 11, size=(size, len(bulk.SCORE_FIELDS)))
+            seconds = rng.integers(0, 3 * 365 * 86400, size=size)
+            for i in range(size):
+                created = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(1_640_995_200 + int(seconds[i])))
+                writer.writerow((start + i + 1, user_ids[i], f"vartotojas{user_ids[i]}@bench.lt",
+                                 f"Vartotojas {user_ids[i]}", created, "", *matrix[i]))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--formats", nargs="+", default=list(bulk.FORMATS))
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    source = os.path.join(workdir, "seed.csv")
+    start = time.perf_counter()
+    generate_csv(source, args.rows, args.users)
+    print(f"sugeneruota {args.rows} eilučių ({os.path.getsize(source) / 1e6:.0f} MB) "
+          f"per {time.perf_counter() - start:.1f} s")
+
+    database.DB_PATH = os.path.join(workdir, "bench_bulk.db")
+    database.init_database()
+    if args.trace_memory:
+        tracemalloc.start()
+
+    with open(source, "rb") as handle:
+        report = bulk.import_assessments(handle, "csv")
+    print(f"importas: {report['imported']} eilučių per {report['seconds']:.1f} s "
+          f"({report['imported'] / report['seconds']:,.0f} eil./s){peak_memory()}")
+
+    for fmt in args.formats:
+        target = os.path.join(workdir, f"export.{fmt}")
+        start = time.perf_counter()
+        with open(target, "wb") as handle:
+            count = bulk.export_assessments(handle, fmt)
+        elapsed = time.perf_counter() - start
+        print(f"eksportas {fmt:<8} {count} eilučių per {elapsed:5.1f} s, {os.path.getsize(target) / 1e6:6.0f} MB"
+              f"{peak_memory()}")
+    database.close_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Prisijungimo ir išsaugojimo pralaidumas: jungtis kiekvienam kvietimui vs telkinys.
+
+Paleidimas:
+    python benchmarks/bench_db_connections.py --iterations 2000 --threads 4
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Matuojame jungčių kainą, ne KDF: mažas scrypt parametras (KDF žr. bench_logins.py)
+os.environ.setdefault("SKILLS_SCRYPT_N", "16")
+
+import database  # noqa: E402
+
+SKILLS = {angle: 4 for angle in range(0, 360, 10)}
+
+# === SENASIS KELIAS (sqlite3.connect kiekvienam kvietimui) ===
+def legacy_authenticate(path, email, password):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, password_hash, username FROM users WHERE email = ?', (email,))
+    user = cursor.fetchone()
+    conn.close()
+    if user and database.verify_password(password, user[1]):
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user[0],))
+        conn.commit()
+        conn.close()
+        return {'id': user[0], 'username': user[2], 'email': email}
+    return None
+
+def legacy_save(path, user_id, skills_data, comment=""):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('INSERT INTO skill_assessments (user_id, assessment_data, comment) VALUES (?, ?, ?)',
+                   (user_id, json.dumps(skills_data), comment))
+    conn.commit()
+    assessment_id = cursor.lastrowid
+    conn.close()
+    return assessment_id
+
+# === MATAVIMAS ===
+def run(label, fn, iterations, threads):
+    per_thread = iterations // threads
+
+    def worker():
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    total = per_thread * threads
+    print(f"{label:<24} {total:>7} op  {elapsed:8.3f} s  {total / elapsed:10.0f} op/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+
+        for path in (legacy_path, pooled_path):
+            database.DB_PATH = path
+            database.init_database()
+            database.create_user("bench@example.com", "slaptas123", "bench")
+        database.close_pools()
+
+        # Senoji DB naudoja numatytąjį rollback žurnalą, kaip ir anksčiau
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+        print(f"iteracijų: {args.iterations}, gijų: {args.threads}")
+        run("login / per-call", lambda: legacy_authenticate(legacy_path, "bench@example.com", "slaptas123"),
+            args.iterations, args.threads)
+        run("save  / per-call", lambda: legacy_save(legacy_path, 1, SKILLS),
+            args.iterations, args.threads)
+
+        database.DB_PATH = pooled_path
+        run("login / pooled", lambda: database.authenticate_user("bench@example.com", "slaptas123"),
+            args.iterations, args.threads)
+        run("save  / pooled", lambda: database.save_skill_assessment(1, SKILLS),
+            args.iterations, args.threads)
+        database.close_pools()
+
+if __name__ == "__main__":
+    main()
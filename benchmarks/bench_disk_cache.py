@@ -0,0 +1,64 @@
+"""Keli app procesai su bendra disko diagramų talpykla ir be jos.
+
+Paleidžiama --processes procesų; kiekvienas (atsitiktine tvarka) paprašo tų
+pačių --charts diagramų, kaip skirtingi darbuotojai už apkrovos balansavimo.
+Be disko talpyklos kiekvienas procesas piešia visas diagramas pats; su ja
+kiekviena diagrama nupiešiama vieną kartą, o kiti ją nuskaito.
+
+Paleidimas:
+    python benchmarks/bench_disk_cache.py --processes 4 --charts 20
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import sys, time, json, random
+sys.path.insert(0, {root!r})
+import metrics, radar
+from skills import ANGLE_ORDER
+rng = random.Random(0)
+charts = [{{angle: rng.randint(1, 10) for angle in ANGLE_ORDER}} for _ in range({charts})]
+random.Random({seed}).shuffle(charts)
+timings = []
+for skills_data in charts:
+    start = time.perf_counter()
+    radar.render_radar_png(skills_data)
+    timings.append((time.perf_counter() - start) * 1000)
+counters = metrics.snapshot()['counters']
+print(json.dumps({{"timings": timings, "renders": counters.get("renders", 0),
+                  "disk_hits": counters.get("chart_disk_hits", 0)}}))
+"""
+
+def run(processes, charts, disk_mb, tmp):
+    env = dict(os.environ, SKILLS_CHART_DISK_MB=str(disk_mb),
+               SKILLS_CHART_CACHE_PATH=os.path.join(tmp, f"charts_{disk_mb}.db"),
+               SKILLS_DB_PATH=os.path.join(tmp, "skills.db"))
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER.format(root=str(ROOT), charts=charts, seed=i)],
+                                env=env, stdout=subprocess.PIPE, text=True)
+               for i in range(processes)]
+    results = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+    timings = sorted(t for result in results for t in result["timings"])
+    return (sum(result["renders"] for result in results), sum(result["disk_hits"] for result in results),
+            timings[len(timings) // 2], timings[int(len(timings) * 0.95)])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--charts", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, disk_mb in (("be disko talpyklos", 0), ("su disko talpykla", 256)):
+            renders, hits, p50, p95 = run(args.processes, args.charts, disk_mb, tmp)
+            print(f"{label:<20} nupiešta {renders:>4}, iš disko {hits:>4}   "
+                  f"užklausa p50 {p50:7.1f} ms  p95 {p95:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
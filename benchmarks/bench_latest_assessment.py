@@ -0,0 +1,83 @@
+"""Naujausio vertinimo paieška: istorijos indeksas prieš momentinę lentelę.
+
+Sugeneruoja DB su --users vartotojų po --history vertinimų ir palygina
+vieno vartotojo naujausio profilio skaitymą bei visų naujausių profilių
+perrinkimą (kohortai ir panašumo indeksui).
+
+Paleidimas:
+    python benchmarks/bench_latest_assessment.py --users 20000 --history 25
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+
+HISTORY_QUERY = '''SELECT id, scores, created_at FROM skill_assessments WHERE user_id = ?
+                   ORDER BY created_at DESC, id DESC LIMIT 1'''
+SNAPSHOT_QUERY = 'SELECT assessment_id, scores, created_at FROM latest_assessment WHERE user_id = ?'
+HISTORY_SCAN = '''SELECT user_id, scores FROM (
+                      SELECT user_id, scores, ROW_NUMBER() OVER (
+                          PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn
+                      FROM skill_assessments)
+                  WHERE rn = 1'''
+SNAPSHOT_SCAN = 'SELECT user_id, scores FROM latest_assessment ORDER BY user_id'
+
+def populate(users, history, seed=0):
+    rng = np.random.default_rng(seed)
+    with database.transaction() as conn:
+        conn.executemany('INSERT INTO users (id, email, password_hash, username) VALUES (?, ?, ?, ?)',
+                         [(i, f"u{i}@bench.lt", "x", f"u{i}") for i in range(1, users + 1)])
+        for day in range(history):
+            scores = rng.integers(1, 11, size=(users, 36)).astype(np.uint8)
+            conn.executemany('INSERT INTO skill_assessments (user_id, scores, created_at) VALUES (?, ?, ?)',
+                             [(i + 1, scores[i].tobytes(), f"2024-01-{day % 28 + 1:02d} 12:{day // 28:02d}:00")
+                              for i in range(users)])
+        database._rebuild_latest_assessments(conn)
+
+def point_lookups(label, query, user_ids):
+    timings = []
+    with database.connection() as conn:
+        for user_id in user_ids:
+            start = time.perf_counter()
+            conn.execute(query, (int(user_id),)).fetchone()
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{label:<28} p50 {timings[len(timings) // 2]:7.3f} ms   "
+          f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:7.3f} ms")
+
+def full_scan(label, query):
+    start = time.perf_counter()
+    with database.connection() as conn:
+        count = len(conn.execute(query).fetchall())
+    print(f"{label:<28} {count} profilių per {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--history", type=int, default=25)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    database.DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_latest.db")
+    database.init_database()
+    start = time.perf_counter()
+    populate(args.users, args.history)
+    print(f"{args.users} vartotojų x {args.history} vertinimų per {time.perf_counter() - start:.1f} s")
+
+    user_ids = np.random.default_rng(1).integers(1, args.users + 1, size=args.lookups)
+    point_lookups("istorija (indeksas)", HISTORY_QUERY, user_ids)
+    point_lookups("latest_assessment (PK)", SNAPSHOT_QUERY, user_ids)
+    full_scan("istorija (ROW_NUMBER)", HISTORY_SCAN)
+    full_scan("latest_assessment", SNAPSHOT_SCAN)
+    database.close_pools()
+
+if __name__ == "__main__":
+    main()
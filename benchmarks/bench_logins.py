@@ -0,0 +1,109 @@
+"""Prisijungimų pralaidumas, kai vienu metu jungiasi --concurrency vartotojų.
+
+Kiekvienam KDF telkinio dydžiui (--workers) paleidžiama --concurrency gijų,
+kurios vienu metu kviečia authenticate_user. Pusė vartotojų turi senus
+SHA-256 maišus, todėl pirmame ture jie perskaičiuojami; antrame turas jau
+vien KDF. Kartu matuojama lengvos DB užklausos delsa (kitos sesijos).
+
+Paleidimas:
+    python benchmarks/bench_logins.py --concurrency 200 --workers 1 2 4 200
+"""
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+import credentials  # noqa: E402
+
+PASSWORD = "slaptas123"
+
+def seed(count):
+    """Vartotojai: lyginiai su KDF maiša, nelyginiai su senu SHA-256"""
+    kdf_hash = credentials._hash_sync(PASSWORD)
+    legacy_hash = hashlib.sha256(PASSWORD.encode()).hexdigest()
+    with database.transaction() as conn:
+        conn.execute('DELETE FROM users')
+        conn.executemany('INSERT INTO users (email, password_hash, username) VALUES (?, ?, ?)',
+                         ((f"user{i}@example.com", legacy_hash if i % 2 else kdf_hash, f"user{i}")
+                          for i in range(count)))
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def burst(count):
+    """Visi vartotojai jungiasi vienu metu; grąžina (trukmė s, delsos ms, kitų užklausų delsos ms)"""
+    barrier = threading.Barrier(count + 1)
+    latencies = [0.0] * count
+    failures = []
+    done = threading.Event()
+    probes = []
+
+    def login(i):
+        barrier.wait()
+        start = time.perf_counter()
+        if database.authenticate_user(f"user{i}@example.com", PASSWORD) is None:
+            failures.append(i)
+        latencies[i] = (time.perf_counter() - start) * 1000
+
+    def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            database.count_user_assessments(1)
+            probes.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    prober = threading.Thread(target=probe)
+    barrier.wait()
+    start = time.perf_counter()
+    prober.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+    assert not failures, f"nepavyko prisijungti: {len(failures)}"
+    return elapsed, latencies, probes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 200])
+    args = parser.parse_args()
+
+    scheme, params = credentials._current_scheme()
+    print(f"KDF: {scheme} {params}, branduolių: {os.cpu_count()}, vienu metu: {args.concurrency}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "logins.db")
+        database.init_database()
+
+        for workers in args.workers:
+            credentials._pool = credentials.KdfPool(max_workers=workers)
+            seed(args.concurrency)
+            for label in ("su perskaičiavimu", "vien KDF"):
+                elapsed, latencies, probes = burst(args.concurrency)
+                stats = credentials.kdf_stats()
+                print(f"darbuotojų {workers:>3} / {label:<17} {args.concurrency / elapsed:7.1f} prisij./s   "
+                      f"delsa p50 {percentile(latencies, 0.5):7.0f} ms  p99 {percentile(latencies, 0.99):7.0f} ms   "
+                      f"eilė p95 {stats['queue_p95_ms']:7.0f} ms   "
+                      f"kita užklausa p99 {percentile(probes, 0.99):6.1f} ms")
+            credentials._pool.shutdown()
+
+        with database.connection() as conn:
+            legacy = conn.execute("SELECT COUNT(*) FROM users WHERE password_hash NOT LIKE '%$%'").fetchone()[0]
+        print(f"likę senų SHA-256 maišų: {legacy}")
+        database.close_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Matavimo sluoksnio kaina vienam kvietimui: įjungtas vs išjungtas (SKILLS_METRICS=0).
+
+Kiekvienas režimas vykdomas atskirame procese, nes režimas parenkamas
+importuojant metrics modulį.
+
+Paleidimas:
+    python benchmarks/bench_metrics.py --calls 1000000
+"""
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import metrics
+
+def plain(x):
+    return x
+
+@metrics.timed("bench.timed", counter="bench_calls")
+def timed(x):
+    return x
+
+def spanned(x):
+    with metrics.span("bench.span"):
+        return x
+
+for label, fn in (("be matavimo", plain), ("@timed", timed), ("span()", spanned)):
+    start = time.perf_counter()
+    for i in range({calls}):
+        fn(i)
+    print(f"{{label:<12}} {{(time.perf_counter() - start) / {calls} * 1e9:7.0f}} ns/kvietimą")
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for label, value in (("įjungta", "1"), ("išjungta", "0")):
+        print(f"-- SKILLS_METRICS={value} ({label})")
+        result = subprocess.run([sys.executable, "-c", SCRIPT.format(root=str(ROOT), calls=args.calls)],
+                                env=dict(os.environ, SKILLS_METRICS=value), capture_output=True,
+                                text=True, check=True)
+        print(result.stdout, end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Profilio istorijos užklausų delsa be ir su (user_id, created_at) indeksu.
+
+Sugeneruoja --rows vertinimų tarp --users vartotojų laikinoje DB, pamatuoja
+p50/p99 be indekso, tada jį sukuria (kaip 2-oji migracija) ir pamatuoja dar
+kartą.
+
+Paleidimas:
+    python benchmarks/bench_profile_history.py --rows 1000000 --users 50000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+
+INDEX_NAME = "idx_skill_assessments_user_created"
+
+def seed(path, rows, users, batch=50000):
+    """Užpildyti DB atsitiktiniais vertinimais"""
+    rng = random.Random(42)
+    start = datetime(2023, 1, 1)
+    database.init_database(path)
+    with database.get_pool(path).transaction() as conn:
+        conn.executemany('INSERT INTO users (id, email, password_hash, username) VALUES (?, ?, ?, ?)',
+                         ((i, f"user{i}@example.com", "x", f"user{i}") for i in range(1, users + 1)))
+
+    for offset in range(0, rows, batch):
+        chunk = []
+        for _ in range(min(batch, rows - offset)):
+            scores = bytes(rng.randint(1, 10) for _ in range(36))
+            created = start + timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600))
+            chunk.append((rng.randint(1, users), scores, "",
+                          created.strftime("%Y-%m-%d %H:%M:%S")))
+        with database.get_pool(path).transaction() as conn:
+            conn.executemany('INSERT INTO skill_assessments (user_id, scores, comment, created_at) '
+                             'VALUES (?, ?, ?, ?)', chunk)
+
+def measure(label, fn, user_ids):
+    timings = []
+    for user_id in user_ids:
+        start = time.perf_counter()
+        fn(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<34} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms   (n={len(timings)})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--queries-unindexed", type=int, default=50,
+                        help="užklausų kiekis be indekso (jos lėtos)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        database.DB_PATH = path
+
+        start = time.perf_counter()
+        seed(path, args.rows, args.users)
+        print(f"sugeneruota {args.rows} vertinimų / {args.users} vartotojų per "
+              f"{time.perf_counter() - start:.1f} s")
+
+        rng = random.Random(7)
+        sample = [rng.randint(1, args.users) for _ in range(args.queries)]
+
+        print("-- be indekso")
+        with database.get_pool(path).transaction() as conn:
+            conn.execute(f"DROP INDEX {INDEX_NAME}")
+        measure("get_user_assessments", database.get_user_assessments, sample[:args.queries_unindexed])
+        measure("get_user_assessment_summaries", database.get_user_assessment_summaries,
+                sample[:args.queries_unindexed])
+
+        start = time.perf_counter()
+        with database.get_pool(path).transaction() as conn:
+            for version, _, steps in database.MIGRATIONS:
+                if version == 2:
+                    for step in steps:
+                        conn.execute(step)
+        print(f"-- su indeksu (sukurtas per {time.perf_counter() - start:.1f} s)")
+        measure("get_user_assessments", database.get_user_assessments, sample)
+        measure("get_user_assessment_summaries", database.get_user_assessment_summaries, sample)
+        database.close_pools()
+
+if __name__ == "__main__":
+    main()
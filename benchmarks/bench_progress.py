@@ -0,0 +1,64 @@
+"""Progreso puslapio duomenų paruošimo laikas pagal istorijos ilgį.
+
+Matuoja get_user_score_history + SkillsHistory skaičiavimus (vidurkiai,
+pokytis, tendencijos, slenkantis vidurkis) vartotojui su N vertinimų.
+
+Paleidimas:
+    python benchmarks/bench_progress.py --sizes 100 1000 5000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+from skills import SkillsHistory  # noqa: E402
+
+def progress_pass(user_id):
+    timestamps, matrix = database.get_user_score_history(user_id)
+    history = SkillsHistory(matrix, timestamps)
+    history.stats()
+    history.net_change()
+    history.trends()
+    history.moving_average(3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "progress.db")
+        database.init_database()
+        start = datetime(2020, 1, 1)
+        for user_id, size in enumerate(args.sizes, start=1):
+            database.create_user(f"user{user_id}@example.com", "x", f"user{user_id}")
+            rows = [(user_id, bytes(rng.randint(1, 10) for _ in range(36)),
+                     (start + timedelta(hours=i)).strftime("%Y-%m-%d %H:%M:%S"))
+                    for i in range(size)]
+            with database.transaction() as conn:
+                conn.executemany('INSERT INTO skill_assessments (user_id, scores, created_at) VALUES (?, ?, ?)',
+                                 rows)
+
+        for user_id, size in enumerate(args.sizes, start=1):
+            progress_pass(user_id)
+            timings = []
+            for _ in range(args.repeat):
+                begin = time.perf_counter()
+                progress_pass(user_id)
+                timings.append((time.perf_counter() - begin) * 1000)
+            timings.sort()
+            print(f"{size:>7} vertinimų   p50 {timings[len(timings) // 2]:7.2f} ms   "
+                  f"max {timings[-1]:7.2f} ms")
+        database.close_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Radar diagramos naudingoji apkrova ir serverio CPU laikas vienam piešimui.
+
+Lygina PNG (klasikinis ir greitasis piešėjas) su SVG išvestimi, kurią
+piešia naršyklė. Talpykla apeinama.
+
+Paleidimas:
+    python benchmarks/bench_radar_payload.py --frames 20
+"""
+import sys
+import gzip
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import radar  # noqa: E402
+from skills import ANGLE_ORDER  # noqa: E402
+
+def measure(label, render, frames):
+    render(frames[0])  # apšilimas
+    cpu = []
+    sizes = []
+    gzipped = []
+    for skills_data in frames:
+        start = time.process_time()
+        output = render(skills_data)
+        cpu.append((time.process_time() - start) * 1000)
+        payload = output.encode() if isinstance(output, str) else output
+        sizes.append(len(payload))
+        gzipped.append(len(gzip.compress(payload)))
+    count = len(frames)
+    print(f"{label:<24} CPU {sum(cpu) / count:8.2f} ms   "
+          f"dydis {sum(sizes) / count / 1024:7.1f} KB   gzip {sum(gzipped) / count / 1024:7.1f} KB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    frames = [{angle: rng.randint(1, 10) for angle in ANGLE_ORDER} for _ in range(args.frames)]
+
+    measure("PNG / classic", lambda data: radar.fig_to_png(radar.create_circular_radar_chart(data)), frames)
+    renderer = radar.get_renderer()
+    measure("PNG / fast", renderer.render, frames)
+    measure("SVG", radar.create_radar_svg, frames)
+
+if __name__ == "__main__":
+    main()
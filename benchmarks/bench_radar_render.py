@@ -0,0 +1,49 @@
+"""Radar diagramos piešimo kaina ms/kadrui: pilnas perkūrimas vs artistų atnaujinimas.
+
+Talpykla apeinama: kiekvienas kadras turi naujas atsitiktines vertes.
+
+Paleidimas:
+    python benchmarks/bench_radar_render.py --frames 30
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import radar  # noqa: E402
+from skills import ANGLE_ORDER  # noqa: E402
+
+def random_frames(count, seed=1):
+    rng = random.Random(seed)
+    return [{angle: rng.randint(1, 10) for angle in ANGLE_ORDER} for _ in range(count)]
+
+def measure(label, render, frames):
+    render(frames[0])  # apšilimas (šriftai, statinė figūra)
+    timings = []
+    for skills_data in frames:
+        start = time.perf_counter()
+        png = render(skills_data)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    print(f"{label:<38} vid. {mean:7.1f} ms   p50 {timings[len(timings) // 2]:7.1f} ms   "
+          f"PNG {len(png) / 1024:6.0f} KB")
+    return mean
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    frames = random_frames(args.frames)
+    classic = measure("create_circular_radar_chart + PNG",
+                      lambda data: radar.fig_to_png(radar.create_circular_radar_chart(data)), frames)
+    renderer = radar.get_renderer()
+    fast = measure("RadarRenderer.render", lambda data: renderer.render(data), frames)
+    print(f"pagreitis: x{classic / fast:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Pakartotinio apsilankymo kaina: slaptažodis prieš pasirašytą sesijos žetoną.
+
+Palygina authenticate_user (DB + KDF), validate_token talpyklos nepataikius
+(parašas + viena PK užklausa) ir validate_token talpykloje (tik parašas).
+
+Paleidimas:
+    python benchmarks/bench_sessions.py --repeats 200
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+import sessions  # noqa: E402
+
+def measure(label, fn, repeats, before=None):
+    timings = []
+    for _ in range(repeats):
+        if before:
+            before()
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        assert result, label
+    timings.sort()
+    print(f"{label:<34} p50 {timings[len(timings) // 2]:9.3f} ms   "
+          f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:9.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--login-repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    database.DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sessions.db")
+    database.init_database()
+    database.create_user("bench@sessions.lt", "slaptas123", "Bench")
+    user = database.authenticate_user("bench@sessions.lt", "slaptas123")
+    token = sessions.issue_token(user)
+
+    measure("authenticate_user (KDF)", lambda: database.authenticate_user("bench@sessions.lt", "slaptas123"),
+            args.login_repeats)
+    measure("validate_token (DB, be talpyklos)", lambda: sessions.validate_token(token), args.repeats,
+            before=sessions.session_cache.clear)
+    measure("validate_token (talpykloje)", lambda: sessions.validate_token(token), args.repeats)
+    database.close_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Panašių profilių paieškos delsa: perrinkimas (cosine/L2) ir IVF indeksas.
+
+Paleidimas:
+    python benchmarks/bench_similarity.py --users 100000 --queries 200 --k 10
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from similarity import SimilarityIndex  # noqa: E402
+
+def measure(label, index, queries, k, metric):
+    timings = []
+    results = []
+    for user_id, vector in queries:
+        start = time.perf_counter()
+        results.append(index.query(vector, k=k, metric=metric, exclude=user_id))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{label:<22} p50 {timings[len(timings) // 2]:7.3f} ms   "
+          f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:7.3f} ms")
+    return results
+
+def recall(exact, approximate):
+    hits = sum(len({u for u, _ in e} & {u for u, _ in a}) for e, a in zip(exact, approximate))
+    return hits / max(1, sum(len(e) for e in exact))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = rng.integers(1, 11, size=(args.users, 36)).astype(np.uint8)
+    user_ids = np.arange(1, args.users + 1)
+
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    index.bulk_load(user_ids, matrix)
+    print(f"užkrauta {args.users} vektorių per {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    picks = rng.choice(args.users, size=args.queries, replace=False)
+    queries = [(int(user_ids[i]), matrix[i]) for i in picks]
+
+    exact = measure("perrinkimas / cosine", index, queries, args.k, "cosine")
+    measure("perrinkimas / l2", index, queries, args.k, "l2")
+
+    start = time.perf_counter()
+    index.build_ivf()
+    print(f"IVF sukurtas per {(time.perf_counter() - start) * 1000:.0f} ms")
+    for nprobe in args.nprobe:
+        index.nprobe = nprobe
+        approximate = measure(f"IVF nprobe={nprobe} / cosine", index, queries, args.k, "cosine")
+        print(f"{'':<22} recall@{args.k} {recall(exact, approximate):.3f}")
+
+    start = time.perf_counter()
+    for user_id, vector in queries:
+        index.upsert(user_id, vector[::-1])
+    print(f"upsert: {(time.perf_counter() - start) * 1000 / len(queries):.3f} ms/vnt.")
+
+if __name__ == "__main__":
+    main()
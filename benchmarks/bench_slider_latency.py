@@ -0,0 +1,76 @@
+"""Delsa vienam slankiklio pakeitimui: viso scenarijaus vs fragmento perpaleidimas.
+
+AppTest visada vykdo visą jam duotą scenarijų, todėl fragmento
+perpaleidimas matuojamas scenarijumi, kuris kviečia tik
+app.assessment_editor() – tai tas pats darbas, kurį Streamlit atlieka
+perpaleisdamas fragmentą. Vertės atsitiktinės, todėl diagramų talpykla
+beveik nepadeda. Pabaigoje palyginama „tempimo“ per --drag verčių kaina
+tiesioginiu ir „Taikyti mygtuku“ režimais.
+
+Paleidimas:
+    python benchmarks/bench_slider_latency.py --changes 30
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from skills import ANGLE_ORDER  # noqa: E402
+
+def editor_script(root):
+    import sys
+    sys.path.insert(0, root)
+    from app import assessment_editor
+    assessment_editor()
+
+def measure(label, at, changes, seed=3):
+    rng = random.Random(seed)
+    at.run()
+    timings = []
+    for _ in range(changes):
+        angle = rng.choice(ANGLE_ORDER)
+        start = time.perf_counter()
+        at.slider(key=f"skill_{angle}").set_value(rng.randint(1, 10)).run()
+        timings.append((time.perf_counter() - start) * 1000)
+        assert not at.exception, at.exception
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    print(f"{label:<26} vid. {mean:7.1f} ms   p50 {timings[len(timings) // 2]:7.1f} ms   "
+          f"p95 {timings[int(len(timings) * 0.95)]:7.1f} ms")
+    return mean
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--changes", type=int, default=30)
+    parser.add_argument("--drag", type=int, default=10, help="kiek verčių pereinama tempiant slankiklį")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SKILLS_DB_PATH"] = os.path.join(tmp, "latency.db")
+        os.chdir(ROOT)
+        full = measure("visas scenarijus", AppTest.from_file(str(ROOT / "app.py"), default_timeout=60),
+                       args.changes)
+        fragment = AppTest.from_function(editor_script, args=(str(ROOT),), default_timeout=60)
+        per_change = measure("tik fragmentas", fragment, args.changes, seed=4)
+        print(f"pagreitis: x{full / per_change:.2f}")
+
+        # Tempimas: kiekviena tarpinė vertė perpiešia diagramą, formoje – tik pateikimas
+        fragment.session_state["apply_mode"] = True
+        fragment.run()
+        start = time.perf_counter()
+        fragment.slider(key=f"skill_{ANGLE_ORDER[0]}").set_value(7)
+        fragment.button[0].click().run()
+        submit = (time.perf_counter() - start) * 1000
+        print(f"tempimas per {args.drag} verčių: tiesiogiai ~{per_change * args.drag:.0f} ms "
+              f"({args.drag} diagramų), su „Taikyti mygtuku“ {submit:.0f} ms (1 diagrama)")
+
+if __name__ == "__main__":
+    main()
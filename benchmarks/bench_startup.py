@@ -0,0 +1,92 @@
+"""Šaltas startas: importų profilis (-X importtime) ir laikas iki pirmos diagramos.
+
+Kiekvienas matavimas vykdomas naujame Python procese. Režimai:
+  eager   – kaip anksčiau: pandas ir matplotlib.pyplot importuojami iš karto,
+            be pašildymo;
+  lazy    – tik tingūs importai (SKILLS_PREWARM=0);
+  prewarm – tingūs importai ir fone paruoštas piešėjas (numatytasis);
+  idle    – kaip prewarm, bet pašildymas pradėtas proceso pradžioje ir pirmoji
+            sesija ateina po --idle s (serveris laukia naršyklės).
+
+Viename branduolyje foninis pašildymas negali persidengti su pirmojo
+paleidimo CPU darbu (GIL), todėl jo nauda matoma tik „idle“ režime arba kai
+yra laisvų branduolių.
+
+Paleidimas:
+    python benchmarks/bench_startup.py --runs 5 --top 15
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+APP_IMPORTS = "import streamlit, skills, radar, similarity, database, credentials"
+EAGER_IMPORTS = "import pandas, matplotlib.pyplot"
+
+FIRST_CHART = """
+import sys, time, json, tempfile, os
+start = time.perf_counter()
+os.environ["SKILLS_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "startup.db")
+sys.path.insert(0, {root!r})
+{eager}
+from streamlit.testing.v1 import AppTest
+{idle}
+imported = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+assert not at.exception and len(at.get("image")) > 0, at.exception
+done = time.perf_counter()
+print(json.dumps({{"imports": imported - start, "first_run": done - imported, "total": done - start}}))
+"""
+
+def import_profile(statement, top):
+    """Didžiausi importai pagal sukauptą laiką (-X importtime)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Tik pirmo lygio moduliai (be įtraukos)
+        if not name.startswith("  "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top], sum(ms for ms, _ in rows)
+
+def first_chart(mode, idle):
+    env = dict(os.environ, SKILLS_PREWARM="0" if mode in ("eager", "lazy") else "1")
+    script = FIRST_CHART.format(root=str(ROOT), app=str(ROOT / "app.py"),
+                                eager=EAGER_IMPORTS if mode == "eager" else "",
+                                idle=f"import radar; radar.prewarm(); time.sleep({idle})" if mode == "idle" else "")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--idle", type=float, default=3.0)
+    args = parser.parse_args()
+
+    for label, statement in (("programos moduliai", APP_IMPORTS),
+                             ("+ pandas ir pyplot (anksčiau)", f"{APP_IMPORTS}; {EAGER_IMPORTS}")):
+        rows, total = import_profile(statement, args.top)
+        print(f"-- importai: {label}, iš viso {total:.0f} ms")
+        for ms, name in rows:
+            print(f"   {ms:8.1f} ms  {name}")
+
+    print("-- laikas iki pirmos diagramos (mediana)")
+    for mode in ("eager", "lazy", "prewarm", "idle"):
+        runs = [first_chart(mode, args.idle) for _ in range(args.runs)]
+        print(f"{mode:<8} importai {statistics.median(r['imports'] for r in runs) * 1000:7.0f} ms   "
+              f"pirmas paleidimas {statistics.median(r['first_run'] for r in runs) * 1000:7.0f} ms   "
+              f"iš viso {statistics.median(r['total'] for r in runs) * 1000:7.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Saugyklų palyginimas: bendra elgsenos patikra ir pralaidumas.
+
+Kiekvienai --url saugyklai pirmiausia paleidžiama storage.contract patikra,
+tada --threads gijų vienu metu atlieka po --ops operacijų mišinį:
+išsaugojimas (--write-ratio), istorija (get_user_assessments) ir naujausias
+vertinimas. Slaptažodžių KDF nematuojamas – matuojama tik saugykla.
+
+Paleidimas:
+    python benchmarks/bench_storage.py                      # laikinas SQLite failas
+    python benchmarks/bench_storage.py --url sqlite:////tmp/a.db \\
+        --url postgresql://localhost/skills_bench --threads 16
+    # keli mazgai: kelis procesus vienu metu su ta pačia DB
+    python benchmarks/bench_storage.py --url postgresql://localhost/skills_bench --shared
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import storage  # noqa: E402
+from skills import ANGLE_ORDER, encode_scores  # noqa: E402
+from storage.contract import check_backend_contract  # noqa: E402
+
+def run(backend, threads, ops, write_ratio, users):
+    rng = random.Random(0)
+    tag = f"{os.getpid()}-{time.time_ns()}"
+    user_ids = [backend.create_user(f"bench{i}-{tag}@storage.lt", "!", f"bench{i}") for i in range(users)]
+    payloads = [encode_scores({angle: rng.randint(0, 10) for angle in ANGLE_ORDER}) for _ in range(64)]
+    for user_id in user_ids:
+        backend.save_assessment(user_id, payloads[user_id % len(payloads)], "")
+
+    latencies = {"save": [], "history": [], "latest": []}
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(seed):
+        local_rng = random.Random(seed)
+        timings = {kind: [] for kind in latencies}
+        barrier.wait()
+        for _ in range(ops):
+            user_id = local_rng.choice(user_ids)
+            roll = local_rng.random()
+            start = time.perf_counter()
+            try:
+                if roll < write_ratio:
+                    kind = "save"
+                    backend.save_assessment(user_id, local_rng.choice(payloads), "")
+                elif roll < write_ratio + (1 - write_ratio) / 2:
+                    kind = "history"
+                    backend.get_user_assessments(user_id)
+                else:
+                    kind = "latest"
+                    backend.get_latest_assessment(user_id)
+            except Exception as exc:
+                # Klaidos (pvz. DB aklavietės) skaičiuojamos, o ne nutraukia giją
+                with lock:
+                    errors.append(exc)
+                continue
+            timings[kind].append((time.perf_counter() - start) * 1000)
+        with lock:
+            for kind, values in timings.items():
+                latencies[kind].extend(values)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"  iš viso {total / elapsed:8.0f} op/s ({threads} gijų, {elapsed:.2f} s)")
+    for kind, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        print(f"  {kind:<8} {len(values):6d} op   p50 {values[len(values) // 2]:7.2f} ms   "
+              f"p99 {values[min(len(values) - 1, int(len(values) * 0.99))]:7.2f} ms")
+    if errors:
+        print(f"  klaidų: {len(errors)}, pirma: {errors[0]!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", default=[],
+                        help="saugyklos URL (kartojamas); numatytai – laikinas SQLite failas")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="operacijų vienai gijai")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--shared", action="store_true",
+                        help="kiti procesai (mazgai) tuo pačiu metu naudoja tą pačią DB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = args.url or [f"sqlite:///{os.path.join(tmp, 'bench_storage.db')}"]
+        for url in urls:
+            backend = storage.open_backend(url)
+            print(f"{backend.name}: {url.split('@')[-1]}")
+            try:
+                passed = check_backend_contract(backend, exclusive=not args.shared)
+                print(f"  patikra: {len(passed)} praeita")
+                run(backend, args.threads, args.ops, args.write_ratio, args.users)
+            finally:
+                backend.close()
+
+if __name__ == "__main__":
+    main()
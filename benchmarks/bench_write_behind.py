@@ -0,0 +1,87 @@
+"""Išsaugojimų pralaidumas: atskiras COMMIT kiekvienam vs rašymo eilė (grupinis commit).
+
+--sessions gijų vienu metu išsaugo po --saves vertinimų (kaip klasė,
+paspaudusi „Išsaugoti“ tuo pačiu metu). Abiem atvejais jungtis naudoja
+synchronous=FULL, t. y. kiekvienas grįžęs išsaugojimas yra patvarus.
+
+Paleidimas:
+    python benchmarks/bench_write_behind.py --sessions 30 --saves 20
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+from skills import ANGLE_ORDER, encode_scores  # noqa: E402
+from storage.sqlite import _write_assessment  # noqa: E402
+
+SCORES = encode_scores({angle: 5 for angle in ANGLE_ORDER})
+
+_local = threading.local()
+
+def direct_save(user_id):
+    """Ankstesnis kelias: kiekvienas išsaugojimas – atskira transakcija ir fsync"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = database.get_pool()._connect()
+        conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("BEGIN IMMEDIATE")
+    assessment_id = _write_assessment(conn, user_id, SCORES, "")
+    conn.execute("COMMIT")
+    return assessment_id
+
+def queued_save(user_id):
+    return database.get_writer().submit(_write_assessment, user_id, SCORES, "")
+
+def run(label, save, sessions, saves):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session(user_id):
+        barrier.wait()
+        for _ in range(saves):
+            start = time.perf_counter()
+            save(user_id)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=session, args=(i + 1,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<22} {len(latencies) / elapsed:8.0f} išsaug./s   "
+          f"p50 {latencies[len(latencies) // 2]:7.2f} ms   p99 {latencies[int(len(latencies) * 0.99)]:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "writes.db")
+        database.init_database()
+        with database.transaction() as conn:
+            conn.executemany('INSERT INTO users (id, email, password_hash, username) VALUES (?, ?, ?, ?)',
+                             ((i, f"user{i}@example.com", "x", f"user{i}") for i in range(1, args.sessions + 1)))
+
+        run("atskiras COMMIT", direct_save, args.sessions, args.saves)
+        run("rašymo eilė", queued_save, args.sessions, args.saves)
+        stats = database.get_writer().stats()
+        print(f"transakcijų: {stats['batches']}, vid. įrašų transakcijoje: "
+              f"{stats['writes'] / max(1, stats['batches']):.1f}, didžiausia: {stats['largest_batch']}")
+        database.close_pools()
+
+if __name__ == "__main__":
+    main()
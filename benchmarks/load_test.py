@@ -0,0 +1,195 @@
+"""Apkrovos testas: N sesijų vienam app.py procesui per Streamlit AppTest.
+
+Kiekviena sesija laikinoje SQLite DB: užsiregistruoja, gauna --history
+vertinimų istoriją, prisijungia, pajudina --sliders slankiklių, išsaugo
+--saves vertinimų ir atidaro profilį su vieno vertinimo detalėmis. Vienu
+metu vykdoma --concurrency sesijų, kiekviena atskirame procese: AppTest
+naudoja procesui bendrą Streamlit Runtime, todėl gijos viename procese
+lenktyniautų. Sesijos klaida įrašoma į ataskaitą ir kitų sesijų
+nenutraukia. Ataskaitoje: pralaidumas, kiekvieno veiksmo p50/p95/p99 ir
+didžiausias vieno proceso RSS. Atsitiktinumas fiksuotas (--seed), o --json
+išsaugo rezultatus palyginimui tarp versijų.
+
+Paleidimas:
+    python benchmarks/load_test.py --sessions 20 --concurrency 4
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "app.py")
+PASSWORD = "Slaptas#123"
+
+class Recorder:
+    """Vienos sesijos veiksmų trukmės ir klaidos"""
+
+    def __init__(self):
+        self.timings = {}
+        self.errors = []
+
+    def timed(self, action, at, fn):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.timings.setdefault(action, []).append(elapsed)
+        if at.exception:
+            self.errors.append((action, str(at.exception[0].value)))
+        self.errors.extend((action, error.value) for error in at.error)
+
+def button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+def seed_history(user_id, count, rng):
+    """Realistiška istorija: vertinimai per pastaruosius dvejus metus.
+
+    Įterpiama tiesiai su praeities datomis, todėl po to perskaičiuojamos
+    latest_assessment ir kohortos histograma – matuojami puslapiai skaito
+    nuoseklius duomenis.
+    """
+    import database
+    from skills import ANGLE_ORDER, encode_scores
+
+    start = datetime.now() - timedelta(days=730)
+    rows = []
+    for i in range(count):
+        created = start + timedelta(days=730 * i / max(1, count))
+        scores = encode_scores({angle: rng.randint(1, 10) for angle in ANGLE_ORDER})
+        rows.append((user_id, scores, f"istorija {i}", created.strftime("%Y-%m-%d %H:%M:%S")))
+    with database.transaction() as conn:
+        database.insert_assessment_batch(conn, rows)
+    database.rebuild_derived_tables()
+
+def _init_worker(db_path):
+    # Prieš importuojant app/database: visos sesijos naudoja laikiną DB
+    os.environ["SKILLS_DB_PATH"] = db_path
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+def run_session(number, args):
+    """Viena sesija darbiniame procese; grąžina (trukmės, klaidos, proceso RSS MB)"""
+    recorder = Recorder()
+    try:
+        _session(number, args, recorder)
+    except Exception as exc:
+        recorder.errors.append(("session", f"{type(exc).__name__}: {exc}"))
+    finally:
+        import database
+        database.close_pools()
+    return recorder.timings, recorder.errors, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _session(number, args, recorder):
+    from streamlit.testing.v1 import AppTest
+    from skills import ANGLE_ORDER
+
+    rng = random.Random(args.seed * 100003 + number)
+    email = f"load{number}@example.com"
+    at = AppTest.from_file(APP, default_timeout=120)
+    recorder.timed("first_load", at, at.run)
+
+    at.session_state["show_auth"] = True
+    at.run()
+    # Laukai: prisijungimo el. paštas, slaptažodis; registracijos vardas, el. paštas, 2 slaptažodžiai
+    at.text_input[2].input(f"load{number}")
+    at.text_input[3].input(email)
+    at.text_input[4].input(PASSWORD)
+    at.text_input[5].input(PASSWORD)
+    recorder.timed("register", at, lambda: button(at, "Registruotis").click().run())
+
+    import database
+    with database.connection() as conn:
+        user_id = conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()[0]
+    seed_history(user_id, args.history, rng)
+
+    at.text_input[0].input(email)
+    at.text_input[1].input(PASSWORD)
+    recorder.timed("login", at, lambda: button(at, "Prisijungti").click().run())
+    recorder.timed("navigate", at, lambda: button(at, "⬅️ Grįžti prie vertinimo").click().run())
+
+    for _ in range(args.sliders):
+        slider = at.slider(key=f"skill_{rng.choice(ANGLE_ORDER)}")
+        recorder.timed("slider", at, lambda: slider.set_value(rng.randint(1, 10)).run())
+
+    for i in range(args.saves):
+        at.text_area[0].input(f"apkrovos testas {i}")
+        recorder.timed("save", at, lambda: button(at, "💾 Išsaugoti").click().run())
+
+    recorder.timed("profile", at, lambda: button(at, "👤 Profilis").click().run())
+    details = next((b for b in at.button if b.label.startswith("▶")), None)
+    if details is not None:
+        recorder.timed("profile_detail", at, lambda: details.click().run())
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--history", type=int, default=100, help="vertinimų istorijoje vienam vartotojui")
+    parser.add_argument("--sliders", type=int, default=10)
+    parser.add_argument("--saves", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="kur išsaugoti rezultatus JSON formatu")
+    args = parser.parse_args()
+
+    timings, errors, peak_rss_mb = {}, [], 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "load.db")
+        _init_worker(db_path)
+        import database
+        # Schema sukuriama vieną kartą, prieš paleidžiant darbinius procesus
+        database.init_database()
+        database.close_pools()
+
+        start = time.perf_counter()
+        # Naujas procesas kiekvienai sesijai: AppTest pakeičia __main__ ir Runtime
+        with ProcessPoolExecutor(max_workers=args.concurrency, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(db_path,),
+                                 max_tasks_per_child=1) as executor:
+            futures = [executor.submit(run_session, i, args) for i in range(args.sessions)]
+            for future in futures:
+                try:
+                    session_timings, session_errors, rss_mb = future.result()
+                except Exception as exc:
+                    # Pvz. nukritęs darbinis procesas: įrašoma, kiti rezultatai lieka
+                    errors.append(("session", f"{type(exc).__name__}: {exc}"))
+                    continue
+                for action, values in session_timings.items():
+                    timings.setdefault(action, []).extend(values)
+                errors.extend(session_errors)
+                peak_rss_mb = max(peak_rss_mb, rss_mb)
+        elapsed = time.perf_counter() - start
+
+    actions = sum(len(values) for values in timings.values())
+    print(f"sesijų {args.sessions}, vienu metu {args.concurrency}, trukmė {elapsed:.1f} s")
+    print(f"pralaidumas: {actions / elapsed:.1f} veiksmų/s, {args.sessions / elapsed * 60:.1f} sesijų/min")
+    print(f"didžiausias vieno proceso RSS: {peak_rss_mb:.0f} MB, klaidų: {len(errors)}")
+    report = {}
+    for action, values in timings.items():
+        values.sort()
+        report[action] = {'count': len(values), 'p50_ms': percentile(values, 0.50),
+                          'p95_ms': percentile(values, 0.95), 'p99_ms': percentile(values, 0.99),
+                          'max_ms': values[-1]}
+        print(f"  {action:<15} n={len(values):<5} p50 {report[action]['p50_ms']:8.1f} ms   "
+              f"p95 {report[action]['p95_ms']:8.1f} ms   p99 {report[action]['p99_ms']:8.1f} ms")
+    for action, error in errors[:10]:
+        print(f"  klaida ({action}): {error}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({'args': vars(args), 'elapsed_s': elapsed, 'actions_per_s': actions / elapsed,
+                       'peak_rss_mb': peak_rss_mb, 'errors': len(errors), 'actions': report},
+                      handle, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""Masinis vertinimų eksportas ir importas (CSV, JSON Lines, Parquet).
+
+Eksportas skaito DB dalimis (fetchmany) ir kiekvieną dalį iš karto įrašo į
+failą, todėl atmintis nepriklauso nuo lentelės dydžio. Importas tikrina
+eilutes ir įterpia jas executemany po --batch eilučių vienoje transakcijoje;
+pabaigoje vieną kartą perskaičiuojamos išvestinės lentelės (latest_assessment
+ir kohortos histograma). Parquet formatui reikia pyarrow.
+
+Pavyzdžiai:
+    python bulk.py export --out vertinimai.csv
+    python bulk.py export --out v.parquet --emails a@b.lt,c@d.lt --since 2024-09-01
+    python bulk.py export --out - --format jsonl --latest | gzip > naujausi.jsonl.gz
+    python bulk.py import vertinimai.csv
+    python bulk.py import v.jsonl --dry-run
+"""
+import io
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+from itertools import islice
+
+import numpy as np
+
+import database
+import metrics
+import storage
+from skills import ANGLE_ORDER, SCORE_DTYPE, decode_score_matrix
+
+# Kiek eilučių skaitoma iš DB ir įterpiama vienoje transakcijoje
+BATCH_SIZE = 5000
+# Kiek klaidų rodoma ataskaitoje
+MAX_REPORTED_ERRORS = 100
+
+FIELDS = ('id', 'user_id', 'email', 'username', 'created_at', 'comment')
+SCORE_FIELDS = tuple(f"angle_{angle}" for angle in ANGLE_ORDER)
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet formatui reikia pyarrow (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+
+def format_from_path(path):
+    """Formatas pagal failo plėtinį (numatytasis CSV)"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# === EKSPORTAS ===
+class CsvExporter:
+    def __init__(self, handle):
+        self._text = io.TextIOWrapper(handle, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(FIELDS + SCORE_FIELDS)
+
+    def write_batch(self, rows):
+        # BLOB iteruojamas kaip 36 sveikieji skaičiai ANGLE_ORDER tvarka
+        self._writer.writerows((*row[:5], row[5] or "", *row[6]) for row in rows)
+
+    def close(self):
+        self._text.flush()
+        self._text.detach()
+
+class JsonlExporter:
+    """Viena eilutė – vienas vertinimas; balai kaip žodynas, kaip ir JSON eksporte"""
+
+    # Balų žodynas formuojamas šablonu: json.dumps 36 raktams – lėčiausia eilutės dalis
+    SCORES = '"scores": {' + ", ".join(f'"{angle}": %d' for angle in ANGLE_ORDER) + "}}\n"
+
+    def __init__(self, handle):
+        self._text = io.TextIOWrapper(handle, encoding="utf-8", newline="\n")
+
+    def write_batch(self, rows):
+        self._text.writelines(
+            json.dumps({**dict(zip(FIELDS, row[:5])), 'comment': row[5] or ""}, ensure_ascii=False)[:-1]
+            + ", " + self.SCORES % tuple(row[6]) for row in rows)
+
+    def close(self):
+        self._text.flush()
+        self._text.detach()
+
+class ParquetExporter:
+    """Kiekviena dalis – atskira eilučių grupė; balai kaip uint8 stulpeliai"""
+
+    def __init__(self, handle):
+        pa, pq = _pyarrow()
+        self._pa = pa
+        self._schema = pa.schema([('id', pa.int64()), ('user_id', pa.int64()), ('email', pa.string()),
+                                  ('username', pa.string()), ('created_at', pa.string()), ('comment', pa.string())]
+                                 + [(name, pa.uint8()) for name in SCORE_FIELDS])
+        self._writer = pq.ParquetWriter(handle, self._schema, compression="zstd")
+
+    def write_batch(self, rows):
+        columns = [list(column) for column in zip(*(row[:6] for row in rows))]
+        columns[5] = [comment or "" for comment in columns[5]]
+        columns[4] = [str(value) for value in columns[4]]
+        matrix = decode_score_matrix([row[6] for row in rows])
+        arrays = columns + [matrix[:, i] for i in range(len(SCORE_FIELDS))]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+EXPORTERS = {'csv': CsvExporter, 'jsonl': JsonlExporter, 'parquet': ParquetExporter}
+
+@metrics.timed("bulk.export")
+def export_assessments(handle, fmt="csv", batch=BATCH_SIZE, **filters):
+    """Eksportuoti vertinimus į dvejetainį failą handle; grąžina eilučių skaičių.
+
+    filters -- database.iter_export_rows argumentai (user_ids, emails, since, until, latest_only).
+    """
+    exporter = EXPORTERS[fmt](handle)
+    count = 0
+    try:
+        for rows in _batches(database.iter_export_rows(batch=batch, **filters), batch):
+            exporter.write_batch(rows)
+            count += len(rows)
+    finally:
+        exporter.close()
+    metrics.inc("exported_assessments", count)
+    return count
+
+# === IMPORTO SKAITYTUVAI ===
+# Kiekvienas grąžina (eilutės nr., el. paštas, vardas, created_at, komentaras, balai)
+def read_csv(handle):
+    reader = csv.reader(io.TextIOWrapper(handle, encoding="utf-8-sig", newline=""))
+    header = next(reader, None)
+    if header is None:
+        return
+    missing = [name for name in ('email',) + SCORE_FIELDS if name not in header]
+    if missing:
+        raise ValueError(f"CSV antraštėje trūksta stulpelių: {', '.join(missing[:5])}")
+    position = {name: i for i, name in enumerate(header)}
+    email, username = position['email'], position.get('username')
+    created_at, comment = position.get('created_at'), position.get('comment')
+    columns = [position[name] for name in SCORE_FIELDS]
+    # Eksportuotame faile balų stulpeliai eina iš eilės: užtenka pjūvio
+    first = columns[0]
+    contiguous = columns == list(range(first, first + len(columns)))
+    for line, row in enumerate(reader, start=2):
+        if len(row) != len(header):
+            yield line, None, None, None, None, None
+            continue
+        yield (line, row[email], row[username] if username is not None else "",
+               row[created_at] if created_at is not None else "", row[comment] if comment is not None else "",
+               row[first:first + len(columns)] if contiguous else [row[i] for i in columns])
+
+def read_jsonl(handle):
+    for line, text in enumerate(io.TextIOWrapper(handle, encoding="utf-8"), start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+            scores = record.get('scores')
+            if isinstance(scores, dict):
+                scores = [scores.get(str(angle)) for angle in ANGLE_ORDER]
+            elif scores is None:
+                scores = [record.get(name) for name in SCORE_FIELDS]
+            elif not isinstance(scores, list) or len(scores) != len(ANGLE_ORDER):
+                # Skaičius ar eilutė kitaip būtų išplėsti į visus 36 kampus
+                scores = None
+            # true/false float64 taptų 1/0; tikrinama tik eilutėms, kuriose jų gali būti
+            if scores and ("true" in text or "false" in text) and any(isinstance(value, bool) for value in scores):
+                scores = None
+        except (ValueError, AttributeError, TypeError):
+            yield line, None, None, None, None, None
+            continue
+        yield (line, record.get('email'), record.get('username') or "", record.get('created_at') or "",
+               record.get('comment') or "", scores)
+
+def read_parquet(handle, batch=BATCH_SIZE):
+    pa, pq = _pyarrow()
+    line = 0
+    for record_batch in pq.ParquetFile(handle).iter_batches(batch_size=batch):
+        data = record_batch.to_pydict()
+        size = record_batch.num_rows
+        # Loginis balų stulpelis laikomas trūkstamu (kitaip True būtų priimtas kaip 1)
+        for name in SCORE_FIELDS:
+            if name in data and pa.types.is_boolean(record_batch.schema.field(name).type):
+                data[name] = [None] * size
+        empty = [""] * size
+        emails = data.get('email', [None] * size)
+        usernames, created, comments = (data.get(name, empty) for name in ('username', 'created_at', 'comment'))
+        scores = list(zip(*(data.get(name, [None] * size) for name in SCORE_FIELDS)))
+        for i in range(size):
+            line += 1
+            yield line, emails[i], usernames[i] or "", created[i] or "", comments[i] or "", list(scores[i])
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl, 'parquet': read_parquet}
+
+# === TIKRINIMAS ===
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+$")
+
+def _timestamp(value):
+    """'YYYY-MM-DD[ HH:MM[:SS]]' arba ISO su laiko juosta -> SQLite UTC formatas; tuščia -> None"""
+    value = str(value).strip()
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def _timestamps(values):
+    """Datų stulpelis -> SQLite formatas; neteisingos datos pažymimos False.
+
+    Įprastu atveju (visos datos be laiko juostos) konvertuojama vienu NumPy
+    veiksmu; kitaip – po eilutę.
+    """
+    try:
+        parsed = np.array([str(value).strip() for value in values], dtype='datetime64[s]')
+    except ValueError:
+        result = []
+        for value in values:
+            try:
+                result.append(_timestamp(value))
+            except ValueError:
+                result.append(False)
+        return result
+    text = np.char.replace(np.datetime_as_string(parsed), "T", " ")
+    return [None if missing else value for value, missing in zip(text.tolist(), np.isnat(parsed).tolist())]
+
+def _score_matrix(scores):
+    """Balų sąrašai -> (n, 36) int16 matrica; neteisingos eilutės pažymimos -1.
+
+    Reikšmės pirma skaitomos kaip float64, todėl per dideli skaičiai,
+    trupmenos ir trūkstami balai atmetami, o ne nukerpami tyliai. Eilutė,
+    kurioje ne lygiai 36 reikšmės, atmetama (ne transliuojama).
+    """
+    shape = (len(scores), len(ANGLE_ORDER))
+    try:
+        values = np.array(scores, dtype=np.float64)
+        if values.shape != shape:
+            raise ValueError("netinkama balų forma")
+    except (TypeError, ValueError, OverflowError):
+        values = np.full(shape, np.nan)
+        for i, row in enumerate(scores):
+            try:
+                row = np.array(row, dtype=np.float64)
+            except (TypeError, ValueError, OverflowError):
+                continue
+            if row.shape == shape[1:]:
+                values[i] = row
+    valid = ((values >= 0) & (values <= 10) & (values == np.floor(values))).all(axis=1)
+    return np.where(valid[:, None], values, -1).astype(np.int16)
+
+def validate_batch(records):
+    """Patikrinti dalį įrašų; grąžina (tinkami [(email, username, created_at, comment, BLOB)], klaidos)"""
+    valid, errors = [], []
+    missing = [None] * len(ANGLE_ORDER)
+    matrix = _score_matrix([record[5] if record[5] is not None else missing for record in records])
+    in_range = ((matrix >= 0) & (matrix <= 10)).all(axis=1).tolist()
+    blobs = matrix.astype(SCORE_DTYPE)
+    timestamps = _timestamps([record[3] or "" for record in records])
+    for i, (line, email, username, created_at, comment, _) in enumerate(records):
+        if email is None:
+            errors.append((line, "nepavyko perskaityti eilutės"))
+            continue
+        email = str(email).strip()
+        if not _EMAIL.match(email):
+            errors.append((line, f"neteisingas el. paštas: {email!r}"))
+        elif not in_range[i]:
+            errors.append((line, "turi būti 36 sveikieji balai nuo 0 iki 10"))
+        elif timestamps[i] is False:
+            errors.append((line, f"neteisinga data: {created_at!r}"))
+        else:
+            valid.append((email, str(username).strip(), timestamps[i], comment or "", blobs[i].tobytes()))
+    return valid, errors
+
+# === IMPORTAS ===
+@metrics.timed("bulk.import")
+def import_assessments(handle, fmt="csv", batch=BATCH_SIZE, create_users=True, dry_run=False, max_errors=1000):
+    """Importuoti vertinimus iš dvejetainio failo handle.
+
+    Kiekviena batch eilučių dalis patikrinama ir įterpiama atskira
+    transakcija; vartotojai atpažįstami pagal el. paštą (trūkstami sukuriami
+    užrakinti, jei create_users). Daugiau nei max_errors klaidų nutraukia
+    importą (jau įrašytos dalys lieka). Grąžina ataskaitos žodyną.
+    """
+    path = database.require_sqlite("Importas")
+    start = time.perf_counter()
+    report = {'read': 0, 'valid': 0, 'imported': 0, 'skipped': 0, 'errors': []}
+    try:
+        for records in _batches(READERS[fmt](handle), batch):
+            valid, errors = validate_batch(records)
+            report['read'] += len(records)
+            report['valid'] += len(valid)
+            report['skipped'] += len(errors)
+            report['errors'].extend(errors[:MAX_REPORTED_ERRORS - len(report['errors'])])
+            if report['skipped'] > max_errors:
+                raise ValueError(f"Per daug klaidų ({report['skipped']}), importas nutrauktas "
+                                 f"po {report['read']} eilučių")
+            if dry_run or not valid:
+                continue
+            with database.get_pool(path).transaction() as conn:
+                users = {}
+                for email, username, _, _, _ in valid:
+                    users.setdefault(email, username)
+                user_ids = database.resolve_import_users(conn, users, create=create_users)
+                rows = [(user_ids[email], scores, comment, created_at)
+                        for email, _, created_at, comment, scores in valid if email in user_ids]
+                database.insert_assessment_batch(conn, rows)
+            report['skipped'] += len(valid) - len(rows)
+            report['imported'] += len(rows)
+    finally:
+        # Išvestinės lentelės perskaičiuojamos vieną kartą, net jei importas nutrūko
+        if report['imported']:
+            database.rebuild_derived_tables(path)
+            metrics.inc("imported_assessments", report['imported'])
+    report['seconds'] = time.perf_counter() - start
+    return report
+
+# === KOMANDINĖ EILUTĖ ===
+def _split(text):
+    return [value.strip() for value in text.split(",") if value.strip()] if text else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="SQLite DB failas (numatytai – SKILLS_STORAGE_URL arba SKILLS_DB_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="eksportuoti vertinimus")
+    export.add_argument("--out", required=True, help="failas arba - (standartinė išvestis)")
+    export.add_argument("--format", choices=FORMATS, help="numatytasis pagal plėtinį")
+    export.add_argument("--users", help="vartotojų ID, atskirti kableliais")
+    export.add_argument("--emails", help="vartotojų el. paštai, atskirti kableliais")
+    export.add_argument("--since", help="nuo datos (YYYY-MM-DD)")
+    export.add_argument("--until", help="iki datos, neįskaitytinai (YYYY-MM-DD)")
+    export.add_argument("--latest", action="store_true", help="tik kiekvieno vartotojo naujausias vertinimas")
+    export.add_argument("--batch", type=int, default=BATCH_SIZE)
+
+    load = commands.add_parser("import", help="importuoti vertinimus")
+    load.add_argument("path", help="failas arba - (standartinė įvestis)")
+    load.add_argument("--format", choices=FORMATS, help="numatytasis pagal plėtinį")
+    load.add_argument("--batch", type=int, default=BATCH_SIZE)
+    load.add_argument("--no-create-users", action="store_true", help="praleisti nežinomų el. paštų eilutes")
+    load.add_argument("--dry-run", action="store_true", help="tik patikrinti, nieko neįrašyti")
+    load.add_argument("--max-errors", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        database.DB_PATH = args.db
+        storage.set_backend(storage.open_backend(f"sqlite:///{args.db}"))
+    database.init_database()
+    log = sys.stderr if getattr(args, "out", None) == "-" else sys.stdout
+
+    try:
+        if args.command == "export":
+            fmt = args.format or ("csv" if args.out == "-" else format_from_path(args.out))
+            users = _split(args.users)
+            filters = dict(user_ids=[int(value) for value in users] if users else None,
+                           emails=_split(args.emails),
+                           since=args.since, until=args.until, latest_only=args.latest)
+            start = time.perf_counter()
+            if args.out == "-":
+                count = export_assessments(sys.stdout.buffer, fmt, args.batch, **filters)
+            else:
+                with open(args.out, "wb") as handle:
+                    count = export_assessments(handle, fmt, args.batch, **filters)
+            print(f"eksportuota {count} vertinimų per {time.perf_counter() - start:.1f} s", file=log)
+        else:
+            fmt = args.format or ("csv" if args.path == "-" else format_from_path(args.path))
+            options = dict(batch=args.batch, create_users=not args.no_create_users,
+                           dry_run=args.dry_run, max_errors=args.max_errors)
+            if args.path == "-":
+                report = import_assessments(sys.stdin.buffer, fmt, **options)
+            else:
+                with open(args.path, "rb") as handle:
+                    report = import_assessments(handle, fmt, **options)
+            for line, message in report['errors']:
+                print(f"eilutė {line}: {message}", file=log)
+            print(f"perskaityta {report['read']}, tinkamų {report['valid']}, importuota {report['imported']}, "
+                  f"praleista {report['skipped']} per {report['seconds']:.1f} s", file=log)
+    except (ValueError, RuntimeError) as error:
+        print(f"klaida: {error}", file=sys.stderr)
+        return 1
+    finally:
+        database.close_pools()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
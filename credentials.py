@@ -0,0 +1,184 @@
+import os
+import hmac
+import time
+import base64
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# scrypt parametrai: n=2^14, r=8 -> ~16 MB atminties ir ~50-100 ms vienam maišymui
+SCRYPT_N = int(os.environ.get("SKILLS_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+# Atsarginis KDF, jei Python sukompiliuotas be OpenSSL scrypt
+PBKDF2_ITERATIONS = int(os.environ.get("SKILLS_PBKDF2_ITERATIONS", "600000"))
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# Kiek maišymų vykdoma vienu metu (riboja ir CPU, ir scrypt atmintį)
+KDF_WORKERS = int(os.environ.get("SKILLS_KDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+HAS_SCRYPT = hasattr(hashlib, "scrypt")
+
+# === KDF ===
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+def _unb64(text):
+    return base64.b64decode(text.encode("ascii"))
+
+def _derive(scheme, params, password, salt):
+    if scheme == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * r * n + 1024 * 1024, dklen=KEY_BYTES)
+    if scheme == "pbkdf2_sha256":
+        (iterations,) = params
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=KEY_BYTES)
+    raise ValueError(f"Nežinomas slaptažodžio maišos tipas: {scheme}")
+
+def _current_scheme():
+    if HAS_SCRYPT:
+        return "scrypt", (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return "pbkdf2_sha256", (PBKDF2_ITERATIONS,)
+
+def _parse(hash_value):
+    """'scheme$param,param$druska$raktas' -> (scheme, params, salt, key)"""
+    scheme, params, salt, key = hash_value.split("$")
+    return scheme, tuple(int(value) for value in params.split(",")), _unb64(salt), _unb64(key)
+
+def is_legacy_hash(hash_value):
+    """Senas formatas: nesūdytas SHA-256 (64 šešioliktainiai simboliai)"""
+    return "$" not in hash_value
+
+@metrics.timed("auth.kdf")
+def _hash_sync(password):
+    scheme, params = _current_scheme()
+    salt = os.urandom(SALT_BYTES)
+    key = _derive(scheme, params, password, salt)
+    return f"{scheme}${','.join(map(str, params))}${_b64(salt)}${_b64(key)}"
+
+@metrics.timed("auth.kdf")
+def _verify_sync(password, hash_value):
+    if is_legacy_hash(hash_value):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, hash_value)
+    scheme, params, salt, key = _parse(hash_value)
+    return hmac.compare_digest(_derive(scheme, params, password, salt), key)
+
+def needs_rehash(hash_value):
+    """Ar maišą reikia perskaičiuoti (senas SHA-256 arba pasikeitę parametrai)"""
+    if is_legacy_hash(hash_value):
+        return True
+    scheme, params, _, _ = _parse(hash_value)
+    return (scheme, params) != _current_scheme()
+
+# === RIBOTAS DARBUOTOJŲ TELKINYS ===
+class KdfPool:
+    """Riboto dydžio gijų telkinys slaptažodžių maišymui.
+
+    hashlib.scrypt ir pbkdf2_hmac atleidžia GIL, todėl Streamlit scenarijų
+    gijos laukia rezultato nekonkuruodamos dėl CPU, o prisijungimų antplūdis
+    užima ne daugiau kaip max_workers branduolių. Matuojamas laukimo eilėje
+    ir paties maišymo laikas.
+    """
+
+    def __init__(self, max_workers=KDF_WORKERS, window=1000):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="kdf")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._max_pending = 0
+        self._queue_ms = deque(maxlen=window)
+        self._hash_ms = deque(maxlen=window)
+
+    def _run(self, fn, submitted, args):
+        started = time.perf_counter()
+        metrics.observe("auth.kdf_queue", started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._queue_ms.append((started - submitted) * 1000)
+                self._hash_ms.append((finished - started) * 1000)
+
+    def submit(self, fn, *args):
+        with self._lock:
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+        return self._executor.submit(self._run, fn, time.perf_counter(), args)
+
+    def run(self, fn, *args):
+        """Įvykdyti telkinyje ir palaukti rezultato"""
+        return self.submit(fn, *args).result()
+
+    def stats(self):
+        """Eilės ir maišymo statistika (ms) paskutiniams window maišymams"""
+        with self._lock:
+            queue_ms = sorted(self._queue_ms)
+            hash_ms = sorted(self._hash_ms)
+            result = {'workers': self.max_workers, 'pending': self._pending,
+                      'max_pending': self._max_pending, 'completed': self._completed}
+
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        for name, values in (('queue', queue_ms), ('hash', hash_ms)):
+            result[f'{name}_p50_ms'] = percentile(values, 0.50)
+            result[f'{name}_p95_ms'] = percentile(values, 0.95)
+            result[f'{name}_max_ms'] = values[-1] if values else 0.0
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_kdf_pool():
+    """Procesui bendras KDF telkinys"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = KdfPool()
+    return _pool
+
+def kdf_stats():
+    return get_kdf_pool().stats()
+
+# === VIEŠA SĄSAJA ===
+# Netikra maiša neegzistuojantiems vartotojams: atsakymo laikas neišduoda, ar el. paštas registruotas
+_DUMMY_HASH = None
+
+def hash_password(password):
+    """Sūdyta KDF maiša (vykdoma riboto dydžio telkinyje)"""
+    return get_kdf_pool().run(_hash_sync, password)
+
+def verify_password(password, hash_value):
+    """Patikrinti slaptažodį (KDF arba senas SHA-256), nuolatinio laiko palyginimu.
+
+    Sugadinta saugoma maiša reiškia nepavykusį prisijungimą, ne serverio klaidą.
+    """
+    try:
+        return get_kdf_pool().run(_verify_sync, password, hash_value)
+    except (TypeError, ValueError) as exc:
+        # Pati maiša neregistruojama; darbas atliekamas kaip nerasto vartotojo atveju
+        logging.getLogger(__name__).warning("Netinkama saugoma slaptažodžio maiša: %s", type(exc).__name__)
+        burn_verification(password)
+        return False
+
+def burn_verification(password):
+    """Atlikti tokį pat darbą kaip tikrinant, kai vartotojas nerastas"""
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = hash_password("")
+    verify_password(password, _DUMMY_HASH)
@@ -0,0 +1,754 @@
+import os
+import json
+import time
+import atexit
+import queue
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+
+import numpy as np
+
+import credentials
+import metrics
+import storage
+from skills import ANGLE_ORDER, encode_scores, decode_scores, decode_score_matrix
+
+DB_PATH = os.environ.get("SKILLS_DB_PATH", "skills_users.db")
+
+SESSION_SECRET_NAME = "session_hmac"
+
+# Kiek vienu metu atidarytų jungčių leidžiama vienam DB failui
+POOL_SIZE = int(os.environ.get("SKILLS_DB_POOL_SIZE", "8"))
+
+# SQLite nustatymai kiekvienai naujai jungčiai
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",          # skaitytojai neblokuoja rašytojo
+    "PRAGMA synchronous=NORMAL",        # WAL režime saugu, daug mažiau fsync
+    "PRAGMA cache_size=-32000",         # ~32 MB puslapių talpykla
+    "PRAGMA mmap_size=268435456",       # 256 MB atminties žemėlapis skaitymui
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# === JUNGČIŲ TELKINYS ===
+class ConnectionPool:
+    """Procesui bendras SQLite jungčių telkinys vienam DB failui"""
+
+    def __init__(self, path, max_size=POOL_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _connect(self):
+        # isolation_level=None: transakcijas valdome patys (BEGIN/COMMIT),
+        # check_same_thread=False: jungtis keliauja tarp Streamlit gijų,
+        # bet vienu metu ją naudoja tik viena gija (saugo semaforas)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                               check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Paimti jungtį iš telkinio ir grąžinti ją po naudojimo"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def transaction(self, immediate=True):
+        """Jungtis su atvira transakcija: COMMIT sėkmės atveju, ROLLBACK klaidos atveju"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self):
+        """Uždaryti visas laisvas jungtis"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path=None):
+    """Gauti (arba sukurti) procesui bendrą telkinį nurodytam DB failui"""
+    path = path or DB_PATH
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = _pools[path] = ConnectionPool(path)
+    return pool
+
+def connection():
+    """Jungtis iš numatytojo DB telkinio"""
+    return get_pool().connection()
+
+def transaction(immediate=True):
+    """Transakcija numatytajame DB"""
+    return get_pool().transaction(immediate)
+
+def close_pools():
+    """Uždaryti visus telkinius (testams ir benchmarkams)"""
+    close_writers()
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+# === RAŠYMO EILĖ (WRITE-BEHIND) ===
+# Kiek laiko (s) foninis rašytojas kaupia neskubius įrašus (last_login) prieš COMMIT
+WRITE_FLUSH_INTERVAL = float(os.environ.get("SKILLS_WRITE_FLUSH_MS", "200")) / 1000
+# Daugiausia įrašų vienoje transakcijoje
+WRITE_MAX_BATCH = int(os.environ.get("SKILLS_WRITE_MAX_BATCH", "500"))
+# Kiek sekundžių išsaugojimas laukia rašymo gijos patvirtinimo
+WRITE_TIMEOUT = float(os.environ.get("SKILLS_WRITE_TIMEOUT", "30"))
+
+class _Write:
+    __slots__ = ("fn", "args", "future")
+
+    def __init__(self, fn, args, future):
+        self.fn = fn
+        self.args = args
+        self.future = future
+
+class WriteBehindQueue:
+    """Foninė rašymo gija, grupuojanti įrašus į bendras transakcijas.
+
+    submit(fn, *args) su wait=True grįžta tik po COMMIT (grupinis commit:
+    visi tuo metu eilėje laukiantys įrašai patvirtinami vienu fsync, jungtis
+    naudoja synchronous=FULL). Su wait=False įrašas neskubus: jis kaupiamas
+    iki flush_interval arba kol atsiras laukiantis įrašas. Kiekvienas įrašas
+    vykdomas atskirame SAVEPOINT, todėl vieno klaida neatšaukia kitų.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, flush_interval=WRITE_FLUSH_INTERVAL, max_batch=WRITE_MAX_BATCH):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.batches = 0
+        self.writes = 0
+        self.largest_batch = 0
+
+    def submit(self, fn, *args, wait=True):
+        """Įvykdyti fn(conn, *args) rašytojo transakcijoje; wait=True grąžina fn rezultatą.
+
+        Jei gija nepatvirtina įrašo per WRITE_TIMEOUT sekundžių, keliama
+        concurrent.futures.TimeoutError (įrašas gali būti patvirtintas vėliau).
+        """
+        future = Future() if wait else None
+        # Tikrinimas ir įdėjimas po tuo pačiu užraktu: close() negali sustabdyti
+        # gijos tarp jų, o nustojusi gija paleidžiama iš naujo
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="skills-writer", daemon=True)
+                    self._thread.start()
+                self._queue.put(_Write(fn, args, future))
+        if closed:
+            # Po uždarymo (pvz. atexit metu) rašome tiesiogiai
+            with get_pool(self.path).transaction() as conn:
+                return fn(conn, *args)
+        if wait:
+            return future.result(timeout=WRITE_TIMEOUT)
+        return None
+
+    def flush(self):
+        """Palaukti, kol bus patvirtinti visi anksčiau pateikti įrašai"""
+        if self._thread is not None and not self._closed:
+            self.submit(lambda conn: None)
+
+    def close(self):
+        """Patvirtinti likusius įrašus ir sustabdyti giją"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    def _run(self):
+        conn = None
+        pending = []
+        try:
+            conn = get_pool(self.path)._connect()
+            conn.execute("PRAGMA synchronous=FULL")
+            self._loop(conn, pending)
+        except Exception as exc:
+            # Gija nenumiršta tyliai: laukiantys gauna klaidą, kitas submit ją paleis iš naujo
+            logging.getLogger(__name__).error("Rašymo gija sustojo", exc_info=exc)
+            self._fail_pending(pending, exc)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _fail_pending(self, pending, exc):
+        with self._lock:
+            self._thread = None
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not self._STOP:
+                    pending.append(item)
+        for write in pending:
+            if write.future is not None and not write.future.done():
+                write.future.set_exception(exc)
+
+    def _loop(self, conn, pending):
+        deadline = None
+        urgent = stop = False
+        while True:
+            timeout = None if not pending else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            # Paimti viską, kas jau laukia eilėje
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    if not pending:
+                        deadline = time.monotonic() + self.flush_interval
+                    pending.append(item)
+                    urgent = urgent or item.future is not None
+                if len(pending) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if pending and (urgent or stop or len(pending) >= self.max_batch
+                            or time.monotonic() >= deadline):
+                self._commit(conn, pending)
+                pending.clear()
+                deadline, urgent = None, False
+            if stop and self._queue.empty():
+                return
+
+    def _commit(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for write in batch:
+                conn.execute("SAVEPOINT write")
+                try:
+                    results.append((write, write.fn(conn, *write.args), None))
+                    conn.execute("RELEASE write")
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO write")
+                    conn.execute("RELEASE write")
+                    results.append((write, None, exc))
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            results = [(write, None, exc) for write in batch]
+
+        metrics.inc("write_batches")
+        metrics.inc("writes", len(batch))
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for write, result, exc in results:
+            if write.future is not None and not write.future.done():
+                if exc is None:
+                    write.future.set_result(result)
+                else:
+                    write.future.set_exception(exc)
+            elif exc is not None:
+                logging.getLogger(__name__).error("Fone nepavyko įrašyti", exc_info=exc)
+
+    def stats(self):
+        return {'batches': self.batches, 'writes': self.writes, 'largest_batch': self.largest_batch,
+                'queued': self._queue.qsize()}
+
+_writers = {}
+
+def get_writer(path=None):
+    """Procesui bendra rašymo eilė nurodytam DB failui"""
+    path = path or DB_PATH
+    writer = _writers.get(path)
+    if writer is None:
+        with _pools_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = WriteBehindQueue(path)
+    return writer
+
+def writer_stats():
+    """Aktyvios SQLite saugyklos rašymo eilės statistika (kitai saugyklai – None)"""
+    backend = storage.get_backend()
+    return get_writer(backend.path).stats() if backend.name == "sqlite" else None
+
+def close_writers():
+    """Patvirtinti ir sustabdyti visas rašymo eiles (iškviečiama ir išeinant iš proceso)"""
+    with _pools_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+atexit.register(close_writers)
+
+# === SCHEMOS MIGRACIJOS ===
+def _decode_assessment_data(assessment_json):
+    """Senas JSON vertinimas su sveikųjų skaičių kampais (JSON raktai visada eilutės)"""
+    return {int(angle): value for angle, value in json.loads(assessment_json).items()}
+
+def _convert_json_assessments(conn, batch=5000):
+    """Perkoduoti senus JSON vertinimus į 36 baitų BLOB (po batch eilučių)"""
+    last_id = 0
+    while True:
+        rows = conn.execute('''SELECT id, assessment_data FROM skill_assessments
+                               WHERE id > ? AND assessment_data IS NOT NULL
+                               ORDER BY id LIMIT ?''', (last_id, batch)).fetchall()
+        if not rows:
+            break
+        conn.executemany('UPDATE skill_assessments SET scores = ?, assessment_data = NULL WHERE id = ?',
+                         [(encode_scores(_decode_assessment_data(data)), row_id) for row_id, data in rows])
+        last_id = rows[-1][0]
+
+
+# Kiekvienas žingsnis: SQL sakinys arba funkcija, gaunanti jungtį.
+# Naujus schemos pakeitimus pridėkite kaip naują versiją sąrašo gale,
+# jau pritaikytų versijų nekeiskite.
+def _latest_scores_per_user(conn):
+    """Kiekvieno vartotojo naujausio vertinimo balai (kursorius, skaitomas dalimis)"""
+    return conn.execute('''SELECT scores FROM (
+                              SELECT scores, ROW_NUMBER() OVER (
+                                  PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn
+                              FROM skill_assessments)
+                          WHERE rn = 1''')
+
+def _rebuild_score_histogram(conn, batch=10000, latest=_latest_scores_per_user):
+    """Perskaičiuoti histogramą iš naujausių vartotojų vertinimų"""
+    counts = np.zeros((len(ANGLE_ORDER), 11), dtype=np.int64)
+    columns = np.arange(len(ANGLE_ORDER))
+    cursor = latest(conn)
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            break
+        matrix = decode_score_matrix([row[0] for row in rows])
+        np.add.at(counts, (np.broadcast_to(columns, matrix.shape), matrix), 1)
+
+    conn.execute('DELETE FROM angle_score_histogram')
+    conn.executemany('INSERT INTO angle_score_histogram (angle, score, user_count) VALUES (?, ?, ?)',
+                     [(angle, score, int(counts[i, score]))
+                      for i, angle in enumerate(ANGLE_ORDER) for score in range(11)])
+
+def _rebuild_latest_assessments(conn):
+    """Perrašyti naujausių vertinimų momentinę lentelę iš visos istorijos"""
+    conn.execute('DELETE FROM latest_assessment')
+    conn.execute('''INSERT INTO latest_assessment (user_id, assessment_id, scores, created_at)
+                    SELECT user_id, id, scores, created_at FROM (
+                        SELECT user_id, id, scores, created_at, ROW_NUMBER() OVER (
+                            PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn
+                        FROM skill_assessments WHERE user_id IS NOT NULL)
+                    WHERE rn = 1''')
+
+def _create_session_secret(conn):
+    """Atsitiktinis HMAC raktas sesijų žetonams, bendras visiems procesams"""
+    conn.execute('INSERT OR IGNORE INTO app_secrets (name, value) VALUES (?, ?)',
+                 (SESSION_SECRET_NAME, os.urandom(32)))
+
+MIGRATIONS = [
+    (1, "Vartotojų ir vertinimų lentelės", (
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            username TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS skill_assessments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            assessment_data TEXT,
+            comment TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        ''',
+    )),
+    (2, "Vertinimų indeksas pagal vartotoją ir datą", (
+        # id įtrauktas kaip lygiavertis rikiavimo raktas, todėl istorijos
+        # užklausos eina tik per indeksą, be papildomo rikiavimo
+        '''
+        CREATE INDEX IF NOT EXISTS idx_skill_assessments_user_created
+        ON skill_assessments (user_id, created_at DESC, id DESC)
+        ''',
+    )),
+    (3, "Vertinimai kaip 36 baitų BLOB vietoje JSON", (
+        'ALTER TABLE skill_assessments ADD COLUMN scores BLOB',
+        _convert_json_assessments,
+    )),
+    (4, "Kiekvieno kampo balų histograma pagal naujausius vertinimus", (
+        # Kiek vartotojų, kurių naujausias vertinimas kampe angle turi balą score
+        '''
+        CREATE TABLE IF NOT EXISTS angle_score_histogram (
+            angle INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            user_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (angle, score)
+        ) WITHOUT ROWID
+        ''',
+        _rebuild_score_histogram,
+    )),
+    (5, "Kiekvieno vartotojo naujausio vertinimo momentinė lentelė", (
+        # Viena eilutė vartotojui, atnaujinama toje pačioje transakcijoje kaip
+        # ir įterpiamas vertinimas: naujausias profilis – viena PK paieška
+        '''
+        CREATE TABLE IF NOT EXISTS latest_assessment (
+            user_id INTEGER PRIMARY KEY,
+            assessment_id INTEGER NOT NULL,
+            scores BLOB NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        )
+        ''',
+        _rebuild_latest_assessments,
+    )),
+    (6, "Prisijungimo sesijos ir jų HMAC raktas", (
+        # Žetonas pasirašytas, todėl lentelė reikalinga tik atšaukimui tikrinti
+        '''
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at INTEGER NOT NULL,
+            revoked_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions (expires_at)',
+        '''
+        CREATE TABLE IF NOT EXISTS app_secrets (
+            name TEXT PRIMARY KEY,
+            value BLOB NOT NULL
+        ) WITHOUT ROWID
+        ''',
+        _create_session_secret,
+    )),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def migrate(path=None):
+    """Pritaikyti trūkstamas migracijas viena transakcija, grąžinti schemos versiją"""
+    with get_pool(path).transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        current = conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                         (version, description))
+            current = version
+    return current
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+def init_sqlite(path=None):
+    """Sukurti/atnaujinti SQLite failą vieną kartą per procesą"""
+    path = path or DB_PATH
+    if path in _initialized:
+        return
+    with _init_lock:
+        if path not in _initialized:
+            migrate(path)
+            _initialized.add(path)
+
+@metrics.timed("db.init_database")
+def init_database(path=None):
+    """Paruošti aktyvią saugyklą (SQLite – nurodytą arba aktyvios saugyklos failą)"""
+    backend = storage.get_backend()
+    # Kitos saugyklos mazge vietinis SQLite failas nekuriamas
+    if backend.name == "sqlite":
+        init_sqlite(path or backend.path)
+    backend.init()
+
+# === IŠSAUGOJIMO KLAUSYTOJAI ===
+# Funkcijos fn(user_id, assessment_id, scores), kviečiamos po sėkmingo COMMIT
+# (pvz., procese laikomiems indeksams atnaujinti)
+_save_listeners = []
+
+def add_save_listener(listener):
+    """Užregistruoti funkciją, kviečiamą po kiekvieno išsaugoto vertinimo"""
+    _save_listeners.append(listener)
+
+def _notify_saved(user_id, assessment_id, scores):
+    for listener in list(_save_listeners):
+        try:
+            listener(user_id, assessment_id, decode_scores(scores))
+        except Exception:
+            # Vertinimas jau išsaugotas; klausytojo klaida neturi jo atšaukti
+            logging.getLogger(__name__).exception("Išsaugojimo klausytojo klaida")
+
+# === DUOMENŲ FUNKCIJOS ===
+# Viešos funkcijos kreipiasi į aktyvią saugyklą (storage.get_backend()):
+# numatytai – šį SQLite failą, su SKILLS_STORAGE_URL – PostgreSQL.
+def hash_password(password):
+    """Užšifruoti slaptažodį (sūdytas KDF, žr. credentials.py)"""
+    return credentials.hash_password(password)
+
+def verify_password(password, hash_value):
+    """Patikrinti slaptažodį"""
+    return credentials.verify_password(password, hash_value)
+
+@metrics.timed("db.create_user", counter="db_queries")
+def create_user(email, password, username):
+    """Sukurti naują vartotoją"""
+    return storage.get_backend().create_user(email, hash_password(password), username)
+
+@metrics.timed("auth.login")
+def authenticate_user(email, password):
+    """Autentifikuoti vartotoją.
+
+    Slaptažodis tikrinamas KDF telkinyje negrąžinus DB jungties, kad lėtas
+    maišymas neužimtų jungčių. Seni SHA-256 maišai po sėkmingo prisijungimo
+    perskaičiuojami dabartiniu KDF.
+    """
+    backend = storage.get_backend()
+    user = backend.get_user_credentials(email)
+
+    if not user:
+        credentials.burn_verification(password)
+        metrics.inc("login_failures")
+        return None
+    if not verify_password(password, user[1]):
+        metrics.inc("login_failures")
+        return None
+
+    if credentials.needs_rehash(user[1]):
+        # Sąlyga pagal seną maišą: lygiagretus slaptažodžio keitimas nebus perrašytas
+        backend.update_password_hash(user[0], user[1], hash_password(password))
+    backend.record_login(user[0], time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()))
+    metrics.inc("logins")
+    return {'id': user[0], 'username': user[2], 'email': email}
+
+@metrics.timed("db.save_skill_assessment", counter="saves")
+def save_skill_assessment(user_id, skills_data, comment=""):
+    """Išsaugoti įgūdžių vertinimą.
+
+    SQLite saugykloje įrašas perduodamas rašymo eilei ir sugrupuojamas su
+    kitų sesijų išsaugojimais; funkcija grįžta tik po transakcijos patvirtinimo.
+    """
+    scores = encode_scores(skills_data)
+    assessment_id = storage.get_backend().save_assessment(user_id, scores, comment)
+    _notify_saved(user_id, assessment_id, scores)
+    return assessment_id
+
+@metrics.timed("db.get_user_assessments", counter="db_queries")
+def get_user_assessments(user_id):
+    """Gauti vartotojo įgūdžių vertinimus (balai kaip NumPy masyvai)"""
+    return storage.get_backend().get_user_assessments(user_id)
+
+@metrics.timed("db.get_user_assessment_summaries", counter="db_queries")
+def get_user_assessment_summaries(user_id):
+    """Gauti tik vertinimų sąrašo metaduomenis (užklausa padengiama indeksu)"""
+    return storage.get_backend().get_user_assessment_summaries(user_id)
+
+@metrics.timed("db.get_user_assessment_page", counter="db_queries")
+def get_user_assessment_page(user_id, limit=10, before=None):
+    """Vienas istorijos puslapis (keyset pagal created_at, id).
+
+    before -- ankstesnio puslapio grąžintas žymeklis (created_at, id) arba None.
+    Grąžina (eilutės, kito puslapio žymeklis arba None).
+    """
+    return storage.get_backend().get_user_assessment_page(user_id, limit, before)
+
+@metrics.timed("db.count_user_assessments", counter="db_queries")
+def count_user_assessments(user_id):
+    """Vartotojo vertinimų skaičius"""
+    return storage.get_backend().count_user_assessments(user_id)
+
+@metrics.timed("db.get_assessment", counter="db_queries")
+def get_assessment(user_id, assessment_id):
+    """Gauti vieną vartotojo vertinimą su balais"""
+    return storage.get_backend().get_assessment(user_id, assessment_id)
+
+@metrics.timed("db.get_user_score_history", counter="db_queries")
+def get_user_score_history(user_id):
+    """Visa vartotojo istorija nuo seniausio: (laiko žymos datetime64, (n, 36) balų matrica)"""
+    return storage.get_backend().get_user_score_history(user_id)
+
+@metrics.timed("db.get_latest_assessment", counter="db_queries")
+def get_latest_assessment(user_id):
+    """Naujausias vartotojo vertinimas iš momentinės lentelės arba None"""
+    return storage.get_backend().get_latest_assessment(user_id)
+
+@metrics.timed("db.get_latest_scores", counter="db_queries")
+def get_latest_scores(user_id):
+    """Naujausio vartotojo vertinimo balai arba None"""
+    latest = storage.get_backend().get_latest_assessment(user_id)
+    return latest['scores'] if latest else None
+
+@metrics.timed("db.get_score_histogram", counter="db_queries")
+def get_score_histogram():
+    """Kohortos histograma kaip (36, 11) matrica: vartotojų skaičius kampui ir balui"""
+    return storage.get_backend().get_score_histogram()
+
+def iter_latest_scores(batch=10000):
+    """Visų vartotojų naujausi vertinimai dalimis: (user_id masyvas, (n, 36) matrica)"""
+    return storage.get_backend().iter_latest_scores(batch)
+
+# Paketiniai įrankiai (render_cli.py, bulk.py importas) skaito tiesiai iš SQLite failo
+def iter_assessment_rows(user_ids=None, assessment_ids=None, latest_only=True, batch=1000):
+    """Vertinimai paketiniam apdorojimui, skaitomi dalimis.
+
+    user_ids -- tik šių vartotojų vertinimai (None – visų).
+    assessment_ids -- konkretūs vertinimai (tada latest_only ignoruojamas).
+    latest_only -- tik kiekvieno vartotojo naujausias vertinimas.
+    Grąžina eilutes (assessment_id, user_id, username, created_at, scores BLOB).
+    """
+    path = require_sqlite("iter_assessment_rows")
+    where, params = [], []
+    if user_ids is not None:
+        where.append(f"a.user_id IN ({','.join('?' * len(user_ids))})")
+        params.extend(user_ids)
+    if assessment_ids is not None:
+        where.append(f"a.id IN ({','.join('?' * len(assessment_ids))})")
+        params.extend(assessment_ids)
+    source = 'skill_assessments'
+    if latest_only and assessment_ids is None:
+        source = '''(SELECT assessment_id AS id, user_id, created_at, scores
+                     FROM latest_assessment)'''
+    query = f'''SELECT a.id, a.user_id, u.username, a.created_at, a.scores
+                FROM {source} a JOIN users u ON u.id = a.user_id
+                {'WHERE ' + ' AND '.join(where) if where else ''}
+                ORDER BY a.user_id, a.created_at, a.id'''
+    with get_pool(path).connection() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
+
+# === PRISIJUNGIMO SESIJOS ===
+def create_session(session_id, user_id, expires_at):
+    """Įrašyti sesiją (expires_at – Unix sekundės); grįžta po COMMIT"""
+    storage.get_backend().create_session(session_id, user_id, expires_at)
+
+@metrics.timed("db.get_session_user", counter="db_queries")
+def get_session_user(session_id):
+    """Galiojančios, neatšauktos sesijos vartotojas {'id', 'username', 'email'} arba None"""
+    return storage.get_backend().get_session_user(session_id, int(time.time()))
+
+def revoke_session(session_id):
+    """Atšaukti sesiją (atsijungiant); grįžta po COMMIT"""
+    storage.get_backend().revoke_session(session_id)
+
+def get_session_secret():
+    return storage.get_backend().get_session_secret()
+
+# === MASINIS EKSPORTAS IR IMPORTAS ===
+def iter_export_rows(user_ids=None, emails=None, since=None, until=None, latest_only=False, batch=5000):
+    """Vertinimai eksportui iš aktyvios saugyklos, skaitomi dalimis.
+
+    since/until -- created_at ribos ('YYYY-MM-DD[ HH:MM:SS]', until neįskaitytinai).
+    Grąžina eilutes (id, user_id, email, username, created_at, comment, scores BLOB).
+    """
+    return storage.get_backend().iter_export_rows(user_ids, emails, since, until, latest_only, batch)
+
+def require_sqlite(tool):
+    """Aktyvios SQLite saugyklos failo kelias paketiniams įrankiams.
+
+    Jie rašo ir skaito tiesiai SQLite failą – tą patį, kurį naudoja
+    aplikacija (sqlite:/// URL arba DB_PATH); su kita saugykla – klaida.
+    """
+    backend = storage.get_backend()
+    if backend.name != "sqlite":
+        raise RuntimeError(f"{tool} veikia tik su SQLite saugykla "
+                           f"(SKILLS_STORAGE_URL nurodo {backend.name})")
+    return backend.path or DB_PATH
+
+# Importuotiems vartotojams: ne KDF maiša, todėl prisijungti neįmanoma,
+# kol administratorius nenustato slaptažodžio
+LOCKED_PASSWORD_HASH = "!"
+
+def resolve_import_users(conn, users, create=True):
+    """{el. paštas: vardas} -> {el. paštas: user_id}; trūkstami sukuriami užrakinti"""
+    emails = list(users)
+    found = {}
+    for start in range(0, len(emails), 500):
+        chunk = emails[start:start + 500]
+        found.update(conn.execute(f"SELECT email, id FROM users WHERE email IN ({','.join('?' * len(chunk))})",
+                                  chunk).fetchall())
+    missing = [email for email in emails if email not in found]
+    if missing and create:
+        conn.executemany('INSERT INTO users (email, password_hash, username) VALUES (?, ?, ?)',
+                         [(email, LOCKED_PASSWORD_HASH, users[email] or email.split("@")[0]) for email in missing])
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            found.update(conn.execute(f"SELECT email, id FROM users WHERE email IN ({','.join('?' * len(chunk))})",
+                                      chunk).fetchall())
+    return found
+
+def insert_assessment_batch(conn, rows):
+    """Įterpti paruoštas eilutes (user_id, scores BLOB, comment, created_at arba None)"""
+    conn.executemany('''INSERT INTO skill_assessments (user_id, scores, comment, created_at)
+                        VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))''', rows)
+
+@metrics.timed("db.rebuild_derived_tables")
+def rebuild_derived_tables(path=None):
+    """Po masinio importo perskaičiuoti latest_assessment ir kohortos histogramą"""
+    with get_pool(path or require_sqlite("rebuild_derived_tables")).transaction() as conn:
+        _rebuild_latest_assessments(conn)
+        # Histograma skaičiuojama iš ką tik perrašytos momentinės lentelės
+        _rebuild_score_histogram(conn, latest=lambda c: c.execute('SELECT scores FROM latest_assessment'))
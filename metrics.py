@@ -0,0 +1,211 @@
+import os
+import time
+import threading
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+
+# SKILLS_METRICS=0 išjungia matavimą: dekoratoriai grąžina pačią funkciją,
+# span() – bendrą tuščią kontekstą, inc() nieko nedaro
+ENABLED = os.environ.get("SKILLS_METRICS", "1") != "0"
+# Prometheus tekstinis failas (pvz. node_exporter textfile kolektoriui)
+METRICS_FILE = os.environ.get("SKILLS_METRICS_FILE", "")
+METRICS_INTERVAL = float(os.environ.get("SKILLS_METRICS_INTERVAL", "15"))
+
+# Histogramos ribos sekundėmis (Prometheus "le")
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Kiek paskutinių matavimų laikoma procentiliams
+WINDOW = 2048
+
+# === HISTOGRAMOS IR SKAITIKLIAI ===
+class Histogram:
+    """Trukmių histograma: kaupiami krepšeliai Prometheus formatui ir
+    paskutinių WINDOW matavimų langas p50/p95/p99 skaičiavimui"""
+
+    __slots__ = ("count", "total", "max", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.recent = deque(maxlen=WINDOW)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def summary(self):
+        values = sorted(self.recent)
+
+        def percentile(q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': percentile(0.50) * 1000,
+            'p95_ms': percentile(0.95) * 1000,
+            'p99_ms': percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+def observe(name, seconds):
+    """Užregistruoti vieno intervalo trukmę"""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+def inc(name, value=1):
+    """Padidinti skaitiklį"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name):
+    """Kontekstas, matuojantis bloko trukmę: with span("render.png"): ..."""
+    return _Span(name)
+
+def timed(name, counter=None):
+    """Dekoratorius: funkcijos trukmė į histogramą name, kvietimai – į skaitiklį counter"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+                if counter:
+                    inc(counter)
+        return wrapper
+    return decorator
+
+if not ENABLED:
+    def observe(name, seconds):  # noqa: F811
+        pass
+
+    def inc(name, value=1):  # noqa: F811
+        pass
+
+    def span(name):  # noqa: F811
+        return _NULL_SPAN
+
+    def timed(name, counter=None):  # noqa: F811
+        return lambda fn: fn
+
+# === SKAITYMAS IR EKSPORTAS ===
+def snapshot():
+    """{'counters': {vardas: reikšmė}, 'spans': {vardas: santrauka}}"""
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'spans': {name: histogram.summary() for name, histogram in sorted(_histograms.items())},
+        }
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def prometheus_text():
+    """Visi matavimai Prometheus tekstiniu formatu"""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = [(name, histogram.count, histogram.total, list(histogram.buckets), histogram.summary())
+                      for name, histogram in sorted(_histograms.items())]
+
+    lines = []
+    for name, value in counters:
+        metric = f"skills_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+    if histograms:
+        lines.append("# TYPE skills_span_seconds histogram")
+    for name, count, total, buckets, _ in histograms:
+        label = _label(name)
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS + (float("inf"),), buckets):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'skills_span_seconds_bucket{{span="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'skills_span_seconds_sum{{span="{label}"}} {total}')
+        lines.append(f'skills_span_seconds_count{{span="{label}"}} {count}')
+
+    if histograms:
+        lines.append("# TYPE skills_span_quantile_seconds gauge")
+    for name, _, _, _, summary in histograms:
+        label = _label(name)
+        for quantile in ("p50", "p95", "p99"):
+            lines.append(f'skills_span_quantile_seconds{{span="{label}",quantile="0.{quantile[1:]}"}} '
+                         f'{summary[f"{quantile}_ms"] / 1000}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path=None):
+    """Atomiškai perrašyti Prometheus tekstinį failą"""
+    path = path or METRICS_FILE
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+_exporter = None
+
+def start_exporter(path=None, interval=METRICS_INTERVAL):
+    """Fone kas interval sekundžių rašyti Prometheus failą (vieną kartą per procesą)"""
+    global _exporter
+    path = path or METRICS_FILE
+    if not ENABLED or not path or _exporter is not None:
+        return
+    with _lock:
+        if _exporter is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_prometheus(path)
+                except OSError:
+                    pass
+
+        _exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+    _exporter.start()
@@ -0,0 +1,638 @@
+import io
+import os
+import html
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+import metrics
+import database
+from database import ConnectionPool
+from skills import angles, ANGLE_ORDER
+
+# matplotlib ir PIL įkeliami tik prireikus (žr. _pyplot ir prewarm): pats
+# importas ir šriftų talpykla užtrunka apie sekundę, o SVG formatui jų nereikia
+_backend_lock = threading.Lock()
+_backend_ready = False
+
+def _pyplot():
+    """pyplot su visada prisegtu Agg backend (be GUI, saugus serveryje)"""
+    global _backend_ready
+    if not _backend_ready:
+        with _backend_lock:
+            if not _backend_ready:
+                import matplotlib
+                matplotlib.use("Agg")
+                _backend_ready = True
+    import matplotlib.pyplot as plt
+    return plt
+
+# Diagramų spalvų temos
+THEMES = {
+    "dark": {
+        "background": "#1e1e1e",
+        "text": "white",
+        "compass": "lightblue",
+        "grid": "gray",
+        "marker_edge": "white",
+    },
+    "light": {
+        "background": "white",
+        "text": "#1e1e1e",
+        "compass": "#1f4e79",
+        "grid": "gray",
+        "marker_edge": "#1e1e1e",
+    },
+}
+
+# === CIRCULAR RADAR DIAGRAMA SU LINIJOMIS IR TAŠKAIS ===
+def create_circular_radar_chart(skills_data, title="Jūsų įgūdžių profilis", show_compass=True, theme="dark"):
+    """Sukurti circular radar diagramą su linijomis ir taškais kaip PNG paveiksle"""
+    colors_theme = THEMES[theme]
+
+    # Paruošti duomenis
+    categories = []
+    values = []
+    colors = []
+    degree_positions = []
+
+    for angle in sorted(skills_data.keys()):
+        angle_int = int(angle) if isinstance(angle, str) else angle
+        categories.append(angles.get(angle_int, f"Kampas {angle}"))
+        values.append(skills_data[angle])
+        degree_positions.append(angle_int)
+
+        # Trys pagrindinės spalvos su perėjimais
+        if skills_data[angle] >= 7:
+            colors.append('#1f77b4')  # Mėlyna - stiprus
+        elif skills_data[angle] >= 4:
+            colors.append('#d62728')  # Raudona - vidutinis
+        else:
+            colors.append('#ffbb00')  # Geltona - silpnas
+
+    # Konvertuoti kampus į radianus (0° = Šiaurė = Matematika)
+    theta = np.array(degree_positions) * np.pi / 180
+
+    # Sukurti figūrą
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(12, 12), subplot_kw=dict(projection='polar'))
+
+    # Nustatyti foną
+    fig.patch.set_facecolor(colors_theme["background"])
+    ax.set_facecolor(colors_theme["background"])
+
+    # Piešti linijas nuo centro iki taškų (kaip PNG paveiksle)
+    for angle, value, color in zip(theta, values, colors):
+        ax.plot([angle, angle], [0, value], color=color, linewidth=2, alpha=0.8)
+
+    # Pridėti taškus ant linijų galų
+    ax.scatter(theta, values, c=colors, s=80, alpha=1, zorder=3,
+               edgecolors=colors_theme["marker_edge"], linewidths=1.5)
+
+    # Pridėti vertes ant taškų
+    for angle, value in zip(theta, values):
+        ax.text(angle, value + 0.3, str(value),
+                ha='center', va='center', fontsize=10,
+                color=colors_theme["text"], weight='bold', zorder=4)
+
+    # Nustatyti ašių parametrus - 0° yra Šiaurėje (Matematika)
+    ax.set_ylim(0, 10)
+    ax.set_theta_zero_location('N')  # 0° viršuje (Šiaurė)
+    ax.set_theta_direction(1)  # Counter-clockwise (teigiama kryptimi)
+
+    # Pridėti 4 pagrindines kryptis su pavadinimais
+    if show_compass:
+        for angle, label in COMPASS_LABELS:
+            rad = angle * np.pi / 180
+            ax.text(rad, 11.5, label, ha='center', va='center',
+                   fontsize=9, color=colors_theme["compass"], weight='bold', zorder=5)
+
+    # Nustatyti kategorijų pavadinimus (trumpinti)
+    ax.set_xticks(theta)
+    ax.set_xticklabels([shorten_category(cat) for cat in categories], fontsize=8, color=colors_theme["text"])
+
+    # Nustatyti radialias ašis
+    ax.set_ylim(0, 10)
+    ax.set_yticks(range(0, 11, 2))
+    ax.set_yticklabels(range(0, 11, 2), fontsize=9, color=colors_theme["text"])
+    ax.grid(True, color=colors_theme["grid"], alpha=0.3)
+
+    # Pridėti pavadinimą
+    ax.set_title(title, pad=30, fontsize=16, color=colors_theme["text"], weight='bold')
+
+    fig.tight_layout()
+    return fig
+
+COMPASS_LABELS = [
+    (0, "0°\nMATEMATINIS,\nLOGINIS PROTAS"),
+    (90, "90°\nSOCIALINIS -\nORGANIZACINIS,\nVALDŽIA"),
+    (180, "180°\nFIZINIS,\nGENAI, JĖGA"),
+    (270, "270°\nJAUSMAI,\nEMOCIJOS")
+]
+
+def shorten_category(category):
+    """Sutrumpinti ilgą kategorijos pavadinimą ašies žymai"""
+    if len(category) > 25:
+        return category[:22] + '...'
+    return category
+
+def value_colors(values):
+    """Spalvos pagal balą (vektorizuotai)"""
+    values = np.asarray(values)
+    return np.where(values >= 7, '#1f77b4', np.where(values >= 4, '#d62728', '#ffbb00'))
+
+def fig_to_png(fig, facecolor='#1e1e1e'):
+    """Konvertuoti matplotlib figūrą į PNG baitus ir ją uždaryti"""
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight',
+                facecolor=facecolor, edgecolor='none')
+    _pyplot().close(fig)
+    return img_buffer.getvalue()
+
+def fig_to_base64(fig):
+    """Konvertuoti matplotlib figūrą į base64 stringą"""
+    return base64.b64encode(fig_to_png(fig)).decode()
+
+# === GREITAS PIEŠIMAS ATNAUJINANT ARTISTUS ===
+class RadarRenderer:
+    """Radar diagrama su statine figūra, kuri sukuriama vieną kartą.
+
+    Ašys, kompasas, kategorijų žymos ir tinklelis nupiešiami vieną kartą ir
+    išsaugomi kaip fonas. Kiekvienam kadrui fonas atstatomas, o ant jo
+    piešiami tik duomenų artistai: linijos (viena LineCollection), taškai,
+    verčių tekstai ir pavadinimas. Figūra nenaudoja pyplot, todėl
+    nepriklauso nuo globalios būsenos.
+    """
+
+    DPI = 150
+
+    def __init__(self, show_compass=True, theme="dark"):
+        _pyplot()
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        self.theme = theme
+        self._lock = threading.Lock()
+        colors_theme = THEMES[theme]
+        self._theta = np.array(ANGLE_ORDER) * np.pi / 180
+
+        fig = Figure(figsize=(12, 12), dpi=self.DPI)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(projection='polar')
+        fig.patch.set_facecolor(colors_theme["background"])
+        ax.set_facecolor(colors_theme["background"])
+
+        self._lines = LineCollection([], linewidths=2, alpha=0.8)
+        ax.add_collection(self._lines)
+        self._points = ax.scatter(self._theta, np.zeros(len(self._theta)), s=80, alpha=1, zorder=3,
+                                  edgecolors=colors_theme["marker_edge"], linewidths=1.5)
+        self._labels = [
+            ax.text(angle, 0, "", ha='center', va='center', fontsize=10,
+                    color=colors_theme["text"], weight='bold', zorder=4)
+            for angle in self._theta
+        ]
+
+        ax.set_ylim(0, 10)
+        ax.set_theta_zero_location('N')
+        ax.set_theta_direction(1)
+
+        if show_compass:
+            for angle, label in COMPASS_LABELS:
+                ax.text(angle * np.pi / 180, 11.5, label, ha='center', va='center',
+                        fontsize=9, color=colors_theme["compass"], weight='bold', zorder=5)
+
+        ax.set_xticks(self._theta)
+        ax.set_xticklabels([shorten_category(angles[angle]) for angle in ANGLE_ORDER],
+                           fontsize=8, color=colors_theme["text"])
+        ax.set_yticks(range(0, 11, 2))
+        ax.set_yticklabels(range(0, 11, 2), fontsize=9, color=colors_theme["text"])
+        ax.grid(True, color=colors_theme["grid"], alpha=0.3)
+        self._title = ax.set_title("", pad=30, fontsize=16, color=colors_theme["text"], weight='bold')
+
+        # Maketą ir apkarpymo ribas skaičiuojame vieną kartą su didžiausiomis
+        # vertėmis, kad kadrams nereikėtų bbox_inches='tight' perėjimo
+        self._update(np.full(len(self._theta), 10), "Jūsų įgūdžių profilis")
+        fig.tight_layout()
+        bbox = fig.get_tightbbox(canvas.get_renderer()).padded(0.1)
+        height = int(round(fig.bbox.height))
+        self._crop = (int(bbox.x0 * self.DPI), height - int(np.ceil(bbox.y1 * self.DPI)),
+                      int(np.ceil(bbox.x1 * self.DPI)), height - int(bbox.y0 * self.DPI))
+
+        # Statinis fonas be duomenų artistų
+        self._dynamic = [self._lines, self._points, *self._labels, self._title]
+        for artist in self._dynamic:
+            artist.set_animated(True)
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self.fig = fig
+
+    def _update(self, values, title):
+        radial = np.zeros((len(values), 2, 2))
+        radial[:, :, 0] = self._theta[:, None]
+        radial[:, 1, 1] = values
+        colors = value_colors(values)
+
+        self._lines.set_segments(radial)
+        self._lines.set_color(colors)
+        self._points.set_offsets(np.column_stack([self._theta, values]))
+        self._points.set_facecolors(colors)
+        for label, angle, value in zip(self._labels, self._theta, values):
+            label.set_position((angle, value + 0.3))
+            label.set_text(str(value))
+        self._title.set_text(title)
+
+    def render(self, skills_data, title="Jūsų įgūdžių profilis"):
+        """Nupiešti vertinimą ir grąžinti PNG baitus"""
+        values = np.array([int(skills_data[angle]) for angle in ANGLE_ORDER])
+        with self._lock:
+            canvas = self.fig.canvas
+            canvas.restore_region(self._background)
+            self._update(values, title)
+            for artist in self._dynamic:
+                self.fig.draw_artist(artist)
+            x0, y0, x1, y1 = self._crop
+            pixels = np.asarray(canvas.buffer_rgba())[y0:y1, x0:x1, :3].copy()
+
+        from PIL import Image
+
+        img_buffer = io.BytesIO()
+        Image.fromarray(pixels).save(img_buffer, format='PNG')
+        return img_buffer.getvalue()
+
+# === VEKTORINĖ (SVG) DIAGRAMA ===
+# Koordinačių sistema: centras (450, 450), 10 balų = 330 px, 0° Šiaurėje,
+# kampai didėja prieš laikrodžio rodyklę (kaip matplotlib diagramoje)
+SVG_SIZE = 900
+SVG_CENTER = SVG_SIZE / 2
+SVG_RADIUS = 330
+# Matomas plotas su paraštėmis žymoms ir pavadinimui
+SVG_VIEWBOX = (-150, -70, SVG_SIZE + 300, SVG_SIZE + 100)
+
+def _svg_point(angle, value):
+    rad = np.radians(angle)
+    scale = SVG_RADIUS * value / 10
+    return SVG_CENTER - scale * np.sin(rad), SVG_CENTER - scale * np.cos(rad)
+
+def _svg_text(x, y, text, size, color, anchor="middle", bold=False):
+    weight = ' font-weight="bold"' if bold else ''
+    lines = text.split("\n")
+    if len(lines) == 1:
+        return (f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" fill="{color}" '
+                f'text-anchor="{anchor}" dominant-baseline="middle"{weight}>{html.escape(text)}</text>')
+    # Kelių eilučių tekstas centruojamas vertikaliai aplink (x, y)
+    first_dy = -(len(lines) - 1) * 0.6
+    spans = "".join(
+        f'<tspan x="{x:.1f}" dy="{first_dy if i == 0 else 1.2:.1f}em">{html.escape(line)}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    return (f'<text y="{y:.1f}" font-size="{size}" fill="{color}" text-anchor="{anchor}" '
+            f'dominant-baseline="middle"{weight}>{spans}</text>')
+
+@lru_cache(maxsize=8)
+def _svg_template(show_compass, theme):
+    """Statinė SVG dalis (fonas, tinklelis, žymos, kompasas) – sukuriama vieną kartą"""
+    colors_theme = THEMES[theme]
+    x, y, width, height = SVG_VIEWBOX
+    parts = [f'<rect x="{x}" y="{y}" width="{width}" height="{height}" fill="{colors_theme["background"]}"/>']
+
+    grid = colors_theme["grid"]
+    for value in range(2, 11, 2):
+        parts.append(f'<circle cx="{SVG_CENTER}" cy="{SVG_CENTER}" r="{SVG_RADIUS * value / 10:.1f}" '
+                     f'fill="none" stroke="{grid}" stroke-opacity="0.3"/>')
+        x, y = _svg_point(22.5, value)
+        parts.append(_svg_text(x, y, str(value), 11, colors_theme["text"]))
+    for angle in ANGLE_ORDER:
+        x, y = _svg_point(angle, 10)
+        parts.append(f'<line x1="{SVG_CENTER}" y1="{SVG_CENTER}" x2="{x:.1f}" y2="{y:.1f}" '
+                     f'stroke="{grid}" stroke-opacity="0.3"/>')
+        # Kategorijų žymos už apskritimo; lygiavimas pagal pusę
+        x, y = _svg_point(angle, 10.6)
+        side = np.sin(np.radians(angle))
+        anchor = "middle" if abs(side) < 0.2 else ("end" if side > 0 else "start")
+        parts.append(_svg_text(x, y, shorten_category(angles[angle]), 10, colors_theme["text"], anchor))
+    parts.append(f'<circle cx="{SVG_CENTER}" cy="{SVG_CENTER}" r="{SVG_RADIUS}" fill="none" '
+                 f'stroke="{colors_theme["text"]}" stroke-opacity="0.6"/>')
+
+    if show_compass:
+        for angle, label in COMPASS_LABELS:
+            # Šoninės kryptys toliau, kad neužliptų ant kategorijų žymų
+            x, y = _svg_point(angle, 13.4 if angle % 180 == 0 else 16.5)
+            parts.append(_svg_text(x, y, label, 11, colors_theme["compass"], bold=True))
+    return "".join(parts)
+
+def create_radar_svg(skills_data, title="Jūsų įgūdžių profilis", show_compass=True, theme="dark"):
+    """Radar diagrama kaip kompaktiškas SVG – piešia naršyklė, ne serveris"""
+    colors_theme = THEMES[theme]
+    dynamic = []
+    for angle in sorted(skills_data, key=int):
+        value = int(skills_data[angle])
+        color = value_colors(value).item()
+        x, y = _svg_point(int(angle), value)
+        dynamic.append(f'<line x1="{SVG_CENTER}" y1="{SVG_CENTER}" x2="{x:.1f}" y2="{y:.1f}" '
+                       f'stroke="{color}" stroke-width="2" stroke-opacity="0.8"/>')
+        dynamic.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="5" fill="{color}" '
+                       f'stroke="{colors_theme["marker_edge"]}" stroke-width="1.5"/>')
+        lx, ly = _svg_point(int(angle), value + 0.3)
+        dynamic.append(_svg_text(lx, ly, str(value), 12, colors_theme["text"], bold=True))
+    dynamic.append(_svg_text(SVG_CENTER, SVG_VIEWBOX[1] + 25, title, 20, colors_theme["text"], bold=True))
+
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{" ".join(map(str, SVG_VIEWBOX))}" '
+            f'font-family="DejaVu Sans, sans-serif">'
+            f'{_svg_template(bool(show_compass), theme)}{"".join(dynamic)}</svg>')
+
+# Numatytasis diagramų formatas programoje: "png" arba "svg"
+CHART_FORMAT = os.environ.get("SKILLS_CHART_FORMAT", "png")
+
+# Piešimo režimas: "fast" (RadarRenderer) arba "classic" (create_circular_radar_chart)
+RADAR_RENDERER = os.environ.get("SKILLS_RADAR_RENDERER", "fast")
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+def get_renderer(show_compass=True, theme="dark"):
+    """Procesui bendras greitasis piešėjas kiekvienai parinkčių kombinacijai"""
+    key = (bool(show_compass), theme)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(key)
+            if renderer is None:
+                renderer = _renderers[key] = RadarRenderer(show_compass, theme)
+    return renderer
+
+# === ŠALTO STARTO PAŠILDYMAS ===
+# Ar proceso pradžioje fone paruošti matplotlib, šriftus ir šabloninę figūrą.
+# Viename branduolyje foninė gija tik konkuruoja dėl GIL su pirmuoju paleidimu,
+# todėl pagal nutylėjimą įjungta tik kai branduolių daugiau nei vienas.
+PREWARM = os.environ.get("SKILLS_PREWARM", "1" if (os.cpu_count() or 1) > 1 else "0") != "0"
+
+_prewarm_thread = None
+
+def _prewarm(show_compass, theme):
+    # Šabloninė figūra: importai, Agg, šriftai ir statinis fonas
+    get_renderer(show_compass, theme)
+    from PIL import Image  # noqa: F401  PNG koduotuvas
+
+def prewarm(show_compass=True, theme="dark", background=True):
+    """Iš anksto paruošti greitąjį piešėją, kad pirmoji diagrama nelauktų importų.
+
+    Fone gija startuoja tik pirmą kartą per procesą, todėl funkciją galima
+    kviesti kiekvieno scenarijaus paleidimo pradžioje. get_renderer užraktas
+    užtikrina, kad pirmoji diagrama palauks pradėto paruošimo, o ne kurs
+    figūrą antrą kartą. background=False naudinga kuriant konteinerio
+    atvaizdą: matplotlib šriftų talpykla sukuriama iš anksto.
+    """
+    global _prewarm_thread
+    if not background:
+        _prewarm(show_compass, theme)
+        return
+    if not PREWARM or _prewarm_thread is not None:
+        return
+    if CHART_FORMAT == "svg" or RADAR_RENDERER != "fast":
+        return
+    with _renderers_lock:
+        if _prewarm_thread is not None:
+            return
+        _prewarm_thread = threading.Thread(target=_prewarm, args=(show_compass, theme),
+                                           name="radar-prewarm", daemon=True)
+    _prewarm_thread.start()
+
+def _has_all_angles(skills_data):
+    return len(skills_data) == len(ANGLE_ORDER) and all(angle in skills_data for angle in ANGLE_ORDER)
+
+# === NUPIEŠTŲ DIAGRAMŲ TALPYKLA ===
+class RenderCache:
+    """LRU talpykla PNG baitams, ribojama bendru dydžiu baitais"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._items),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+chart_cache = RenderCache(int(os.environ.get("SKILLS_CHART_CACHE_MB", "64")) * 1024 * 1024)
+
+# === BENDRA DISKO TALPYKLA (KELIEMS PROCESAMS) ===
+class DiskRenderCache:
+    """SQLite BLOB talpykla, bendra visiems to paties serverio app.py procesams.
+
+    Antras lygis po RenderCache: raktas tas pats turinio maišas (chart_key).
+    WAL režimas leidžia skaitytojams neblokuoti rašytojo; kiekvienas įrašas
+    ir iškeldinimas vyksta vienoje transakcijoje, todėl kiti procesai mato
+    arba visą PNG, arba nieko. Bendras dydis laikomas cache_size eilutėje
+    (palaiko trigeriai); viršijus max_bytes, ištrinami seniausiai naudoti
+    įrašai iki 90 % ribos. last_used atnaujinamas ne dažniau kaip kas
+    TOUCH_INTERVAL s, kad skaitymai beveik nerašytų.
+    """
+
+    TOUCH_INTERVAL = 60.0
+
+    SCHEMA = (
+        '''CREATE TABLE IF NOT EXISTS charts (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL UNIQUE,
+            data BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_charts_last_used ON charts(last_used)',
+        'CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)',
+        'INSERT OR IGNORE INTO cache_size (id, total) VALUES (0, 0)',
+        '''CREATE TRIGGER IF NOT EXISTS charts_size_insert AFTER INSERT ON charts BEGIN
+            UPDATE cache_size SET total = total + NEW.size WHERE id = 0;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS charts_size_delete AFTER DELETE ON charts BEGIN
+            UPDATE cache_size SET total = total - OLD.size WHERE id = 0;
+        END''',
+    )
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._pool = ConnectionPool(path, max_size=4)
+        with self._pool.transaction() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._pool.connection() as conn:
+            row = conn.execute('SELECT data, last_used FROM charts WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[1] > self.TOUCH_INTERVAL:
+                conn.execute('UPDATE charts SET last_used = ? WHERE key = ?', (now, key))
+        # Skaitikliai bendri visoms gijoms: keičiami po užraktu, kaip RenderCache
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._pool.transaction() as conn:
+            # Tas pats raktas reiškia tą patį turinį, todėl esamo įrašo neperrašome
+            conn.execute('INSERT INTO charts (key, data, size, last_used) VALUES (?, ?, ?, ?) '
+                         'ON CONFLICT(key) DO NOTHING', (key, value, len(value), time.time()))
+            total = conn.execute('SELECT total FROM cache_size WHERE id = 0').fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total - int(self.max_bytes * 0.9))
+
+    @staticmethod
+    def _evict(conn, excess):
+        freed = 0
+        while freed < excess:
+            rows = conn.execute('SELECT id, size FROM charts ORDER BY last_used LIMIT 64').fetchall()
+            if not rows:
+                break
+            conn.executemany('DELETE FROM charts WHERE id = ?', [(row[0],) for row in rows])
+            freed += sum(row[1] for row in rows)
+
+    def stats(self):
+        with self._pool.connection() as conn:
+            entries, total = conn.execute(
+                'SELECT (SELECT COUNT(*) FROM charts), total FROM cache_size WHERE id = 0').fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {"hits": hits, "misses": misses, "entries": entries, "bytes": total,
+                "max_bytes": self.max_bytes, "path": self.path}
+
+    def clear(self):
+        with self._pool.transaction() as conn:
+            conn.execute('DELETE FROM charts')
+
+    def close(self):
+        self._pool.close()
+
+# SKILLS_CHART_DISK_MB=0 išjungia disko talpyklą; numatytasis failas – šalia vartotojų DB
+DISK_CACHE_MB = int(os.environ.get("SKILLS_CHART_DISK_MB", "256"))
+DISK_CACHE_PATH = os.environ.get("SKILLS_CHART_CACHE_PATH", "")
+
+disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+def get_disk_cache():
+    """Procesui bendra disko talpykla (atidaroma pirmą kartą prireikus) arba None"""
+    global disk_cache
+    if disk_cache is None and DISK_CACHE_MB > 0:
+        with _disk_cache_lock:
+            if disk_cache is None:
+                path = DISK_CACHE_PATH or os.path.join(os.path.dirname(os.path.abspath(database.DB_PATH)),
+                                                       "skills_chart_cache.db")
+                disk_cache = DiskRenderCache(path, DISK_CACHE_MB * 1024 * 1024)
+    return disk_cache
+
+# pyplot būsena bendra visoms gijoms, todėl piešiame po vieną
+_render_lock = threading.Lock()
+
+def chart_key(skills_data, title, show_compass, theme, renderer="classic", fmt="png"):
+    """Turinio raktas: tos pačios vertės, parinktys, piešėjas ir formatas duoda tą patį raktą.
+
+    Piešėjai duoda skirtingus baitus, o raktas bendras atminties ir disko
+    talpykloms (kiti procesai gali naudoti kitą SKILLS_RADAR_RENDERER).
+    """
+    values = tuple(sorted((int(angle), int(value)) for angle, value in skills_data.items()))
+    payload = repr((values, title, bool(show_compass), theme, renderer, fmt)).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def render_radar_png(skills_data, title="Jūsų įgūdžių profilis", show_compass=True, theme="dark",
+                     renderer=None):
+    """Radar diagrama PNG baitais; pakartotinės identiškos diagramos imamos iš talpyklos"""
+    # Greitasis kelias tinka tik pilnam 36 kampų vertinimui
+    fast = (renderer or RADAR_RENDERER) == "fast" and _has_all_angles(skills_data)
+    key = chart_key(skills_data, title, show_compass, theme, "fast" if fast else "classic")
+    png = chart_cache.get(key)
+    if png is not None:
+        metrics.inc("chart_cache_hits")
+        return png
+    metrics.inc("chart_cache_misses")
+
+    # Antras lygis: kito proceso jau nupiešta diagrama
+    disk = get_disk_cache()
+    if disk is not None:
+        png = disk.get(key)
+        if png is not None:
+            metrics.inc("chart_disk_hits")
+            chart_cache.put(key, png)
+            return png
+        metrics.inc("chart_disk_misses")
+
+    if fast:
+        with metrics.span("render.fast"):
+            png = get_renderer(show_compass, theme).render(skills_data, title)
+    else:
+        with _render_lock:
+            with metrics.span("render.classic.draw"):
+                fig = create_circular_radar_chart(skills_data, title, show_compass, theme)
+            with metrics.span("render.classic.encode"):
+                png = fig_to_png(fig, facecolor=THEMES[theme]["background"])
+    metrics.inc("renders")
+    chart_cache.put(key, png)
+    if disk is not None:
+        disk.put(key, png)
+    return png
+
+def render_radar(skills_data, title="Jūsų įgūdžių profilis", show_compass=True, theme="dark", fmt=None):
+    """Radar diagrama pasirinktu formatu: "png" (baitai) arba "svg" (tekstas)"""
+    if (fmt or CHART_FORMAT) == "svg":
+        metrics.inc("renders")
+        with metrics.span("render.svg"):
+            return create_radar_svg(skills_data, title, show_compass, theme)
+    return render_radar_png(skills_data, title, show_compass, theme)
+
+def chart_cache_stats():
+    """Talpyklų pataikymų/nepataikymų skaitikliai (disko talpykla – rakte "disk")"""
+    stats = chart_cache.stats()
+    if get_disk_cache() is not None:
+        stats["disk"] = disk_cache.stats()
+    return stats
@@ -0,0 +1,154 @@
+"""Radar diagramų generavimas visai grupei (klasei, dirbtuvėms) be prisijungimo.
+
+Vertinimai skaitomi iš DB dalimis ir piešiami procesų telkinyje; kiekvienas
+rezultatas iš karto įrašomas į katalogą arba ZIP failą.
+
+Pavyzdžiai:
+    python render_cli.py --out diagramos/
+    python render_cli.py --zip klase.zip --emails a@b.lt,c@d.lt --all --format svg
+    python render_cli.py --out /tmp/x --scaling
+"""
+import os
+import re
+import sys
+import time
+import zipfile
+import argparse
+import multiprocessing
+
+import database
+import radar
+import storage
+from skills import decode_scores, scores_to_dict
+
+# Po kiek užduočių darbuotojas pakeičiamas nauju (riboja atminties augimą)
+MAX_TASKS_PER_CHILD = 500
+
+# === DARBUOTOJAS ===
+def _init_worker(renderer):
+    # Kiekviena diagrama unikali: procesų talpykla tik eikvotų atmintį
+    radar.chart_cache = radar.RenderCache(0)
+    radar.DISK_CACHE_MB = 0
+    radar.RADAR_RENDERER = renderer
+
+def render_task(task):
+    """(failo vardas, formatas, pavadinimas, balai) -> (failo vardas, turinys baitais)"""
+    filename, fmt, title, scores = task
+    skills_data = scores_to_dict(decode_scores(scores))
+    if fmt == "svg":
+        return filename, radar.create_radar_svg(skills_data, title).encode("utf-8")
+    # render_radar_png: greitasis piešėjas arba create_circular_radar_chart + fig_to_png,
+    # kuris figūrą uždaro po kiekvienos užduoties
+    return filename, radar.render_radar_png(skills_data, title)
+
+# === UŽDUOTYS IR REZULTATAI ===
+def _slug(text):
+    return re.sub(r"[^\w-]+", "_", text).strip("_") or "vartotojas"
+
+def iter_tasks(fmt, user_ids=None, assessment_ids=None, latest_only=True):
+    for assessment_id, user_id, username, created_at, scores in database.iter_assessment_rows(
+            user_ids=user_ids, assessment_ids=assessment_ids, latest_only=latest_only):
+        filename = f"{_slug(username)}_{user_id}_{assessment_id}.{fmt}"
+        yield filename, fmt, f"{username} – {str(created_at)[:10]}", scores
+
+class DirectoryWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.path, filename), "wb") as handle:
+            handle.write(data)
+
+    def close(self):
+        pass
+
+class ZipWriter:
+    def __init__(self, path):
+        # PNG jau suspaustas; SVG tekstas suspaudžiamas gerai
+        self._zip = zipfile.ZipFile(path, "w")
+
+    def write(self, filename, data):
+        compression = zipfile.ZIP_STORED if filename.endswith(".png") else zipfile.ZIP_DEFLATED
+        self._zip.writestr(filename, data, compress_type=compression)
+
+    def close(self):
+        self._zip.close()
+
+def render_all(tasks, writer, workers, renderer="fast", chunksize=8):
+    """Nupiešti visas užduotis workers procesuose; grąžina (kiekis, trukmė s)"""
+    start = time.perf_counter()
+    count = 0
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(renderer,),
+                              maxtasksperchild=MAX_TASKS_PER_CHILD) as pool:
+        for filename, data in pool.imap_unordered(render_task, tasks, chunksize=chunksize):
+            writer.write(filename, data)
+            count += 1
+    return count, time.perf_counter() - start
+
+def _scaling_steps(maximum):
+    steps, workers = [], 1
+    while workers < maximum:
+        steps.append(workers)
+        workers *= 2
+    return steps + [maximum]
+
+def _parse_ids(text):
+    return [int(value) for value in text.split(",") if value.strip()] if text else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="katalogas diagramoms")
+    target.add_argument("--zip", help="ZIP failas diagramoms")
+    parser.add_argument("--db", help="SQLite DB failas (numatytai – SKILLS_STORAGE_URL arba SKILLS_DB_PATH)")
+    parser.add_argument("--format", choices=("png", "svg"), default="png")
+    parser.add_argument("--users", help="vartotojų ID, atskirti kableliais")
+    parser.add_argument("--emails", help="vartotojų el. paštai, atskirti kableliais")
+    parser.add_argument("--assessments", help="konkrečių vertinimų ID, atskirti kableliais")
+    parser.add_argument("--all", action="store_true", help="visi vertinimai, ne tik naujausi")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--renderer", choices=("fast", "classic"), default=radar.RADAR_RENDERER)
+    parser.add_argument("--scaling", action="store_true",
+                        help="pakartoti su 1, 2, 4 ... --workers procesais ir palyginti vaizdus/s")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        database.DB_PATH = args.db
+        storage.set_backend(storage.open_backend(f"sqlite:///{args.db}"))
+    database.init_database()
+    try:
+        path = database.require_sqlite("render_cli.py")
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    user_ids = _parse_ids(args.users)
+    if args.emails:
+        emails = [email.strip() for email in args.emails.split(",") if email.strip()]
+        with database.get_pool(path).connection() as conn:
+            rows = conn.execute(f"SELECT id FROM users WHERE email IN ({','.join('?' * len(emails))})",
+                                emails).fetchall()
+        user_ids = (user_ids or []) + [row[0] for row in rows]
+
+    def tasks():
+        return iter_tasks(args.format, user_ids=user_ids, assessment_ids=_parse_ids(args.assessments),
+                          latest_only=not args.all)
+
+    steps = _scaling_steps(args.workers) if args.scaling else [args.workers]
+    baseline = None
+    for workers in steps:
+        writer = ZipWriter(args.zip) if args.zip else DirectoryWriter(args.out)
+        try:
+            count, elapsed = render_all(tasks(), writer, workers, args.renderer)
+        finally:
+            writer.close()
+        rate = count / elapsed if elapsed else 0.0
+        baseline = baseline or rate
+        speedup = f" (x{rate / baseline:.2f})" if baseline else ""
+        print(f"procesų {workers:>3}: {count} diagramų per {elapsed:.1f} s, {rate:.1f} vaizdų/s{speedup}")
+    print(f"branduolių: {os.cpu_count()}, rezultatai: {args.zip or args.out}")
+    database.close_pools()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import io
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import database
+import metrics
+from radar import render_radar_png, shorten_category
+from skills import angles, ANGLE_ORDER, SkillsHistory, scores_to_dict
+
+# Kiek paruoštų ataskaitų laikoma atmintyje (LRU)
+MAX_REPORTS = 32
+PAGE_SIZE = (8.27, 11.69)  # A4 coliais
+ROWS_PER_PAGE = 18
+COMMENTS_PER_PAGE = 12
+
+# === PUSLAPIAI ===
+def _page(title):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=PAGE_SIZE)
+    fig.suptitle(title, fontsize=16, weight='bold', y=0.97)
+    return fig
+
+def _radar_page(username, latest, created_at):
+    """Naujausia diagrama; PNG imamas iš bendros diagramų talpyklos"""
+    from PIL import Image
+
+    fig = _page(f"{username}: įgūdžių profilis")
+    fig.text(0.5, 0.92, f"Naujausias vertinimas: {created_at}", ha='center', fontsize=10)
+    png = render_radar_png(scores_to_dict(latest), "Jūsų įgūdžių profilis")
+    ax = fig.add_axes((0.03, 0.08, 0.94, 0.82))
+    ax.imshow(np.asarray(Image.open(io.BytesIO(png))))
+    ax.axis('off')
+    return fig
+
+def _progress_page(history, timestamps):
+    fig = _page("Progresas laike")
+    stats = history.stats()
+    dates = timestamps.astype('datetime64[s]').astype(object)
+
+    ax = fig.add_axes((0.1, 0.58, 0.85, 0.3))
+    ax.plot(dates, stats['mean'], marker='o', color='#1f77b4')
+    ax.set_ylim(0, 10)
+    ax.set_ylabel("Vidutinis balas")
+    ax.grid(True, alpha=0.3)
+    fig.autofmt_xdate()
+
+    change = history.net_change().astype(int)
+    order = np.argsort(change, kind='stable')
+    lines = [f"Vertinimų: {len(history)}", f"Vidurkis: {stats['mean'][0]:.1f} → {stats['mean'][-1]:.1f}", ""]
+    lines.append("Daugiausia patobulėta:")
+    lines += [f"  {angles[ANGLE_ORDER[i]][:60]}: {change[i]:+d}" for i in order[::-1][:5] if change[i] > 0]
+    lines.append("")
+    lines.append("Daugiausia suprastėta:")
+    lines += [f"  {angles[ANGLE_ORDER[i]][:60]}: {change[i]:+d}" for i in order[:5] if change[i] < 0]
+    fig.text(0.1, 0.5, "\n".join(lines), va='top', fontsize=10, family='monospace')
+    return fig
+
+def _statistics_pages(history):
+    """Kategorijų lentelė: naujausias, vidurkis, min, maks, pokytis"""
+    latest = history.matrix[-1].astype(int)
+    means = history.axis_means()
+    minimums = history.matrix.min(axis=0).astype(int)
+    maximums = history.matrix.max(axis=0).astype(int)
+    change = history.net_change().astype(int)
+    rows = [[shorten_category(angles[angle]).replace("\n", " ")[:40], str(latest[i]), f"{means[i]:.1f}",
+             str(minimums[i]), str(maximums[i]), f"{change[i]:+d}"]
+            for i, angle in enumerate(ANGLE_ORDER)]
+
+    pages = []
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        fig = _page("Kategorijų statistika")
+        ax = fig.add_axes((0.05, 0.05, 0.9, 0.85))
+        ax.axis('off')
+        table = ax.table(cellText=rows[start:start + ROWS_PER_PAGE],
+                         colLabels=["Kategorija", "Dabar", "Vid.", "Min", "Maks", "Pokytis"],
+                         colWidths=[0.5, 0.1, 0.1, 0.1, 0.1, 0.1], loc='upper center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(8)
+        table.scale(1, 1.6)
+        pages.append(fig)
+    return pages
+
+def _comment_pages(assessments):
+    with_comments = [a for a in assessments if a['comment']]
+    if not with_comments:
+        return []
+    pages = []
+    for start in range(0, len(with_comments), COMMENTS_PER_PAGE):
+        fig = _page("Refleksijos")
+        y = 0.9
+        for assessment in with_comments[start:start + COMMENTS_PER_PAGE]:
+            fig.text(0.08, y, str(assessment['created_at']), fontsize=9, weight='bold')
+            wrapped = "\n".join(textwrap.wrap(assessment['comment'], 95)[:4])
+            fig.text(0.08, y - 0.015, wrapped, va='top', fontsize=9)
+            y -= 0.072
+        pages.append(fig)
+    return pages
+
+@metrics.timed("report.pdf")
+def build_report(user_id, username):
+    """Kelių puslapių PDF ataskaita baitais (None, jei vertinimų nėra)"""
+    from radar import _pyplot
+    _pyplot()  # Agg backend prisegamas prieš PDF piešimą
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    timestamps, matrix = database.get_user_score_history(user_id)
+    if len(matrix) == 0:
+        return None
+    history = SkillsHistory(matrix, timestamps)
+    assessments = database.get_user_assessments(user_id)
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        pdf.infodict()['Title'] = f"Įgūdžių ataskaita – {username}"
+        pages = [_radar_page(username, matrix[-1], str(timestamps[-1]).replace("T", " "))]
+        if len(history) > 1:
+            pages.append(_progress_page(history, timestamps))
+        pages += _statistics_pages(history)
+        pages += _comment_pages(assessments)
+        for fig in pages:
+            pdf.savefig(fig)
+    metrics.inc("reports")
+    return buffer.getvalue()
+
+# === FONINIS DARBUOTOJAS ===
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report")
+_reports = OrderedDict()
+_lock = threading.Lock()
+
+def latest_assessment_id(user_id):
+    latest = database.get_latest_assessment(user_id)
+    return latest['id'] if latest else None
+
+def request_report(user_id, username):
+    """Ataskaitos Future pagal (vartotojas, naujausias vertinimas).
+
+    Jau paruošta arba ruošiama ataskaita grąžinama iš atminties, todėl
+    pakartotinis atsisiuntimas nieko nekainuoja; naujas vertinimas keičia raktą.
+    """
+    key = (user_id, latest_assessment_id(user_id))
+    with _lock:
+        future = _reports.get(key)
+        if future is not None and not (future.done() and future.exception()):
+            _reports.move_to_end(key)
+            return future
+        future = _reports[key] = _executor.submit(build_report, user_id, username)
+        while len(_reports) > MAX_REPORTS:
+            _reports.popitem(last=False)
+    return future
+
+def cached_report(user_id):
+    """Jau užsakytos ataskaitos Future (arba None) naujausiam vertinimui"""
+    key = (user_id, latest_assessment_id(user_id))
+    with _lock:
+        return _reports.get(key)
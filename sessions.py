@@ -0,0 +1,161 @@
+"""Pasirašyti sesijos žetonai: prisijungimas išlieka atnaujinus naršyklės langą.
+
+Žetonas "sesijos_id.user_id.galioja_iki.parašas" (HMAC-SHA256) laikomas URL
+parametre. Parašas ir galiojimo laikas tikrinami be DB ir be slaptažodžio
+maišymo; ar sesija neatšaukta, tikrinama user_sessions lentelėje, o atsakymai
+laikomi riboto dydžio TTL talpykloje. Atšaukus sesiją kitame procese, šio
+proceso talpykloje ji gali galioti dar iki CACHE_TTL sekundžių.
+"""
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+
+import database
+import metrics
+
+# URL parametras, kuriame laikomas žetonas
+QUERY_PARAM = "session"
+# Kiek dienų galioja prisijungimas
+SESSION_DAYS = float(os.environ.get("SKILLS_SESSION_DAYS", "14"))
+# Patikrintų sesijų talpykla: dydis ir kiek sekundžių pasitikima atsakymu
+CACHE_SIZE = int(os.environ.get("SKILLS_SESSION_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.environ.get("SKILLS_SESSION_CACHE_TTL", "60"))
+
+# === TTL TALPYKLA ===
+class TtlCache:
+    """LRU talpykla, kurios įrašai pasensta po ttl sekundžių"""
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """(rasta, reikšmė); pasenęs įrašas laikomas nerastu"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, ttl=None):
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._entries), 'max_entries': self.max_entries, 'ttl_s': self.ttl,
+                    'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / total if total else 0.0}
+
+session_cache = TtlCache()
+
+# === ŽETONAI ===
+_secret = None
+_secret_lock = threading.Lock()
+
+def _get_secret():
+    """SKILLS_SESSION_SECRET arba DB migracijoje sugeneruotas raktas (bendras visiems procesams)"""
+    global _secret
+    if _secret is None:
+        with _secret_lock:
+            if _secret is None:
+                configured = os.environ.get("SKILLS_SESSION_SECRET", "")
+                _secret = configured.encode() if configured else database.get_session_secret()
+    return _secret
+
+def _sign(payload):
+    digest = hmac.new(_get_secret(), payload.encode("ascii"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+def _parse(token, check_expiry=True):
+    """Žetonas -> (sesijos_id, user_id, galioja_iki) arba None, jei parašas netinka ar pasibaigė"""
+    try:
+        # Ne ASCII žetonas (pvz. suklastotas slapukas) negali būti mūsų pasirašytas
+        if not token.isascii():
+            return None
+        session_id, user_id, expires_at, signature = token.split(".")
+        user_id, expires_at = int(user_id), int(expires_at)
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(_sign(f"{session_id}.{user_id}.{expires_at}"), signature):
+        return None
+    if check_expiry and expires_at <= time.time():
+        return None
+    return session_id, user_id, expires_at
+
+@metrics.timed("auth.session_issue")
+def issue_token(user):
+    """Sukurti sesiją prisijungusiam vartotojui ir grąžinti pasirašytą žetoną"""
+    session_id = secrets.token_urlsafe(12)
+    expires_at = int(time.time() + SESSION_DAYS * 86400)
+    database.create_session(session_id, user['id'], expires_at)
+    session_cache.put(session_id, dict(user))
+    payload = f"{session_id}.{user['id']}.{expires_at}"
+    return f"{payload}.{_sign(payload)}"
+
+@metrics.timed("auth.session")
+def validate_token(token):
+    """Žetono vartotojas {'id', 'username', 'email'} arba None.
+
+    Netinkamas parašas ar pasibaigęs laikas atmetami be DB; kitaip atsakymas
+    imamas iš talpyklos, o jos neradus – viena PK užklausa.
+    """
+    parsed = _parse(token)
+    if parsed is None:
+        metrics.inc("session_rejected")
+        return None
+    session_id, user_id, expires_at = parsed
+    found, user = session_cache.get(session_id)
+    if found:
+        metrics.inc("session_cache_hits")
+    else:
+        metrics.inc("session_cache_misses")
+        user = database.get_session_user(session_id)
+        if user is not None and user['id'] != user_id:
+            user = None
+        # Neigiamas atsakymas taip pat laikomas, kad atšauktas žetonas nekainuotų užklausos
+        session_cache.put(session_id, user, ttl=expires_at - time.time())
+    return dict(user) if user else None
+
+def revoke_token(token):
+    """Atšaukti žetono sesiją (atsijungiant); šiame procese – iš karto"""
+    parsed = _parse(token, check_expiry=False)
+    if parsed is None:
+        return False
+    database.revoke_session(parsed[0])
+    session_cache.put(parsed[0], None)
+    metrics.inc("session_revocations")
+    return True
+
+def session_stats():
+    return session_cache.stats()
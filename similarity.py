@@ -0,0 +1,272 @@
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+
+from skills import ANGLE_ORDER
+
+# Nuo kiek vartotojų procesinis indeksas automatiškai kuria IVF sąrašus
+IVF_MIN_USERS = int(os.environ.get("SKILLS_SIMILARITY_IVF_MIN", "200000"))
+# Kas kiek sekundžių indeksas perkraunamas iš DB (kiti procesai, importas); 0 – niekada
+REFRESH_INTERVAL = float(os.environ.get("SKILLS_SIMILARITY_REFRESH", "60"))
+
+# === PANAŠIŲ PROFILIŲ INDEKSAS ===
+class SimilarityIndex:
+    """Naujausių vartotojų vertinimų (36 matmenų vektorių) paieškos indeksas.
+
+    Pagal nutylėjimą ieškoma vektorizuotu perrinkimu (viena matricos ir
+    vektoriaus sandauga). Dideliam vartotojų skaičiui galima sukurti IVF
+    indeksą (k-means grupės); tada tikrinamos tik nprobe artimiausios grupės.
+    Viskas vyksta procese, be išorinių paslaugų.
+    """
+
+    def __init__(self, capacity=1024):
+        dims = len(ANGLE_ORDER)
+        self._user_ids = np.zeros(capacity, dtype=np.int64)
+        self._vectors = np.zeros((capacity, dims), dtype=np.float32)
+        self._unit = np.zeros((capacity, dims), dtype=np.float32)
+        self._sq_norms = np.zeros(capacity, dtype=np.float32)
+        self._rows = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._centroids = None
+        self._lists = None
+        self.nprobe = 8
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        capacity = len(self._user_ids) * 2
+        for name in ("_user_ids", "_vectors", "_unit", "_sq_norms"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        if self._lists is not None:
+            lists = np.full(capacity, -1, dtype=np.int32)
+            lists[:len(self._lists)] = self._lists
+            self._lists = lists
+
+    def upsert(self, user_id, scores):
+        """Įrašyti arba pakeisti vartotojo naujausią vektorių"""
+        vector = np.asarray(scores, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                if self._size == len(self._user_ids):
+                    self._grow()
+                row = self._rows[user_id] = self._size
+                self._size += 1
+            self._user_ids[row] = user_id
+            self._vectors[row] = vector
+            self._unit[row] = vector / norm if norm else 0
+            self._sq_norms[row] = norm * norm
+            if self._centroids is not None:
+                self._lists[row] = self._nearest_centroids(vector[None, :], 1)[0, 0]
+
+    def bulk_load(self, user_ids, matrix):
+        """Užkrauti daug naujų vektorių vienu kartu (pradiniam indekso sukūrimui)"""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        vectors = np.asarray(matrix, dtype=np.float32)
+        known = np.array([int(user_id) in self._rows for user_id in user_ids], dtype=bool)
+        for user_id, scores in zip(user_ids[known], vectors[known]):
+            self.upsert(int(user_id), scores)
+        user_ids, vectors = user_ids[~known], vectors[~known]
+
+        with self._lock:
+            while self._size + len(user_ids) > len(self._user_ids):
+                self._grow()
+            start, end = self._size, self._size + len(user_ids)
+            norms = np.linalg.norm(vectors, axis=1)
+            self._user_ids[start:end] = user_ids
+            self._vectors[start:end] = vectors
+            self._unit[start:end] = np.divide(vectors, norms[:, None], out=np.zeros_like(vectors),
+                                              where=norms[:, None] > 0)
+            self._sq_norms[start:end] = norms * norms
+            self._rows.update(zip(user_ids.tolist(), range(start, end)))
+            if self._centroids is not None:
+                self._lists[start:end] = self._assign(vectors, self._centroids)
+            self._size = end
+
+    # --- IVF ---
+    def build_ivf(self, n_lists=None, iterations=10, seed=0):
+        """Sugrupuoti vektorius k-means metodu (IVF), kad paieška tikrintų tik dalį jų"""
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(size)))
+            vectors = self._vectors[:size]
+            rng = np.random.default_rng(seed)
+            centroids = vectors[rng.choice(size, size=min(n_lists, size), replace=False)].copy()
+            for _ in range(iterations):
+                assignments = self._assign(vectors, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignments, vectors)
+                counts = np.bincount(assignments, minlength=len(centroids))
+                filled = counts > 0
+                centroids[filled] = sums[filled] / counts[filled, None]
+            self._centroids = centroids
+            self._lists = np.full(len(self._user_ids), -1, dtype=np.int32)
+            self._lists[:size] = self._assign(vectors, centroids)
+
+    @staticmethod
+    def _centroid_distances(vectors, centroids):
+        # |a|² nekeičia artimiausio centro, todėl užtenka |b|² - 2ab
+        return (centroids * centroids).sum(axis=1) - 2 * vectors @ centroids.T
+
+    @classmethod
+    def _assign(cls, vectors, centroids, chunk=16384):
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            part = vectors[start:start + chunk]
+            assignments[start:start + chunk] = cls._centroid_distances(part, centroids).argmin(axis=1)
+        return assignments
+
+    def _nearest_centroids(self, vectors, count):
+        distances = self._centroid_distances(vectors, self._centroids)
+        count = min(count, len(self._centroids))
+        return np.argpartition(distances, count - 1, axis=1)[:, :count]
+
+    # --- PAIEŠKA ---
+    def query(self, scores, k=5, metric="cosine", exclude=None):
+        """k artimiausių vartotojų: [(user_id, panašumas arba atstumas), ...].
+
+        metric -- "cosine" (didesnis panašesnis) arba "l2" (mažesnis panašesnis).
+        exclude -- vartotojo ID, kurio nerodyti (dažniausiai paties klausiančiojo).
+        """
+        query = np.asarray(scores, dtype=np.float32)
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return []
+            if self._centroids is not None:
+                probe = self._nearest_centroids(query[None, :], self.nprobe)[0]
+                candidates = np.flatnonzero(np.isin(self._lists[:size], probe))
+            else:
+                candidates = None
+
+            if metric == "cosine":
+                unit = self._unit[:size] if candidates is None else self._unit[candidates]
+                norm = np.linalg.norm(query)
+                scores_out = unit @ (query / norm if norm else query)
+                order_key = -scores_out
+            elif metric == "l2":
+                vectors = self._vectors[:size] if candidates is None else self._vectors[candidates]
+                sq_norms = self._sq_norms[:size] if candidates is None else self._sq_norms[candidates]
+                scores_out = np.sqrt(np.maximum(sq_norms - 2 * vectors @ query + query @ query, 0))
+                order_key = scores_out
+            else:
+                raise ValueError(f"Nežinoma metrika: {metric}")
+
+            user_ids = self._user_ids[:size] if candidates is None else self._user_ids[candidates]
+            if exclude is not None:
+                order_key = np.where(user_ids == exclude, np.inf, order_key)
+
+            count = min(k + (exclude is not None), len(order_key))
+            if count == 0:
+                return []
+            top = np.argpartition(order_key, count - 1)[:count]
+            top = top[np.argsort(order_key[top], kind='stable')]
+            return [(int(user_ids[i]), float(scores_out[i])) for i in top if np.isfinite(order_key[i])][:k]
+
+    def vectors_for(self, user_ids):
+        """Vartotojų vektoriai (n, 36) nurodyta tvarka"""
+        with self._lock:
+            return self._vectors[[self._rows[user_id] for user_id in user_ids]].copy()
+
+# === PROCESO INDEKSAS ===
+_index = None
+_loaded_at = 0.0
+_pending = None
+_listening = False
+_index_lock = threading.Lock()      # pirmas užkrovimas
+_state_lock = threading.Lock()      # _index, _pending ir _loaded_at keitimas
+_refresh_lock = threading.Lock()    # vienu metu perkrauna tik viena gija
+
+def _load_index():
+    import database
+
+    index = SimilarityIndex()
+    for user_ids, matrix in database.iter_latest_scores():
+        index.bulk_load(user_ids, matrix)
+    if len(index) >= IVF_MIN_USERS:
+        index.build_ivf()
+    return index
+
+def _on_saved(user_id, assessment_id, scores):
+    with _state_lock:
+        index = _index
+        if _pending is not None:
+            _pending.append((user_id, scores))
+    if index is not None:
+        index.upsert(user_id, scores)
+
+def _refresh():
+    """Užkrauti naują indeksą iš DB ir pakeisti juo senąjį.
+
+    Perkrovimo metu šiame procese išsaugoti vertinimai kaupiami ir pritaikomi
+    naujam indeksui prieš pakeitimą, todėl jie neprarandami.
+    """
+    global _index, _pending, _loaded_at
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        with _state_lock:
+            _pending = []
+        try:
+            index = _load_index()
+        except Exception:
+            with _state_lock:
+                _pending = None
+                _loaded_at = time.monotonic()
+            if _index is None:
+                raise
+            logging.getLogger(__name__).exception("Nepavyko perkrauti panašumo indekso")
+            return
+        with _state_lock:
+            for user_id, scores in _pending:
+                index.upsert(user_id, scores)
+            _index, _pending, _loaded_at = index, None, time.monotonic()
+    finally:
+        _refresh_lock.release()
+
+def get_similarity_index():
+    """Procesui bendras indeksas.
+
+    Pirmą kartą užkraunamas iš DB, toliau atnaujinamas po kiekvieno šiame
+    procese išsaugoto vertinimo. Kitų procesų (mazgų) išsaugojimai ir
+    masinis importas pasiekia indeksą per REFRESH_INTERVAL: pasenęs indeksas
+    perkraunamas fone, o kol tai vyksta, grąžinamas ankstesnis.
+    """
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                import database
+
+                # Klausytojas registruojamas prieš užkrovimą: tuo metu išsaugoti vertinimai neprarandami
+                global _listening
+                if not _listening:
+                    database.add_save_listener(_on_saved)
+                    _listening = True
+                _refresh()
+    elif (REFRESH_INTERVAL > 0 and time.monotonic() - _loaded_at > REFRESH_INTERVAL
+          and not _refresh_lock.locked()):
+        threading.Thread(target=_refresh, name="skills-similarity-refresh", daemon=True).start()
+    return _index
+
+def similar_profiles(user_id, scores, k=5, metric="cosine"):
+    """Panašiausi profiliai ir sritys, kuriose jie vertina save aukščiau.
+
+    Grąžina (kaimynai [(user_id, panašumas)], vidutinis kaimynų ir vartotojo skirtumas (36,)).
+    """
+    index = get_similarity_index()
+    neighbours = index.query(scores, k=k, metric=metric, exclude=user_id)
+    if not neighbours:
+        return [], np.zeros(len(ANGLE_ORDER))
+    matrix = index.vectors_for([neighbour_id for neighbour_id, _ in neighbours])
+    return neighbours, matrix.mean(axis=0) - np.asarray(scores, dtype=np.float32)
@@ -0,0 +1,175 @@
+import numpy as np
+
+# Kampų žemėlapis su tiksliais laipsniais (Šiaurė = 0° = Matematika)
+angles = {
+    0: "MATEMATIKA, KVANTINĖ FIZIKA",
+    10: "DIRBTINIS INTELEKTAS, MAŠINŲ MOKYMAS",
+    20: "FIZIKA, ELEKTRONIKA, KOMPIUTERIJA",
+    30: "INŽINERIJA",
+    40: "ELEKTROTECHNIKA",
+    50: "MECHANIKA",
+    60: "ARCHITEKTŪRA, MODELIAVIMAS",
+    70: "STATISTIKA, DUOMENYS",
+    80: "FINANSAI, EKONOMIKA",
+    90: "ĮSTATYMAI, TEISĖ",
+    100: "POLITIKA",
+    110: "VALDŽIA, VALSTYBĖ",
+    120: "RAŠTAS, SKAIČIAI",
+    130: "AMATAI, PREKYBA",
+    140: "RELIGIJOS",
+    150: "BŪSTAS, STATYBA",
+    160: "KELIONĖS, ATRADIMAI",
+    170: "AGRESIJA, DOMINAVIMAS",
+    180: "FIZINĖ JĖGA",
+    190: "MAISTAS",
+    200: "SEKSAS, VAIKAI",
+    210: "ŠILUMA, BUITIS",
+    220: "VALGIO RUOŠIMAS",
+    230: "GLOBA/RŪPYBA",
+    240: "EMPATIJA",
+    250: "PUOŠYBA",
+    260: "MUZIKA, ŠOKIS",
+    270: "DRAMATIKA, GINČAI",
+    280: "LITERATŪRA",
+    290: "MEDIA, DIZAINAS",
+    300: "ISTORIJA, ŽURNALISTIKA",
+    310: "PSICHOLOGIJA",
+    320: "MĄSTYMAS, FILOSOFIJA",
+    330: "BIOLOGIJA, NEUROMOKSLAI",
+    340: "MEDICINOS MOKSLAI",
+    350: "CHEMIJA, BIOTECHNOLOGIJOS",
+}
+
+# Kampai fiksuota tvarka (visų vektorių ir diagramų ašių tvarka)
+ANGLE_ORDER = tuple(angles)
+
+# === VERTINIMŲ KODAVIMAS ===
+# Vertinimas saugomas kaip 36 uint8 baitai ANGLE_ORDER tvarka (0 = neįvertinta)
+SCORE_DTYPE = np.uint8
+
+def encode_scores(skills_data):
+    """Vertinimas (žodynas kampas -> balas arba masyvas) į 36 baitų BLOB"""
+    if isinstance(skills_data, dict):
+        values = [int(skills_data.get(angle, skills_data.get(str(angle), 0))) for angle in ANGLE_ORDER]
+    else:
+        values = skills_data
+    scores = np.asarray(values)
+    if scores.shape != (len(ANGLE_ORDER),) or scores.min() < 0 or scores.max() > 10:
+        raise ValueError("Vertinimą turi sudaryti 36 balai nuo 0 iki 10")
+    return scores.astype(SCORE_DTYPE).tobytes()
+
+def decode_scores(blob):
+    """36 baitų BLOB į NumPy masyvą (be kopijavimo, tik skaitymui)"""
+    return np.frombuffer(blob, dtype=SCORE_DTYPE)
+
+def decode_score_matrix(blobs):
+    """Daug BLOB'ų į (n, 36) matricą vienu veiksmu"""
+    return np.frombuffer(b"".join(blobs), dtype=SCORE_DTYPE).reshape(-1, len(ANGLE_ORDER))
+
+def scores_to_dict(scores):
+    """Masyvas į žodyną kampas -> balas (diagramoms ir eksportui)"""
+    return dict(zip(ANGLE_ORDER, (int(value) for value in scores)))
+
+# === VEKTORINĖS STATISTIKOS ===
+ANGLE_ARRAY = np.array(ANGLE_ORDER)
+
+def to_vector(skills_data):
+    """Vertinimas (žodynas arba masyvas) į 36 elementų masyvą ANGLE_ORDER tvarka"""
+    if isinstance(skills_data, dict):
+        return np.array([skills_data.get(angle, 0) for angle in ANGLE_ORDER])
+    return np.asarray(skills_data)
+
+def assessment_stats(scores):
+    """Vidurkis, stipriausia ir silpniausia sritis vienam ar daugeliui vertinimų vienu kvietimu.
+
+    scores -- (36,) vektorius arba (n, 36) matrica; grąžinami (n,) masyvai.
+    Lygiųjų atveju laimi pirmas kampas (kaip max()/min() žodynui).
+    """
+    matrix = np.atleast_2d(scores)
+    rows = np.arange(len(matrix))
+    best = matrix.argmax(axis=1)
+    worst = matrix.argmin(axis=1)
+    return {
+        "mean": matrix.mean(axis=1),
+        "strongest_angle": ANGLE_ARRAY[best],
+        "strongest_score": matrix[rows, best],
+        "weakest_angle": ANGLE_ARRAY[worst],
+        "weakest_score": matrix[rows, worst],
+    }
+
+def assessment_summary(scores):
+    """Vieno vertinimo statistikos Python reikšmėmis (rodymui ir eksportui)"""
+    stats = assessment_stats(to_vector(scores))
+    return {
+        "mean": float(stats["mean"][0]),
+        "strongest": (int(stats["strongest_angle"][0]), int(stats["strongest_score"][0])),
+        "weakest": (int(stats["weakest_angle"][0]), int(stats["weakest_score"][0])),
+    }
+
+class SkillsHistory:
+    """Vartotojo vertinimų istorija kaip (n, 36) matrica, eilutės nuo seniausio"""
+
+    def __init__(self, matrix, timestamps=None):
+        self.matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def stats(self):
+        """assessment_stats visoms eilutėms"""
+        return assessment_stats(self.matrix)
+
+    def axis_means(self):
+        """Kiekvienos srities vidurkis per visą istoriją (36,)"""
+        return self.matrix.mean(axis=0)
+
+    def deltas(self):
+        """Pokyčiai tarp gretimų vertinimų (n-1, 36)"""
+        return np.diff(self.matrix, axis=0)
+
+    def net_change(self):
+        """Pokytis nuo pirmo iki paskutinio vertinimo (36,)"""
+        return self.matrix[-1] - self.matrix[0]
+
+    def trends(self):
+        """Mažiausių kvadratų nuolydis kiekvienai sričiai (36,).
+
+        Be laiko žymų – balai per vertinimą, su laiko žymomis – balai per dieną.
+        """
+        if len(self.matrix) < 2:
+            return np.zeros(self.matrix.shape[1])
+        if self.timestamps is None:
+            x = np.arange(len(self.matrix), dtype=np.float64)
+        else:
+            x = (np.asarray(self.timestamps, dtype='datetime64[s]').astype(np.int64) / 86400.0)
+        x = x - x.mean()
+        denominator = (x * x).sum()
+        if denominator == 0:
+            return np.zeros(self.matrix.shape[1])
+        return x @ (self.matrix - self.matrix.mean(axis=0)) / denominator
+
+    def moving_average(self, window):
+        """Slenkantis vidurkis per paskutinius window vertinimų (n, 36); pradžioje – per tiek, kiek yra"""
+        window = max(1, int(window))
+        sums = np.cumsum(self.matrix, axis=0)
+        sums[window:] = sums[window:] - sums[:-window]
+        counts = np.minimum(np.arange(1, len(self.matrix) + 1), window)[:, None]
+        return sums / counts
+
+# === KOHORTOS PROCENTILIAI ===
+def cohort_percentiles(histogram, scores):
+    """Kiekvienos srities procentilis kohortoje (36,).
+
+    histogram -- (36, 11) vartotojų skaičiai pagal kampą ir balą;
+    procentilis = mažesnį balą turinčių dalis + pusė turinčių tokį patį.
+    Sritims be duomenų grąžinama NaN. Kaina O(36×11) nepriklausomai nuo vartotojų skaičiaus.
+    """
+    scores = to_vector(scores).astype(np.intp)
+    rows = np.arange(len(ANGLE_ORDER))
+    cumulative = np.cumsum(histogram, axis=1)
+    total = cumulative[:, -1]
+    below = np.where(scores > 0, cumulative[rows, np.maximum(scores - 1, 0)], 0)
+    equal = histogram[rows, scores]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, 100.0 * (below + 0.5 * equal) / total, np.nan)
@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from skills import ANGLE_ORDER, ANGLE_ARRAY, decode_scores, decode_score_matrix
+
+# === BENDRI PAGALBININKAI ===
+def score_histogram_changes(old_scores, new_scores):
+    """Kohortos histogramos pokyčiai [(pokytis, kampas, balas)] vartotojui pakeitus naujausią vertinimą"""
+    new = decode_scores(new_scores)
+    if old_scores is None:
+        changed = range(len(ANGLE_ORDER))
+        changes = []
+    else:
+        old = decode_scores(old_scores)
+        changed = np.flatnonzero(old != new)
+        changes = [(-1, ANGLE_ORDER[i], int(old[i])) for i in changed]
+    return changes + [(1, ANGLE_ORDER[i], int(new[i])) for i in changed]
+
+def histogram_matrix(rows):
+    """(kampas, balas, vartotojų skaičius) eilutės -> (36, 11) matrica"""
+    counts = np.zeros((len(ANGLE_ORDER), 11), dtype=np.int64)
+    if rows:
+        data = np.array(rows, dtype=np.int64)
+        counts[np.searchsorted(ANGLE_ARRAY, data[:, 0]), data[:, 1]] = data[:, 2]
+    return counts
+
+def assessment_dict(row):
+    """(id, scores BLOB, komentaras, created_at) -> vertinimo žodynas"""
+    return {
+        'id': row[0],
+        'scores': decode_scores(row[1]),
+        'comment': row[2],
+        'created_at': row[3]
+    }
+
+def score_history(rows):
+    """(created_at, scores) eilutės -> (laiko žymos datetime64, (n, 36) matrica)"""
+    timestamps = np.array([row[0] for row in rows], dtype='datetime64[s]')
+    return timestamps, decode_score_matrix([row[1] for row in rows])
+
+def latest_scores_batch(rows):
+    """(user_id, scores) eilutės -> (user_id masyvas, (n, 36) matrica)"""
+    return (np.array([row[0] for row in rows], dtype=np.int64),
+            decode_score_matrix([row[1] for row in rows]))
+
+# === SĄSAJA ===
+class StorageBackend(ABC):
+    """Vartotojų, vertinimų ir sesijų saugykla.
+
+    Balai perduodami ir grąžinami kaip 36 baitų BLOB (skills.encode_scores),
+    iššifruoti – kaip NumPy masyvai; laikas – UTC eilutė 'YYYY-MM-DD HH:MM:SS'.
+    Slaptažodžių maišymas ir išsaugojimo klausytojai lieka database.py, todėl
+    saugykla tik skaito ir rašo duomenis. Elgseną apibrėžia
+    storage.contract.check_backend_contract.
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    def init(self):
+        """Sukurti/atnaujinti schemą (kartotinai kviesti saugu)"""
+
+    def close(self):
+        """Uždaryti jungtis"""
+
+    # --- Vartotojai ---
+    @abstractmethod
+    def create_user(self, email, password_hash, username):
+        """Naujo vartotojo ID arba None, jei el. paštas užimtas"""
+
+    @abstractmethod
+    def get_user_credentials(self, email):
+        """(id, password_hash, username) arba None"""
+
+    @abstractmethod
+    def update_password_hash(self, user_id, old_hash, new_hash):
+        """Pakeisti maišą tik jei jis vis dar old_hash (lygiagretus keitimas neperrašomas)"""
+
+    @abstractmethod
+    def record_login(self, user_id, timestamp):
+        """Įrašyti prisijungimo laiką (gali būti atliekama fone)"""
+
+    # --- Vertinimai ---
+    @abstractmethod
+    def save_assessment(self, user_id, scores, comment):
+        """Įterpti vertinimą ir toje pačioje transakcijoje atnaujinti
+        latest_assessment bei kohortos histogramą; grąžina vertinimo ID"""
+
+    @abstractmethod
+    def get_user_assessments(self, user_id):
+        """Visi vartotojo vertinimai nuo naujausio (žodynai su balais)"""
+
+    @abstractmethod
+    def get_user_assessment_summaries(self, user_id):
+        """Visų vertinimų [{'id', 'created_at'}] nuo naujausio"""
+
+    @abstractmethod
+    def get_user_assessment_page(self, user_id, limit=10, before=None):
+        """(eilutės [{'id', 'created_at'}], kito puslapio žymeklis (created_at, id) arba None)"""
+
+    @abstractmethod
+    def count_user_assessments(self, user_id):
+        """Vartotojo vertinimų skaičius"""
+
+    @abstractmethod
+    def get_assessment(self, user_id, assessment_id):
+        """Vienas vartotojo vertinimas arba None (svetimas – None)"""
+
+    @abstractmethod
+    def get_user_score_history(self, user_id):
+        """Visa istorija nuo seniausio: (laiko žymos datetime64, (n, 36) balų matrica)"""
+
+    @abstractmethod
+    def get_latest_assessment(self, user_id):
+        """{'id', 'scores', 'created_at'} iš latest_assessment arba None"""
+
+    @abstractmethod
+    def get_score_histogram(self):
+        """Kohortos histograma (36, 11)"""
+
+    @abstractmethod
+    def iter_latest_scores(self, batch=10000):
+        """Visų vartotojų naujausi vertinimai dalimis: (user_id masyvas, (n, 36) matrica)"""
+
+    @abstractmethod
+    def iter_export_rows(self, user_ids=None, emails=None, since=None, until=None, latest_only=False,
+                         batch=5000):
+        """Eksporto eilutės (id, user_id, email, username, created_at, comment, scores BLOB) pagal id"""
+
+    # --- Sesijos ---
+    @abstractmethod
+    def create_session(self, session_id, user_id, expires_at):
+        """Įrašyti sesiją (expires_at – Unix sekundės) ir išvalyti pasibaigusias"""
+
+    @abstractmethod
+    def get_session_user(self, session_id, now):
+        """Galiojančios, neatšauktos sesijos vartotojas {'id', 'username', 'email'} arba None"""
+
+    @abstractmethod
+    def revoke_session(self, session_id):
+        """Pažymėti sesiją atšaukta"""
+
+    @abstractmethod
+    def get_session_secret(self):
+        """Visiems mazgams bendras HMAC raktas (bytes)"""
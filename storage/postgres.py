@@ -0,0 +1,370 @@
+"""PostgreSQL saugykla keliems aplikacijos mazgams.
+
+Reikia psycopg 3 ir psycopg_pool (pip install "psycopg[binary,pool]").
+Kiekvienas procesas laiko savo jungčių telkinį; schemos migracijos
+vykdomos vienoje transakcijoje su patariamuoju užraktu, todėl vienu metu
+startuojantys mazgai jų nekartoja.
+"""
+import os
+import time
+import atexit
+import threading
+
+from database import SESSION_SECRET_NAME
+from skills import ANGLE_ORDER, decode_scores
+from storage.base import (StorageBackend, score_histogram_changes, histogram_matrix, assessment_dict,
+                          score_history, latest_scores_batch)
+
+# Didžiausias jungčių skaičius vienam procesui
+POOL_SIZE = int(os.environ.get("SKILLS_PG_POOL_SIZE", "10"))
+# pg_advisory_xact_lock raktas migracijoms (bet koks pastovus skaičius)
+MIGRATION_LOCK_ID = 7_361_042
+
+def _psycopg():
+    """Tinginys importas: be psycopg aplikacija veikia su SQLite"""
+    try:
+        import psycopg  # noqa: F401
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        raise RuntimeError("PostgreSQL saugyklai reikia psycopg ir psycopg_pool "
+                           "(pip install 'psycopg[binary,pool]')") from e
+    return ConnectionPool
+
+def _timestamp(value):
+    """TIMESTAMP -> 'YYYY-MM-DD HH:MM:SS' (kaip SQLite CURRENT_TIMESTAMP)"""
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value is not None else None
+
+def _seed_score_histogram(cur):
+    cur.executemany('INSERT INTO angle_score_histogram (angle, score, user_count) VALUES (%s, %s, 0) '
+                    'ON CONFLICT DO NOTHING',
+                    [(angle, score) for angle in ANGLE_ORDER for score in range(11)])
+
+def _create_session_secret(cur):
+    cur.execute('INSERT INTO app_secrets (name, value) VALUES (%s, %s) ON CONFLICT DO NOTHING',
+                (SESSION_SECRET_NAME, os.urandom(32)))
+
+# === SCHEMOS MIGRACIJOS ===
+# Atitinka database.MIGRATIONS galutinę schemą (be JSON laikotarpio)
+PG_MIGRATIONS = [
+    (1, "Vartotojų, vertinimų ir išvestinės lentelės", (
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            username TEXT NOT NULL,
+            created_at TIMESTAMP(0) DEFAULT (now() AT TIME ZONE 'utc'),
+            last_login TIMESTAMP(0)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS skill_assessments (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            user_id BIGINT NOT NULL REFERENCES users (id),
+            scores BYTEA NOT NULL,
+            comment TEXT,
+            created_at TIMESTAMP(0) NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_skill_assessments_user_created
+        ON skill_assessments (user_id, created_at DESC, id DESC)
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS latest_assessment (
+            user_id BIGINT PRIMARY KEY REFERENCES users (id),
+            assessment_id BIGINT NOT NULL,
+            scores BYTEA NOT NULL,
+            created_at TIMESTAMP(0) NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS angle_score_histogram (
+            angle INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            user_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (angle, score)
+        )
+        ''',
+        _seed_score_histogram,
+    )),
+    (2, "Prisijungimo sesijos ir jų HMAC raktas", (
+        '''
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            id TEXT PRIMARY KEY,
+            user_id BIGINT NOT NULL REFERENCES users (id),
+            created_at TIMESTAMP(0) DEFAULT (now() AT TIME ZONE 'utc'),
+            expires_at BIGINT NOT NULL,
+            revoked_at TIMESTAMP(0)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions (expires_at)',
+        '''
+        CREATE TABLE IF NOT EXISTS app_secrets (
+            name TEXT PRIMARY KEY,
+            value BYTEA NOT NULL
+        )
+        ''',
+        _create_session_secret,
+    )),
+]
+
+# === POSTGRESQL SAUGYKLA ===
+class PostgresBackend(StorageBackend):
+    """PostgreSQL per psycopg_pool.ConnectionPool.
+
+    Kiekviena operacija – trumpa transakcija iš telkinio; išsaugojimai to
+    paties vartotojo eilutėje užrakinami (SELECT ... FOR UPDATE), todėl
+    latest_assessment ir histograma lieka nuoseklios ir tarp mazgų.
+    """
+
+    name = "postgresql"
+
+    def __init__(self, url, min_size=1, max_size=POOL_SIZE):
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._initialized = False
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    ConnectionPool = _psycopg()
+                    pool = ConnectionPool(self.url, min_size=self.min_size, max_size=self.max_size,
+                                          open=False)
+                    pool.open(wait=True)
+                    atexit.register(pool.close)
+                    self._pool = pool
+        return self._pool
+
+    def _connection(self):
+        """Jungtis iš telkinio; išėjus iš bloko transakcija patvirtinama (klaidos atveju atšaukiama)"""
+        return self._get_pool().connection()
+
+    def init(self):
+        # Vieną kartą per procesą; tarp mazgų saugo patariamasis užraktas
+        if not self._initialized:
+            self.migrate()
+            self._initialized = True
+
+    def migrate(self):
+        """Pritaikyti trūkstamas migracijas viena transakcija, grąžinti schemos versiją"""
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP(0) DEFAULT (now() AT TIME ZONE 'utc')
+                )
+            ''')
+            cur.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version')
+            current = cur.fetchone()[0]
+
+            for version, description, steps in PG_MIGRATIONS:
+                if version <= current:
+                    continue
+                for step in steps:
+                    if callable(step):
+                        step(cur)
+                    else:
+                        cur.execute(step)
+                cur.execute('INSERT INTO schema_version (version, description) VALUES (%s, %s)',
+                            (version, description))
+                current = version
+        return current
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    # --- Vartotojai ---
+    def create_user(self, email, password_hash, username):
+        with self._connection() as conn:
+            row = conn.execute('''INSERT INTO users (email, password_hash, username) VALUES (%s, %s, %s)
+                                  ON CONFLICT (email) DO NOTHING RETURNING id''',
+                               (email, password_hash, username)).fetchone()
+        return row[0] if row else None
+
+    def get_user_credentials(self, email):
+        with self._connection() as conn:
+            return conn.execute('SELECT id, password_hash, username FROM users WHERE email = %s',
+                                (email,)).fetchone()
+
+    def update_password_hash(self, user_id, old_hash, new_hash):
+        with self._connection() as conn:
+            conn.execute('UPDATE users SET password_hash = %s WHERE id = %s AND password_hash = %s',
+                         (new_hash, user_id, old_hash))
+
+    def record_login(self, user_id, timestamp):
+        with self._connection() as conn:
+            conn.execute('UPDATE users SET last_login = %s::timestamp WHERE id = %s', (timestamp, user_id))
+
+    # --- Vertinimai ---
+    def save_assessment(self, user_id, scores, comment):
+        with self._connection() as conn, conn.cursor() as cur:
+            # Vartotojo eilutės užraktas: to paties vartotojo išsaugojimai (ir iš kitų
+            # mazgų) eina paeiliui, todėl ankstesnis naujausias vertinimas tikslus
+            cur.execute('SELECT id FROM users WHERE id = %s FOR UPDATE', (user_id,))
+            cur.execute('SELECT scores FROM latest_assessment WHERE user_id = %s', (user_id,))
+            previous = cur.fetchone()
+            cur.execute('''INSERT INTO skill_assessments (user_id, scores, comment) VALUES (%s, %s, %s)
+                           RETURNING id, created_at''', (user_id, scores, comment))
+            assessment_id, created_at = cur.fetchone()
+            cur.execute('''INSERT INTO latest_assessment (user_id, assessment_id, scores, created_at)
+                           VALUES (%s, %s, %s, %s)
+                           ON CONFLICT (user_id) DO UPDATE SET
+                               assessment_id = excluded.assessment_id,
+                               scores = excluded.scores,
+                               created_at = excluded.created_at''',
+                        (user_id, assessment_id, scores, created_at))
+            # Histogramos eilutės rakinamos vienoda (kampas, balas) tvarka visose
+            # transakcijose, kitaip lygiagretūs išsaugojimai užsiblokuoja abipusiai
+            changes = score_histogram_changes(bytes(previous[0]) if previous else None, scores)
+            cur.executemany('''UPDATE angle_score_histogram SET user_count = user_count + %s
+                               WHERE angle = %s AND score = %s''',
+                            sorted(changes, key=lambda change: (change[1], change[2])))
+        return assessment_id
+
+    def get_user_assessments(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT id, scores, comment, created_at
+                                   FROM skill_assessments WHERE user_id = %s
+                                   ORDER BY created_at DESC, id DESC''',
+                                (user_id,)).fetchall()
+        return [assessment_dict((row[0], bytes(row[1]), row[2], _timestamp(row[3]))) for row in rows]
+
+    def get_user_assessment_summaries(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT id, created_at
+                                   FROM skill_assessments WHERE user_id = %s
+                                   ORDER BY created_at DESC, id DESC''',
+                                (user_id,)).fetchall()
+        return [{'id': row[0], 'created_at': _timestamp(row[1])} for row in rows]
+
+    def get_user_assessment_page(self, user_id, limit=10, before=None):
+        if before is None:
+            query_args = (user_id, limit + 1)
+            where = 'user_id = %s'
+        else:
+            query_args = (user_id, before[0], before[1], limit + 1)
+            where = 'user_id = %s AND (created_at, id) < (%s::timestamp, %s)'
+        with self._connection() as conn:
+            rows = conn.execute(f'''SELECT id, created_at
+                                    FROM skill_assessments WHERE {where}
+                                    ORDER BY created_at DESC, id DESC LIMIT %s''',
+                                query_args).fetchall()
+
+        rows = [{'id': row[0], 'created_at': _timestamp(row[1])} for row in rows]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+        return rows, next_cursor
+
+    def count_user_assessments(self, user_id):
+        with self._connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM skill_assessments WHERE user_id = %s',
+                                (user_id,)).fetchone()[0]
+
+    def get_assessment(self, user_id, assessment_id):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT id, scores, comment, created_at
+                                  FROM skill_assessments WHERE id = %s AND user_id = %s''',
+                               (assessment_id, user_id)).fetchone()
+        return assessment_dict((row[0], bytes(row[1]), row[2], _timestamp(row[3]))) if row else None
+
+    def get_user_score_history(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT created_at, scores
+                                   FROM skill_assessments WHERE user_id = %s
+                                   ORDER BY created_at, id''',
+                                (user_id,)).fetchall()
+        return score_history([(row[0], bytes(row[1])) for row in rows])
+
+    def get_latest_assessment(self, user_id):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT assessment_id, scores, created_at
+                                  FROM latest_assessment WHERE user_id = %s''', (user_id,)).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'scores': decode_scores(bytes(row[1])), 'created_at': _timestamp(row[2])}
+
+    def get_score_histogram(self):
+        with self._connection() as conn:
+            return histogram_matrix(conn.execute('SELECT angle, score, user_count FROM angle_score_histogram')
+                                    .fetchall())
+
+    def iter_latest_scores(self, batch=10000):
+        with self._connection() as conn:
+            # Vardinis (serverio pusės) žymeklis: visa lentelė į atmintį nekeliama
+            with conn.cursor(name="latest_scores") as cur:
+                cur.execute('SELECT user_id, scores FROM latest_assessment ORDER BY user_id')
+                while True:
+                    rows = cur.fetchmany(batch)
+                    if not rows:
+                        break
+                    yield latest_scores_batch([(row[0], bytes(row[1])) for row in rows])
+
+    def iter_export_rows(self, user_ids=None, emails=None, since=None, until=None, latest_only=False,
+                         batch=5000):
+        where, params = [], []
+        if user_ids is not None:
+            where.append('a.user_id = ANY(%s)')
+            params.append(list(user_ids))
+        if emails is not None:
+            where.append('u.email = ANY(%s)')
+            params.append(list(emails))
+        if since is not None:
+            where.append('a.created_at >= %s::timestamp')
+            params.append(since)
+        if until is not None:
+            where.append('a.created_at < %s::timestamp')
+            params.append(until)
+        if latest_only:
+            where.append('a.id IN (SELECT assessment_id FROM latest_assessment)')
+        query = f'''SELECT a.id, a.user_id, u.email, u.username, a.created_at, a.comment, a.scores
+                    FROM skill_assessments a JOIN users u ON u.id = a.user_id
+                    {'WHERE ' + ' AND '.join(where) if where else ''}
+                    ORDER BY a.id'''
+        with self._connection() as conn:
+            with conn.cursor(name="export_rows") as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row[:4] + (_timestamp(row[4]), row[5], bytes(row[6]))
+
+    # --- Sesijos ---
+    def create_session(self, session_id, user_id, expires_at):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM user_sessions WHERE expires_at < %s',
+                         (int(time.time()),))
+            conn.execute('INSERT INTO user_sessions (id, user_id, expires_at) VALUES (%s, %s, %s)',
+                         (session_id, user_id, expires_at))
+
+    def get_session_user(self, session_id, now):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT u.id, u.username, u.email
+                                  FROM user_sessions s JOIN users u ON u.id = s.user_id
+                                  WHERE s.id = %s AND s.revoked_at IS NULL AND s.expires_at > %s''',
+                               (session_id, now)).fetchone()
+        return {'id': row[0], 'username': row[1], 'email': row[2]} if row else None
+
+    def revoke_session(self, session_id):
+        with self._connection() as conn:
+            conn.execute('''UPDATE user_sessions SET revoked_at = now() AT TIME ZONE 'utc'
+                            WHERE id = %s AND revoked_at IS NULL''', (session_id,))
+
+    def get_session_secret(self):
+        with self._connection() as conn:
+            row = conn.execute('SELECT value FROM app_secrets WHERE name = %s',
+                               (SESSION_SECRET_NAME,)).fetchone()
+        return bytes(row[0])
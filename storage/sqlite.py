@@ -0,0 +1,221 @@
+import time
+import sqlite3
+
+import database
+from skills import decode_scores
+from storage.base import (StorageBackend, score_histogram_changes, histogram_matrix, assessment_dict,
+                          score_history, latest_scores_batch)
+
+# === RAŠYMO FUNKCIJOS (vykdomos rašymo eilės transakcijoje) ===
+def _update_score_histogram(conn, old_scores, new_scores):
+    """Perkelti vartotoją histogramoje iš ankstesnio naujausio vertinimo į naują"""
+    conn.executemany('UPDATE angle_score_histogram SET user_count = user_count + ? WHERE angle = ? AND score = ?',
+                     score_histogram_changes(old_scores, new_scores))
+
+def _write_last_login(conn, user_id, timestamp):
+    conn.execute('UPDATE users SET last_login = ? WHERE id = ?', (timestamp, user_id))
+
+def _write_assessment(conn, user_id, scores, comment):
+    previous = conn.execute('SELECT scores FROM latest_assessment WHERE user_id = ?', (user_id,)).fetchone()
+    cursor = conn.execute('INSERT INTO skill_assessments (user_id, scores, comment) VALUES (?, ?, ?)',
+                          (user_id, scores, comment))
+    # Momentinė lentelė ir kohortos histograma atnaujinamos toje pačioje transakcijoje
+    conn.execute('''INSERT INTO latest_assessment (user_id, assessment_id, scores, created_at)
+                    SELECT user_id, id, scores, created_at FROM skill_assessments WHERE id = ?
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        assessment_id = excluded.assessment_id,
+                        scores = excluded.scores,
+                        created_at = excluded.created_at''', (cursor.lastrowid,))
+    _update_score_histogram(conn, previous[0] if previous else None, scores)
+    return cursor.lastrowid
+
+def _write_session(conn, session_id, user_id, expires_at, now):
+    # Pasenusios sesijos išvalomos kartu su naujos įrašymu (indeksas pagal expires_at)
+    conn.execute('DELETE FROM user_sessions WHERE expires_at < ?', (now,))
+    conn.execute('INSERT INTO user_sessions (id, user_id, expires_at) VALUES (?, ?, ?)',
+                 (session_id, user_id, expires_at))
+
+def _write_session_revoked(conn, session_id):
+    conn.execute('''UPDATE user_sessions SET revoked_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND revoked_at IS NULL''', (session_id,))
+
+# === SQLITE SAUGYKLA ===
+class SqliteBackend(StorageBackend):
+    """Vietinis SQLite failas: jungčių telkinys, WAL ir rašymo eilė (database.py).
+
+    path=None reiškia database.DB_PATH kvietimo metu, todėl įrankiai ir
+    benchmarkai gali keisti DB_PATH kaip iki šiol.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def _connection(self):
+        return database.get_pool(self.path).connection()
+
+    def _submit(self, fn, *args, wait=True):
+        return database.get_writer(self.path).submit(fn, *args, wait=wait)
+
+    def init(self):
+        database.init_sqlite(self.path)
+
+    def close(self):
+        database.close_pools()
+
+    # --- Vartotojai ---
+    def create_user(self, email, password_hash, username):
+        try:
+            with database.get_pool(self.path).transaction() as conn:
+                cursor = conn.execute('INSERT INTO users (email, password_hash, username) VALUES (?, ?, ?)',
+                                      (email, password_hash, username))
+                return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return None
+
+    def get_user_credentials(self, email):
+        with self._connection() as conn:
+            return conn.execute('SELECT id, password_hash, username FROM users WHERE email = ?',
+                                (email,)).fetchone()
+
+    def update_password_hash(self, user_id, old_hash, new_hash):
+        with self._connection() as conn:
+            conn.execute('UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?',
+                         (new_hash, user_id, old_hash))
+
+    def record_login(self, user_id, timestamp):
+        # Prisijungimo laikas įrašomas fone, kartu su kitais įrašais
+        self._submit(_write_last_login, user_id, timestamp, wait=False)
+
+    # --- Vertinimai ---
+    def save_assessment(self, user_id, scores, comment):
+        # Įrašas sugrupuojamas su kitų sesijų išsaugojimais; grįžtama po COMMIT
+        return self._submit(_write_assessment, user_id, scores, comment)
+
+    def get_user_assessments(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT id, scores, comment, created_at
+                                   FROM skill_assessments WHERE user_id = ?
+                                   ORDER BY created_at DESC, id DESC''',
+                                (user_id,)).fetchall()
+        return [assessment_dict(row) for row in rows]
+
+    def get_user_assessment_summaries(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT id, created_at
+                                   FROM skill_assessments WHERE user_id = ?
+                                   ORDER BY created_at DESC, id DESC''',
+                                (user_id,)).fetchall()
+        return [{'id': row[0], 'created_at': row[1]} for row in rows]
+
+    def get_user_assessment_page(self, user_id, limit=10, before=None):
+        if before is None:
+            query_args = (user_id, limit + 1)
+            where = 'user_id = ?'
+        else:
+            query_args = (user_id, before[0], before[1], limit + 1)
+            where = 'user_id = ? AND (created_at, id) < (?, ?)'
+        with self._connection() as conn:
+            rows = conn.execute(f'''SELECT id, created_at
+                                    FROM skill_assessments WHERE {where}
+                                    ORDER BY created_at DESC, id DESC LIMIT ?''',
+                                query_args).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][1], rows[-1][0])
+        return [{'id': row[0], 'created_at': row[1]} for row in rows], next_cursor
+
+    def count_user_assessments(self, user_id):
+        with self._connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM skill_assessments WHERE user_id = ?',
+                                (user_id,)).fetchone()[0]
+
+    def get_assessment(self, user_id, assessment_id):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT id, scores, comment, created_at
+                                  FROM skill_assessments WHERE id = ? AND user_id = ?''',
+                               (assessment_id, user_id)).fetchone()
+        return assessment_dict(row) if row else None
+
+    def get_user_score_history(self, user_id):
+        with self._connection() as conn:
+            rows = conn.execute('''SELECT created_at, scores
+                                   FROM skill_assessments WHERE user_id = ?
+                                   ORDER BY created_at, id''',
+                                (user_id,)).fetchall()
+        return score_history(rows)
+
+    def get_latest_assessment(self, user_id):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT assessment_id, scores, created_at
+                                  FROM latest_assessment WHERE user_id = ?''', (user_id,)).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'scores': decode_scores(row[1]), 'created_at': row[2]}
+
+    def get_score_histogram(self):
+        with self._connection() as conn:
+            return histogram_matrix(conn.execute('SELECT angle, score, user_count FROM angle_score_histogram')
+                                    .fetchall())
+
+    def iter_latest_scores(self, batch=10000):
+        with self._connection() as conn:
+            cursor = conn.execute('SELECT user_id, scores FROM latest_assessment ORDER BY user_id')
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    break
+                yield latest_scores_batch(rows)
+
+    def iter_export_rows(self, user_ids=None, emails=None, since=None, until=None, latest_only=False,
+                         batch=5000):
+        where, params = [], []
+        if user_ids is not None:
+            where.append(f"a.user_id IN ({','.join('?' * len(user_ids))})")
+            params.extend(user_ids)
+        if emails is not None:
+            where.append(f"u.email IN ({','.join('?' * len(emails))})")
+            params.extend(emails)
+        if since is not None:
+            where.append('a.created_at >= ?')
+            params.append(since)
+        if until is not None:
+            where.append('a.created_at < ?')
+            params.append(until)
+        if latest_only:
+            where.append('a.id IN (SELECT assessment_id FROM latest_assessment)')
+        query = f'''SELECT a.id, a.user_id, u.email, u.username, a.created_at, a.comment, a.scores
+                    FROM skill_assessments a JOIN users u ON u.id = a.user_id
+                    {'WHERE ' + ' AND '.join(where) if where else ''}
+                    ORDER BY a.id'''
+        with self._connection() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    break
+                yield from rows
+
+    # --- Sesijos ---
+    def create_session(self, session_id, user_id, expires_at):
+        self._submit(_write_session, session_id, user_id, expires_at, int(time.time()))
+
+    def get_session_user(self, session_id, now):
+        with self._connection() as conn:
+            row = conn.execute('''SELECT u.id, u.username, u.email
+                                  FROM user_sessions s JOIN users u ON u.id = s.user_id
+                                  WHERE s.id = ? AND s.revoked_at IS NULL AND s.expires_at > ?''',
+                               (session_id, now)).fetchone()
+        return {'id': row[0], 'username': row[1], 'email': row[2]} if row else None
+
+    def revoke_session(self, session_id):
+        self._submit(_write_session_revoked, session_id)
+
+    def get_session_secret(self):
+        with self._connection() as conn:
+            row = conn.execute('SELECT value FROM app_secrets WHERE name = ?',
+                               (database.SESSION_SECRET_NAME,)).fetchone()
+        return bytes(row[0])